@@ -0,0 +1,38 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# check-import-time.sh
+# Fail if importing specify_cli exceeds the startup budget or eagerly pulls in
+# modules that only network/interactive code paths need.
+# Usage: check-import-time.sh [budget-ms]   (default: $IMPORT_BUDGET_MS or 250)
+
+BUDGET_MS="${1:-${IMPORT_BUDGET_MS:-250}}"
+RUNS=5
+
+best_us=""
+for _ in $(seq "$RUNS"); do
+  us=$(python -X importtime -c "import specify_cli" 2>&1 \
+    | awk -F'|' '$3 ~ /^ specify_cli$/ { gsub(/ /, "", $2); print $2 }')
+  if [[ -z "$best_us" || "$us" -lt "$best_us" ]]; then
+    best_us="$us"
+  fi
+done
+
+best_ms=$((best_us / 1000))
+echo "specify_cli import time: ${best_ms} ms (best of ${RUNS}, budget ${BUDGET_MS} ms)"
+
+python - <<'PY'
+import sys
+import specify_cli  # noqa: F401
+
+deferred = ["httpx", "truststore", "readchar", "rich.live", "rich.progress", "rich.tree"]
+loaded = [name for name in deferred if name in sys.modules]
+if loaded:
+    print(f"Eagerly imported at startup: {', '.join(loaded)}", file=sys.stderr)
+    sys.exit(1)
+PY
+
+if (( best_ms > BUDGET_MS )); then
+  echo "Import time ${best_ms} ms exceeds budget of ${BUDGET_MS} ms" >&2
+  exit 1
+fi
@@ -1,7 +1,20 @@
 # ABOUTME: Linear API client package for spec-kit integration
 # Provides GraphQL client, queries, mutations, and type definitions
 
-from .client import LinearClient
+from .client import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    LinearClient,
+    LinearClientError,
+    StaleResponseWarning,
+)
+from .breaker import CircuitBreaker, ResponseCache
+from .bulk import BulkResult
+from .transport import TransportConfig
+from .metrics import MetricsRegistry, OperationRecord
+from .tracing import TraceRecorder
+from .ratelimit import RateLimitCoordinator
+from .pool import LinearClientPool, PoolMember
 from .types import (
     Issue,
     Project,
@@ -11,14 +24,39 @@ from .types import (
     WorkflowState,
     IssueRelation,
     Team,
+    IssueLease,
 )
 from .queries import LinearQueries
 from .mutations import LinearMutations
+from .lease import IssueLeaseManager, LeaseHeldError
+from .outbox import MutationOutbox
+from .complexity import AdaptivePageSize, estimate_complexity
+from .filters import IssueFilter
 
 __all__ = [
     "LinearClient",
+    "LinearClientError",
+    "DeadlineExceededError",
+    "CircuitOpenError",
+    "StaleResponseWarning",
+    "CircuitBreaker",
+    "ResponseCache",
+    "BulkResult",
+    "TransportConfig",
+    "MetricsRegistry",
+    "OperationRecord",
+    "TraceRecorder",
+    "RateLimitCoordinator",
+    "LinearClientPool",
+    "PoolMember",
     "LinearQueries",
     "LinearMutations",
+    "IssueLeaseManager",
+    "LeaseHeldError",
+    "MutationOutbox",
+    "AdaptivePageSize",
+    "estimate_complexity",
+    "IssueFilter",
     "Issue",
     "Project",
     "Milestone",
@@ -27,4 +65,5 @@ __all__ = [
     "WorkflowState",
     "IssueRelation",
     "Team",
+    "IssueLease",
 ]
@@ -0,0 +1,239 @@
+# ABOUTME: Host-wide circuit breaker and last-good response cache for Linear outages
+# Trips on consecutive failures or slow calls so queued jobs fail fast instead of timing out
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+from .ratelimit import _FileLock, default_state_dir, private_dir, write_private_json
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_SECONDS = 30.0
+DEFAULT_SLOW_CALL_SECONDS = 20.0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker shared by every LinearClient on a host through a state file.
+
+    Closed: requests flow; consecutive failures (connection errors, timeouts,
+    5xx responses) and slow calls are counted. At failure_threshold the
+    circuit opens and requests are refused without touching the network.
+    After reset_seconds one caller on the host is let through as a half-open
+    probe: success closes the circuit, failure re-opens it for another period.
+
+    The common closed-and-healthy path reads the state file without locking
+    and writes nothing.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        state_dir: Optional[str] = None,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_seconds: float = DEFAULT_RESET_SECONDS,
+        slow_call_seconds: Optional[float] = DEFAULT_SLOW_CALL_SECONDS,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            token: Linear API token. Only a hash of it is written to disk.
+            state_dir: Directory for the shared state file. Defaults to the
+                rate limiter's directory.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_seconds: How long the circuit stays open before a probe.
+            slow_call_seconds: Requests slower than this count as failures.
+                None disables latency tripping.
+        """
+        state_dir = private_dir(state_dir) if state_dir else default_state_dir()
+        key = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self.state_path = os.path.join(state_dir, f"{key}.breaker.json")
+        self._lock_path = self.state_path + ".lock"
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.slow_call_seconds = slow_call_seconds
+
+    @classmethod
+    def from_env(cls, token: str) -> Optional["CircuitBreaker"]:
+        """
+        Create a breaker from LINEAR_BREAKER_FAILURES and LINEAR_BREAKER_RESET.
+
+        Returns None when LINEAR_BREAKER_FAILURES is 0 (breaker disabled).
+        Values that are not numbers, or a reset that is not positive, fall
+        back to the defaults.
+        """
+        try:
+            failures = int(os.environ.get("LINEAR_BREAKER_FAILURES") or DEFAULT_FAILURE_THRESHOLD)
+        except ValueError:
+            failures = DEFAULT_FAILURE_THRESHOLD
+        if failures <= 0:
+            return None
+        try:
+            reset = float(os.environ.get("LINEAR_BREAKER_RESET") or DEFAULT_RESET_SECONDS)
+        except ValueError:
+            reset = DEFAULT_RESET_SECONDS
+        if reset <= 0:
+            reset = DEFAULT_RESET_SECONDS
+        return cls(token, failure_threshold=failures, reset_seconds=reset)
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        return self._load()["state"]
+
+    def retry_at(self) -> float:
+        """Epoch seconds at which the circuit admits its next probe (or replaces a lost one)."""
+        state = self._load()
+        if state["state"] == HALF_OPEN:
+            return state["probe_at"] + self.reset_seconds
+        return state["opened_at"] + self.reset_seconds
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claiming the probe slot if half-open)."""
+        state = self._load()
+        if state["state"] == CLOSED:
+            return True
+        now = time.time()
+        if state["state"] == OPEN and now - state["opened_at"] < self.reset_seconds:
+            return False
+
+        with _FileLock(self._lock_path):
+            state = self._load()
+            if state["state"] == CLOSED:
+                return True
+            expired = now - state["opened_at"] >= self.reset_seconds
+            # A probe that never reported back (crashed job) is replaced after a period
+            stale_probe = state["state"] == HALF_OPEN and now - state["probe_at"] >= self.reset_seconds
+            if (state["state"] == OPEN and expired) or stale_probe:
+                state["state"] = HALF_OPEN
+                state["probe_at"] = now
+                self._save(state)
+                return True
+            return False
+
+    def release(self) -> None:
+        """
+        Give back a probe slot without a verdict (the request was never sent
+        or was abandoned at its caller's deadline), so another caller can
+        probe right away. No-op unless the circuit is half-open.
+        """
+        if self._load()["state"] != HALF_OPEN:
+            return
+        with _FileLock(self._lock_path):
+            state = self._load()
+            if state["state"] == HALF_OPEN:
+                state["probe_at"] = 0.0
+                self._save(state)
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        """
+        Report the outcome of a request that allow() let through.
+
+        Args:
+            ok: The API answered (any non-5xx response, even a GraphQL error).
+            latency: Request latency in seconds, checked against slow_call_seconds.
+        """
+        if ok and latency is not None and self.slow_call_seconds is not None:
+            ok = latency <= self.slow_call_seconds
+        if ok:
+            state = self._load()
+            if state["state"] == CLOSED and not state["failures"]:
+                return
+        with _FileLock(self._lock_path):
+            state = self._load()
+            if ok:
+                state.update(state=CLOSED, failures=0)
+            else:
+                state["failures"] += 1
+                if state["state"] == HALF_OPEN or state["failures"] >= self.failure_threshold:
+                    state.update(state=OPEN, opened_at=time.time())
+            self._save(state)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"state": CLOSED, "failures": 0, "opened_at": 0.0, "probe_at": 0.0}
+
+    def _save(self, state: dict) -> None:
+        write_private_json(self.state_path, state)
+
+
+class ResponseCache:
+    """
+    Last good response of each query, served while the circuit is open.
+
+    Entries are JSON files named by the caller's key (LinearClient uses a
+    hash of its token plus the operation key, so tokens never see each
+    other's responses), written atomically so concurrent jobs can share a
+    directory.
+    """
+
+    def __init__(self, directory: str, max_age: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached responses; created
+                private to the current user, as it holds issue content.
+            max_age: Seconds after which an entry is too old to serve.
+
+        Raises:
+            PermissionError: If the directory is not private to the current
+                user (see ratelimit.private_dir).
+        """
+        self.directory = private_dir(directory)
+        self.max_age = max_age
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Create a cache in LINEAR_FALLBACK_CACHE_DIR, or None when it is not set.
+
+        LINEAR_FALLBACK_MAX_AGE is ignored (no age limit) unless it is a
+        number of seconds.
+        """
+        directory = os.environ.get("LINEAR_FALLBACK_CACHE_DIR")
+        if not directory:
+            return None
+        try:
+            max_age = float(os.environ.get("LINEAR_FALLBACK_MAX_AGE") or "")
+        except ValueError:
+            max_age = None
+        return cls(directory, max_age)
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Cached response data for a key, or None if missing or too old."""
+        entry = self.lookup(key)
+        return entry[0] if entry else None
+
+    def lookup(self, key: str) -> Optional[tuple[dict[str, Any], float]]:
+        """Cached response data for a key and its age in seconds, or None if missing or too old."""
+        try:
+            with open(self._path(key), "r") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        age = time.time() - entry["stored_at"]
+        if self.max_age is not None and age > self.max_age:
+            return None
+        return entry["data"], age
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        """Store the latest response data for an operation key."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"stored_at": time.time(), "data": data}, f)
+        os.replace(tmp_path, self._path(key))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
@@ -0,0 +1,91 @@
+# ABOUTME: Thread-pooled bulk execution of Linear operations for sync callers
+# Streams per-item results (value or error) as they complete or in input order
+
+import queue
+from concurrent.futures import CancelledError, Executor, Future
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BulkResult(Generic[T, R]):
+    """Outcome of one item of a bulk run: its value, or the exception it raised."""
+
+    index: int
+    item: T
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> R:
+        """Return the value, re-raising the item's exception if it failed."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def run_bulk(
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    ordered: bool = False,
+    max_pending: Optional[int] = None,
+) -> Iterator[BulkResult[T, R]]:
+    """
+    Run fn over items on an executor, yielding a BulkResult per item.
+
+    Exceptions are captured per item, so one failure never aborts the batch.
+    At most max_pending items are in flight, so large or lazy inputs are not
+    all submitted up front. With ordered=True results are yielded in input
+    order; otherwise as soon as each completes.
+    """
+    iterator = iter(enumerate(items))
+    pending: dict[Future, tuple[int, T]] = {}
+    # Done callbacks also fire for futures cancelled by shutdown(cancel_futures=True),
+    # which concurrent.futures.wait() never reports as done
+    completed: "queue.SimpleQueue[Future]" = queue.SimpleQueue()
+    done_early: dict[int, BulkResult[T, R]] = {}
+    next_index = 0
+    limit = max_pending or 64
+
+    def fill() -> None:
+        while len(pending) < limit:
+            try:
+                index, item = next(iterator)
+            except StopIteration:
+                return
+            future = executor.submit(fn, item)
+            pending[future] = (index, item)
+            future.add_done_callback(completed.put)
+
+    def collect(future: Future) -> BulkResult[T, R]:
+        index, item = pending.pop(future)
+        try:
+            error = future.exception()
+        except CancelledError as e:
+            error = e
+        return BulkResult(index, item, None if error else future.result(), error)
+
+    fill()
+    while pending:
+        result = collect(completed.get())
+        if not ordered:
+            yield result
+        else:
+            done_early[result.index] = result
+            while next_index in done_early:
+                yield done_early.pop(next_index)
+                next_index += 1
+        fill()
+
+
+def execute_operation(client: Any, operation: tuple[str, Optional[dict[str, Any]]]) -> dict[str, Any]:
+    """Adapter for bulk runs over (query, variables) pairs."""
+    query, variables = operation
+    return client.execute(query, variables)
@@ -1,13 +1,49 @@
 # ABOUTME: HTTP client for Linear GraphQL API with token authentication
 # Handles all API communication and response parsing
 
+import asyncio
+import hashlib
 import os
+import re
 import json
+import time
+import threading
+import warnings
 import httpx
-from typing import Any, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
 
+from .breaker import HALF_OPEN, CircuitBreaker, ResponseCache
+from .bulk import BulkResult, execute_operation, run_bulk
+from .complexity import estimate_complexity
+from .metrics import Instrumentation, LatencyWindow, OperationRecord, default_registry
+from .ratelimit import RateLimitCoordinator
+from .singleflight import SingleFlight, operation_key
+from .tracing import default_recorder
+from .transport import TransportConfig
 from .types import LinearConfig
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# A request timeout this close to the deadline is reported as the deadline passing
+_DEADLINE_SLACK = 0.05
+
+_OPERATION_PATTERN = re.compile(r"\b(query|mutation|subscription)\s+(\w+)")
+
+
+def operation_name(query: str) -> str:
+    """Return the GraphQL operation name of a document ("anonymous" if unnamed)."""
+    match = _OPERATION_PATTERN.search(query)
+    return match.group(2) if match else "anonymous"
+
+
+def is_mutation(query: str) -> bool:
+    """Check whether a document is a mutation."""
+    return query.lstrip().startswith("mutation")
+
 
 class LinearClientError(Exception):
     """Raised when Linear API returns an error."""
@@ -17,16 +53,48 @@ class LinearClientError(Exception):
         self.errors = errors or []
 
 
+class DeadlineExceededError(LinearClientError):
+    """Raised when an operation does not complete within its deadline."""
+
+
+class CircuitOpenError(LinearClientError):
+    """Raised without contacting the API while the circuit breaker is open."""
+
+    def __init__(self, message: str, retry_at: Optional[float] = None):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+class StaleResponseWarning(UserWarning):
+    """Issued when a query is answered from the fallback cache while the circuit is open."""
+
+
 class LinearClient:
     """HTTP client for Linear GraphQL API."""
 
     API_URL = "https://api.linear.app/graphql"
 
+    _shared: dict[str, "LinearClient"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(
         self,
         token: Optional[str] = None,
         config: Optional[LinearConfig] = None,
         config_path: Optional[str] = None,
+        rate_limiter: Optional[RateLimitCoordinator] = None,
+        shared_rate_limit: bool = True,
+        priority: Optional[int] = None,
+        max_retries: int = 3,
+        transport: Optional[TransportConfig] = None,
+        http_client: Optional[httpx.Client] = None,
+        instrumentation: Optional[list[Instrumentation]] = None,
+        deduplicate: bool = True,
+        hedge_quantile: Optional[float] = 0.95,
+        hedge_min_samples: int = 20,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        shared_circuit_breaker: bool = True,
+        fallback_cache: Optional[ResponseCache] = None,
     ):
         """
         Initialize Linear client.
@@ -35,6 +103,35 @@ class LinearClient:
             token: Linear API token. If not provided, reads from LINEAR_TOKEN env var.
             config: LinearConfig object with team/label/state IDs.
             config_path: Path to linear-config.json file.
+            rate_limiter: Coordinator to draw request/complexity budget from.
+            shared_rate_limit: Create a host-wide coordinator for the token when
+                rate_limiter is not given.
+            priority: Job priority when the budget is contended (higher first).
+                Defaults to LINEAR_JOB_PRIORITY.
+            max_retries: Retries after the API rejects a request as rate limited.
+            transport: Connection pool, HTTP/2, compression and timeout settings.
+                Defaults to TransportConfig.from_env().
+            http_client: Existing httpx client to send requests through. It must
+                not carry its own Authorization header and is not closed by close().
+            instrumentation: Hooks called with an OperationRecord after every
+                execute(), e.g. a MetricsRegistry or TraceRecorder. The
+                LINEAR_METRICS_FILE registry and LINEAR_TRACE_FILE recorder are
+                added automatically when those variables are set.
+            deduplicate: Share one request among concurrent identical queries
+                (same document and variables). Mutations are never shared.
+            hedge_quantile: Quantile of a query's recent request latencies
+                (time on the wire) after which a backup request is sent if
+                budget is available right away; the first response wins.
+                None disables hedging. Mutations are never hedged.
+            hedge_min_samples: Requests of an operation to observe before hedging it.
+            circuit_breaker: Breaker that fails requests fast during an outage.
+            shared_circuit_breaker: Create a host-wide breaker for the token
+                (configured by CircuitBreaker.from_env) when circuit_breaker
+                is not given.
+            fallback_cache: Store of last good query responses, served while
+                the circuit is open. Defaults to LINEAR_FALLBACK_CACHE_DIR.
+                Serving one issues a StaleResponseWarning and marks the
+                OperationRecord as stale.
         """
         self.token = token or os.environ.get("LINEAR_TOKEN")
         if not self.token:
@@ -46,13 +143,78 @@ class LinearClient:
         self._config = config
         self._config_path = config_path
 
-        self._http = httpx.Client(
-            headers={
-                "Authorization": self.token,
-                "Content-Type": "application/json",
-            },
-            timeout=30.0,
-        )
+        if rate_limiter is None and shared_rate_limit:
+            rate_limiter = RateLimitCoordinator(self.token)
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+
+        if circuit_breaker is None and shared_circuit_breaker:
+            circuit_breaker = CircuitBreaker.from_env(self.token)
+        self.circuit_breaker = circuit_breaker
+        self.fallback_cache = fallback_cache or ResponseCache.from_env()
+        # Fallback entries are per token, like the breaker and limiter state
+        self._token_key = hashlib.sha256(self.token.encode()).hexdigest()[:16]
+        self.max_retries = max_retries
+
+        self.transport = transport or TransportConfig.from_env()
+        self._headers = {
+            "Authorization": self.token,
+            "Content-Type": "application/json",
+        }
+        self._owns_http = http_client is None
+        self._http = http_client or self.transport.build_client(self._headers)
+
+        self.instrumentation: list[Instrumentation] = list(instrumentation or [])
+        for env_hook in (default_registry(), default_recorder()):
+            if env_hook is not None and env_hook not in self.instrumentation:
+                self.instrumentation.append(env_hook)
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._inflight = SingleFlight() if deduplicate else None
+        self._local = threading.local()  # per-thread record of the latest execute()
+
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        # Hedge requests never queue: primaries and backups each have max_connections
+        # workers and are only handed to the pool while one of theirs is free
+        self._primary_slots = threading.BoundedSemaphore(self.transport.max_connections)
+        self._backup_slots = threading.BoundedSemaphore(self.transport.max_connections)
+        self.wire_latency = LatencyWindow()  # per-request latency, for hedge delays
+
+    @classmethod
+    def shared(cls, token: Optional[str] = None, **kwargs) -> "LinearClient":
+        """
+        Get a process-wide client for a token, creating it on first use.
+
+        Sharing one client lets every LinearQueries/LinearMutations in the
+        process multiplex over the same pooled (HTTP/2 when available)
+        connections instead of opening their own.
+
+        Args:
+            token: Linear API token. Defaults to LINEAR_TOKEN.
+            **kwargs: Passed to the constructor when the client is created.
+        """
+        key = token or os.environ.get("LINEAR_TOKEN") or ""
+        with cls._shared_lock:
+            client = cls._shared.get(key)
+            if client is None or client._http.is_closed:
+                client = cls(token=token, **kwargs)
+                cls._shared[key] = client
+            return client
+
+    def add_instrumentation(self, hook: Instrumentation) -> None:
+        """Register a hook to receive an OperationRecord for every execute()."""
+        self.instrumentation.append(hook)
+
+    def last_record(self) -> Optional[OperationRecord]:
+        """
+        OperationRecord of the calling thread's latest execute(), or None if
+        it sent no request of its own (its response was shared with an
+        identical in-flight request).
+        """
+        return getattr(self._local, "record", None)
 
     @property
     def config(self) -> Optional[LinearConfig]:
@@ -71,44 +233,443 @@ class LinearClient:
         self,
         query: str,
         variables: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
     ) -> dict[str, Any]:
         """
         Execute a GraphQL query or mutation.
 
+        Queries identical to one already in flight (same document and
+        variables) wait for and share its response instead of sending another
+        request, unless the client was created with deduplicate=False or a
+        timeout is given. If the shared request fails because its caller's
+        deadline passed, the waiting callers send the query again under
+        their own deadlines. Slow
+        queries may be hedged; see hedge_quantile.
+
         Args:
             query: GraphQL query string.
             variables: Query variables.
+            timeout: Read timeout in seconds for each request. Defaults to the
+                transport's timeout for the operation.
+            deadline: Total seconds the call may take, including waiting for
+                rate-limit budget, retries and identical in-flight requests.
 
         Returns:
             Response data dictionary.
 
         Raises:
             LinearClientError: If the API returns errors.
+            DeadlineExceededError: If the deadline passed first.
+        """
+        deadline_at = None if deadline is None else time.monotonic() + deadline
+        self._local.record = None
+        # A call with its own timeout neither leads nor joins a shared request
+        if self._inflight is None or timeout is not None or is_mutation(query):
+            return self._execute(query, variables, timeout, deadline_at)
+        try:
+            return self._inflight.do(
+                operation_key(query, variables),
+                lambda: self._execute(query, variables, timeout, deadline_at),
+                timeout=deadline,
+                # The leader's own deadline ran out: the others retry under theirs
+                private_errors=(DeadlineExceededError,),
+            )
+        except TimeoutError as e:
+            raise DeadlineExceededError(f"{operation_name(query)} exceeded its {deadline}s deadline") from e
+
+    async def aexecute(
+        self,
+        query: str,
+        variables: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Execute a GraphQL operation from asyncio code without blocking the loop.
+
+        The request runs in a worker thread through execute(), so it shares the
+        connection pool, rate limiter and in-flight deduplication with sync
+        callers: a coroutine and a thread asking for the same issue at the
+        same time send one request.
         """
+        return await asyncio.to_thread(self.execute, query, variables, timeout, deadline)
+
+    def _execute(
+        self,
+        query: str,
+        variables: Optional[dict[str, Any]],
+        timeout: Optional[float],
+        deadline_at: Optional[float],
+    ) -> dict[str, Any]:
+        """Send one operation and record it; see execute()."""
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
+        cache_key = None
+        if self.fallback_cache is not None and not is_mutation(query):
+            cache_key = f"{self._token_key}-{operation_key(query, variables)}"
 
-        response = self._http.post(self.API_URL, json=payload)
-        response.raise_for_status()
+        operation = operation_name(query)
+        record = OperationRecord(
+            operation=operation,
+            kind="mutation" if is_mutation(query) else "query",
+            started_at=time.time(),
+            latency=0.0,
+        )
+        started = time.perf_counter()
+        try:
+            body = json.dumps(payload).encode()
+            record.request_bytes = len(body)
+            hedge_after = None if record.kind == "mutation" else self._hedge_delay(operation)
+            estimate = estimate_complexity(query, variables) if self.rate_limiter else 0
+            response, record.retries, record.hedged, record.wire_latency = self._post(
+                body, self.transport.timeout(operation, timeout), operation, deadline_at, hedge_after, estimate
+            )
+            record.status_code = response.status_code
+            record.response_bytes = len(response.content)
+            _record_headers(record, response.headers)
+            response.raise_for_status()
 
-        result = response.json()
+            result = response.json()
 
-        if "errors" in result:
-            error_messages = [e.get("message", str(e)) for e in result["errors"]]
-            raise LinearClientError(
-                f"Linear API error: {'; '.join(error_messages)}",
-                errors=result["errors"],
+            if "errors" in result:
+                error_messages = [e.get("message", str(e)) for e in result["errors"]]
+                raise LinearClientError(
+                    f"Linear API error: {'; '.join(error_messages)}",
+                    errors=result["errors"],
+                )
+
+            data = result.get("data", {})
+            if cache_key is not None:
+                self.fallback_cache.put(cache_key, data)
+            return data
+        except CircuitOpenError as e:
+            cached = self.fallback_cache.lookup(cache_key) if cache_key is not None else None
+            if cached is None:
+                record.error = type(e).__name__
+                raise
+            data, age = cached
+            record.stale = True
+            warnings.warn(
+                f"{operation}: Linear API unavailable ({e}); serving the response cached {age:.0f}s ago",
+                StaleResponseWarning,
             )
+            return data
+        except Exception as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.latency = time.perf_counter() - started
+            self._local.record = record
+            self._emit(record)
 
-        return result.get("data", {})
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Thread pool for bulk work, created on first use.
+
+        It is sized to the transport's connection limit, so every worker can
+        hold a pooled connection without queueing inside httpx.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.transport.max_connections,
+                    thread_name_prefix="linear-bulk",
+                )
+            return self._executor
+
+    def submit(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> Future:
+        """
+        Run fn(*args, **kwargs) on the bulk thread pool.
+
+        Works with any sync call that goes through this client, e.g.
+        client.submit(queries.get_issue, issue_id).
+        """
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def map(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        ordered: bool = False,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[BulkResult[T, R]]:
+        """
+        Run fn over items in parallel, yielding a BulkResult per item.
+
+        Per-item exceptions are captured in the result instead of aborting the
+        batch. Results stream back as they complete, or in input order with
+        ordered=True.
+
+        Example:
+            for result in client.map(queries.get_issue, issue_ids):
+                if result.ok:
+                    print(result.value.identifier)
+        """
+        limit = max_pending or self.transport.max_connections * 2
+        return run_bulk(self.executor, fn, items, ordered=ordered, max_pending=limit)
+
+    def execute_many(
+        self,
+        operations: Iterable[tuple[str, Optional[dict[str, Any]]]],
+        ordered: bool = False,
+    ) -> Iterator[BulkResult[tuple[str, Optional[dict[str, Any]]], dict[str, Any]]]:
+        """Execute many (query, variables) pairs in parallel; see map()."""
+        return self.map(partial(execute_operation, self), operations, ordered=ordered)
+
+    def _emit(self, record: OperationRecord) -> None:
+        """Hand a record to every instrumentation hook, ignoring hook failures."""
+        for hook in self.instrumentation:
+            try:
+                hook(record)
+            except Exception:
+                pass
+
+    def _hedge_delay(self, operation: str) -> Optional[float]:
+        """Seconds after which a query is hedged, or None if it should not be."""
+        if self.hedge_quantile is None:
+            return None
+        return self.wire_latency.quantile(operation, self.hedge_quantile, self.hedge_min_samples)
+
+    def _post(
+        self,
+        body: bytes,
+        timeout: httpx.Timeout,
+        operation: str,
+        deadline_at: Optional[float] = None,
+        hedge_after: Optional[float] = None,
+        complexity: int = 0,
+    ) -> tuple[httpx.Response, int, bool, float]:
+        """
+        Send a request within the shared budget, retrying when rate limited.
+
+        complexity is the locally estimated cost, reserved before sending and
+        reconciled with the X-Complexity the server reports.
+
+        Returns:
+            The final response, the number of retries it took, whether a
+            hedge request was sent and the seconds the final request spent on
+            the wire (excluding rate-limit waits and backoff).
+
+        Raises:
+            DeadlineExceededError: If deadline_at (time.monotonic()) passed.
+            CircuitOpenError: If the circuit breaker refused the request.
+        """
+        attempt = 0
+        hedged = False
+        while True:
+            remaining = _remaining(deadline_at)
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceededError("Deadline passed before the request was sent")
+            if self.rate_limiter:
+                try:
+                    self.rate_limiter.acquire(complexity, priority=self.priority, timeout=remaining)
+                except TimeoutError as e:
+                    raise DeadlineExceededError("Deadline passed waiting for rate-limit budget") from e
+                remaining = _remaining(deadline_at)
+            # Ask the breaker last, so a half-open probe slot is only claimed by a sendable request
+            breaker = self.circuit_breaker
+            if breaker and not breaker.allow():
+                retry_at = breaker.retry_at()
+                if breaker.state == HALF_OPEN:
+                    reason = "another request is probing whether the API recovered"
+                else:
+                    reason = f"retrying in {max(0.0, retry_at - time.time()):.0f}s"
+                raise CircuitOpenError(
+                    f"Linear API circuit is open after repeated failures; {reason}",
+                    retry_at=retry_at,
+                )
+            reported = breaker is None
+            try:
+                request_timeout = _clamp_timeout(timeout, remaining)
+                sent = time.perf_counter()
+                try:
+                    if hedge_after is not None and (remaining is None or hedge_after < remaining):
+                        response, backup_sent = self._post_hedged(
+                            body, request_timeout, operation, hedge_after, complexity
+                        )
+                        hedged = hedged or backup_sent
+                    else:
+                        response = self._send(body, request_timeout, operation)
+                except httpx.TransportError as e:
+                    deadline_hit = remaining is not None and _remaining(deadline_at) < _DEADLINE_SLACK
+                    if isinstance(e, httpx.TimeoutException) and deadline_hit:
+                        raise DeadlineExceededError("Deadline passed waiting for the Linear API") from e
+                    if breaker:
+                        breaker.record(False)
+                    reported = True
+                    raise
+                wire = time.perf_counter() - sent
+                if breaker:
+                    breaker.record(response.status_code < 500, wire)
+                reported = True
+            finally:
+                if not reported:
+                    # Deadline or interruption: no verdict on the API, free the probe slot
+                    breaker.release()
+            if self.rate_limiter:
+                self.rate_limiter.settle(response.headers, complexity)
+
+            if not _is_rate_limited(response) or attempt >= self.max_retries:
+                return response, attempt, hedged, wire
+
+            attempt += 1
+            retry_after = _retry_after_seconds(response)
+            backoff = retry_after if retry_after is not None else min(2 ** attempt, 60)
+            remaining = _remaining(deadline_at)
+            if remaining is not None and backoff >= remaining:
+                raise DeadlineExceededError("Rate limited, and the budget resets after the deadline")
+            if self.rate_limiter:
+                self.rate_limiter.penalize(retry_after)
+            else:
+                time.sleep(backoff)
+
+    def _send(self, body: bytes, timeout: httpx.Timeout, operation: str) -> httpx.Response:
+        """POST one request, recording its time on the wire when the API answered it."""
+        sent = time.perf_counter()
+        response = self._http.post(self.API_URL, content=body, headers=self._headers, timeout=timeout)
+        if response.status_code < 500 and not _is_rate_limited(response):
+            self.wire_latency.observe(operation, time.perf_counter() - sent)
+        return response
+
+    def _post_hedged(
+        self, body: bytes, timeout: httpx.Timeout, operation: str, hedge_after: float, complexity: int = 0
+    ) -> tuple[httpx.Response, bool]:
+        """
+        Send a read, and a backup copy if it is still running after hedge_after.
+
+        The backup is only sent when the rate limiter can pay for it right away
+        and a backup worker is idle, so hedging never queues behind (or delays)
+        other requests. When every primary worker is busy the read is sent on
+        the calling thread without a backup. The first usable response wins; the
+        other request finishes in the background and is discarded.
+
+        Returns:
+            The response and whether a backup request was sent.
+        """
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=2 * self.transport.max_connections,
+                    thread_name_prefix="linear-hedge",
+                )
+            pool = self._hedge_executor
+
+        def submit(slots: threading.BoundedSemaphore) -> Future:
+            def send() -> httpx.Response:
+                try:
+                    return self._send(body, timeout, operation)
+                finally:
+                    slots.release()
+
+            try:
+                return pool.submit(send)
+            except RuntimeError:  # pool shut down by close()
+                slots.release()
+                raise
+
+        if not self._primary_slots.acquire(blocking=False):
+            return self._send(body, timeout, operation), False
+        primary = submit(self._primary_slots)
+        try:
+            return primary.result(timeout=hedge_after), False
+        except FutureTimeout:
+            pass
+        if not self._backup_slots.acquire(blocking=False):
+            return primary.result(), False
+        if self.rate_limiter and not self.rate_limiter.try_acquire(complexity):
+            self._backup_slots.release()
+            return primary.result(), False
+
+        pending = {primary, submit(self._backup_slots)}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and not _is_rate_limited(future.result()):
+                    return future.result(), True
+            if not pending:
+                # Both failed: surface the original request's outcome
+                return primary.result(), True
 
     def close(self):
-        """Close the HTTP client."""
-        self._http.close()
+        """Close the HTTP client (unless it was passed in by the caller) and the thread pools."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._hedge_executor is not None:
+            # Losing hedge requests are of no use to anyone: don't wait for them
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._hedge_executor = None
+        if self._owns_http:
+            self._http.close()
 
     def __enter__(self):
         return self
 
     def __exit__(self, *args):
         self.close()
+
+
+def _remaining(deadline_at: Optional[float]) -> Optional[float]:
+    """Seconds left until a time.monotonic() deadline (None for no deadline)."""
+    return None if deadline_at is None else deadline_at - time.monotonic()
+
+
+def _clamp_timeout(timeout: httpx.Timeout, remaining: Optional[float]) -> httpx.Timeout:
+    """Shorten every phase of a timeout so a request cannot outlive the deadline."""
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceededError("Deadline passed before the request was sent")
+
+    def clamp(value: Optional[float]) -> float:
+        return remaining if value is None else min(value, remaining)
+
+    return httpx.Timeout(
+        connect=clamp(timeout.connect),
+        read=clamp(timeout.read),
+        write=clamp(timeout.write),
+        pool=clamp(timeout.pool),
+    )
+
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    """Check for Linear's RATELIMITED error (HTTP 429, or 400 with the error code)."""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 400:
+        return False
+    try:
+        errors = response.json().get("errors", [])
+    except ValueError:
+        return False
+    return any(
+        (e.get("extensions") or {}).get("code") == "RATELIMITED" for e in errors
+    )
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Seconds until the budget resets, from Retry-After or Linear's reset headers."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    resets = []
+    for prefix in ("Requests", "Complexity"):
+        remaining = response.headers.get(f"X-RateLimit-{prefix}-Remaining")
+        reset = response.headers.get(f"X-RateLimit-{prefix}-Reset")
+        if remaining == "0" and reset and reset.isdigit():
+            resets.append(int(reset) / 1000.0 - time.time())
+    return max(resets) if resets and max(resets) > 0 else None
+
+
+def _record_headers(record: OperationRecord, headers: httpx.Headers) -> None:
+    """Copy complexity cost and rate-limit headroom from response headers."""
+    for attr, header in (
+        ("complexity", "X-Complexity"),
+        ("requests_remaining", "X-RateLimit-Requests-Remaining"),
+        ("complexity_remaining", "X-RateLimit-Complexity-Remaining"),
+    ):
+        value = headers.get(header)
+        if value and value.isdigit():
+            setattr(record, attr, int(value))
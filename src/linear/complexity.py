@@ -0,0 +1,245 @@
+# ABOUTME: Local estimate of Linear's query complexity and adaptive page sizing
+# Prices documents before sending them and picks first: sizes under the complexity budget
+
+import functools
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Linear's model: https://developers.linear.app/docs/graphql/working-with-the-graphql-api/rate-limiting
+PROPERTY_COST = 0.1
+OBJECT_COST = 1.0
+DEFAULT_PAGE_SIZE = 50  # what a connection returns without first/last
+MAX_PAGE_SIZE = 250
+MAX_QUERY_COMPLEXITY = 10_000  # single requests above this are rejected
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\.\.\.|\$?[_A-Za-z][_0-9A-Za-z]*|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|[{}():,!=\[\]@]')
+
+
+@dataclass
+class _Field:
+    name: str
+    args: dict[str, str] = field(default_factory=dict)  # name -> literal or $variable
+    children: list["_Field"] = field(default_factory=list)
+
+
+def _skip_directives(tokens: list[str], pos: int) -> int:
+    while tokens[pos] == "@":
+        pos += 2
+        if tokens[pos] == "(":
+            _, pos = _parse_arguments(tokens, pos)
+    return pos
+
+
+def _parse_arguments(tokens: list[str], pos: int) -> tuple[dict[str, str], int]:
+    """Parse (name: value ...) starting at tokens[pos] == "("; values are kept as text."""
+    args = {}
+    pos += 1
+    while tokens[pos] != ")":
+        name = tokens[pos]
+        pos += 2  # name and ":"
+        start, depth = pos, 0
+        while True:
+            if tokens[pos] in ("{", "["):
+                depth += 1
+            elif tokens[pos] in ("}", "]"):
+                depth -= 1
+            pos += 1
+            if depth == 0:
+                break
+        args[name] = " ".join(tokens[start:pos])
+    return args, pos + 1
+
+
+def _parse_selection(tokens: list[str], pos: int) -> tuple[list[_Field], int]:
+    """Parse a selection set starting at tokens[pos] == "{"."""
+    fields = []
+    pos += 1
+    while tokens[pos] != "}":
+        if tokens[pos] == "...":
+            pos += 1
+            if tokens[pos] == "on":
+                pos += 2  # inline fragment type condition
+            elif tokens[pos] not in ("{", "@"):
+                pos = _skip_directives(tokens, pos + 1)  # named spread: not resolved
+                continue
+            children, pos = _parse_selection(tokens, _skip_directives(tokens, pos))
+            fields.extend(children)
+            continue
+        current = _Field(tokens[pos])
+        pos += 1
+        if tokens[pos] == ":":  # alias
+            current.name = tokens[pos + 1]
+            pos += 2
+        if tokens[pos] == "(":
+            current.args, pos = _parse_arguments(tokens, pos)
+        pos = _skip_directives(tokens, pos)
+        if tokens[pos] == "{":
+            current.children, pos = _parse_selection(tokens, pos)
+        fields.append(current)
+    return fields, pos + 1
+
+
+@functools.lru_cache(maxsize=256)
+def _parse(document: str) -> tuple[_Field, ...]:
+    """Top-level fields of the first operation in a document (cached per document)."""
+    tokens = [t for t in _TOKEN.findall(document) if t != ","]
+    pos = 0
+    # Skip "query Name($var: Type = default)" up to the operation's selection set
+    depth = 0
+    while pos < len(tokens) and not (tokens[pos] == "{" and depth == 0):
+        if tokens[pos] == "(":
+            depth += 1
+        elif tokens[pos] == ")":
+            depth -= 1
+        pos += 1
+    if pos >= len(tokens):
+        return ()
+    try:
+        fields, _ = _parse_selection(tokens, pos)
+    except IndexError:  # malformed document: the server will reject it anyway
+        return ()
+    return tuple(fields)
+
+
+def _page_size(f: _Field, variables: dict[str, Any]) -> int:
+    for name in ("first", "last"):
+        value = f.args.get(name)
+        if value is None:
+            continue
+        if value.startswith("$"):
+            value = variables.get(value[1:])
+        try:
+            return min(int(value), MAX_PAGE_SIZE)
+        except (TypeError, ValueError):
+            continue
+    return DEFAULT_PAGE_SIZE
+
+
+def _cost(fields: list[_Field], variables: dict[str, Any]) -> float:
+    total = 0.0
+    for f in fields:
+        if not f.children:
+            total += PROPERTY_COST
+            continue
+        connection = next((c for c in f.children if c.name in ("nodes", "edges")), None)
+        if connection is None:
+            total += OBJECT_COST + _cost(f.children, variables)
+            continue
+        # A connection costs one object plus its page size times each node
+        other = [c for c in f.children if c is not connection]
+        node_fields = connection.children
+        if connection.name == "edges":
+            node = next((c for c in node_fields if c.name == "node"), None)
+            node_fields = node.children if node else []
+        per_node = OBJECT_COST + _cost(node_fields, variables)
+        total += OBJECT_COST + _page_size(f, variables) * per_node + _cost(other, variables)
+    return total
+
+
+def estimate_complexity(document: str, variables: Optional[dict[str, Any]] = None) -> int:
+    """
+    Estimate the complexity points Linear will charge for a document.
+
+    Every scalar field costs 0.1, every object 1, and the nodes of a
+    connection are multiplied by its first/last argument (a literal or a
+    variable, 50 when absent). Fragment spreads are not resolved.
+    """
+    return math.ceil(_cost(list(_parse(document)), variables or {}))
+
+
+def cost_per_item(document: str, variables: Optional[dict[str, Any]] = None, page_variable: str = "first") -> float:
+    """Marginal complexity of one more item on a page: cost at first=2 minus cost at first=1."""
+    variables = dict(variables or {})
+    fields = list(_parse(document))
+    variables[page_variable] = 1
+    one = _cost(fields, variables)
+    variables[page_variable] = 2
+    return max(_cost(fields, variables) - one, PROPERTY_COST)
+
+
+class AdaptivePageSize:
+    """
+    Choose the first: argument for each page of a paginated read.
+
+    The page size is capped by Linear's per-query complexity limit, by a
+    share of the complexity budget that is left this hour (so one listing
+    cannot drain it), and by a latency target. Below the target the size
+    grows, since larger pages amortize the per-request overhead; pages that
+    take longer than the target halve it, keeping each request well clear
+    of timeouts and of the hedge delay.
+    """
+
+    def __init__(
+        self,
+        item_cost: float,
+        base_cost: float = 0.0,
+        initial: int = DEFAULT_PAGE_SIZE,
+        maximum: int = MAX_PAGE_SIZE,
+        target_latency: float = 2.0,
+        budget_share: float = 0.05,
+    ):
+        """
+        Initialize the page sizer.
+
+        Args:
+            item_cost: Complexity of one item on a page (see cost_per_item).
+            base_cost: Complexity of the document apart from its items.
+            initial: First page size to try.
+            maximum: Largest page size Linear accepts.
+            target_latency: Seconds a page should take at most.
+            budget_share: Largest fraction of the remaining complexity budget
+                one page may use.
+        """
+        self.item_cost = item_cost
+        self.base_cost = base_cost
+        self.maximum = max(1, min(maximum, self._limit(MAX_QUERY_COMPLEXITY)))
+        self.target_latency = target_latency
+        self.budget_share = budget_share
+        self.size = max(1, min(initial, self.maximum))
+        self._lock = threading.Lock()
+
+    def _limit(self, complexity: float) -> int:
+        return int((complexity - self.base_cost) // self.item_cost) if self.item_cost > 0 else MAX_PAGE_SIZE
+
+    def next(self, complexity_remaining: Optional[float] = None) -> int:
+        """Page size for the next request given the remaining complexity budget."""
+        with self._lock:
+            size = self.size
+        if complexity_remaining is not None:
+            size = min(size, self._limit(complexity_remaining * self.budget_share))
+        return max(1, size)
+
+    def observe(self, size: int, latency: float) -> None:
+        """Record how long a page of the given size took."""
+        with self._lock:
+            if latency > self.target_latency:
+                self.size = max(1, min(self.size, size) // 2)
+            elif size >= self.size:
+                # Grow toward the size the target allows at the observed per-item rate
+                allowed = size * self.target_latency / max(latency, 1e-3)
+                self.size = min(self.maximum, max(size + 1, int(min(allowed, size * 2))))
+
+
+_sizers: dict[str, AdaptivePageSize] = {}
+_sizers_lock = threading.Lock()
+
+
+def page_sizer(document: str, variables: Optional[dict[str, Any]] = None) -> AdaptivePageSize:
+    """
+    The shared page sizer for a paginated document (with a $first variable).
+
+    Sizers are kept per document for the life of the process, so what one
+    listing learns about latency carries over to the next.
+    """
+    with _sizers_lock:
+        sizer = _sizers.get(document)
+        if sizer is None:
+            base = dict(variables or {}, first=0)
+            sizer = _sizers[document] = AdaptivePageSize(
+                cost_per_item(document, variables),
+                base_cost=_cost(list(_parse(document)), base),
+            )
+        return sizer
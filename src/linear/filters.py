@@ -0,0 +1,140 @@
+# ABOUTME: Composable IssueFilter builder passed to Linear as a $filter variable
+# Keeps search documents constant so they dedupe, cache and batch like any other query
+
+from datetime import datetime
+from typing import Any, Iterable, Optional, Union
+
+# Workflow state categories (WorkflowState.type)
+STATE_TYPES = ("triage", "backlog", "unstarted", "started", "completed", "canceled")
+
+DateLike = Union[datetime, str]
+
+
+def _date(value: DateLike) -> str:
+    """ISO 8601 date-time, or a string as given (Linear also accepts durations like "-P2W")."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class IssueFilter:
+    """
+    Immutable builder for Linear's IssueFilter input.
+
+    Each method returns a new filter with one more condition; conditions are
+    ANDed. Combine filters with & and |:
+
+        IssueFilter().team(team_id).state_types("started") | IssueFilter().labels(review_id)
+
+    Values never enter the document text: to_dict() is sent as the $filter
+    variable of a fixed query, so every search shares one document.
+    """
+
+    def __init__(self, conditions: Optional[dict[str, Any]] = None):
+        self._conditions: dict[str, Any] = dict(conditions or {})
+
+    def _with(self, key: str, condition: dict[str, Any]) -> "IssueFilter":
+        conditions = dict(self._conditions)
+        if key in conditions:
+            # Two conditions on the same field must both hold
+            and_list = list(conditions.get("and", []))
+            and_list.append({key: condition})
+            conditions["and"] = and_list
+        else:
+            conditions[key] = condition
+        return IssueFilter(conditions)
+
+    def team(self, team_id: str) -> "IssueFilter":
+        """Issues of a team."""
+        return self._with("team", {"id": {"eq": team_id}})
+
+    def project(self, project_id: str) -> "IssueFilter":
+        """Issues in a project."""
+        return self._with("project", {"id": {"eq": project_id}})
+
+    def labels(self, *label_ids: str) -> "IssueFilter":
+        """Issues with at least one of the labels."""
+        return self._with("labels", {"id": {"in": list(label_ids)}})
+
+    def without_labels(self, *label_ids: str) -> "IssueFilter":
+        """Issues with none of the labels."""
+        return self._with("labels", {"every": {"id": {"nin": list(label_ids)}}})
+
+    def states(self, *state_ids: str) -> "IssueFilter":
+        """Issues in one of the workflow states."""
+        return self._with("state", {"id": {"in": list(state_ids)}})
+
+    def state_types(self, *types: str) -> "IssueFilter":
+        """
+        Issues whose state is in one of the categories (see STATE_TYPES).
+
+        Raises:
+            ValueError: If a type is not a Linear state category.
+        """
+        unknown = [t for t in types if t not in STATE_TYPES]
+        if unknown:
+            raise ValueError(f"Unknown state type(s): {', '.join(unknown)}")
+        return self._with("state", {"type": {"in": list(types)}})
+
+    def assignee(self, user_id: Optional[str]) -> "IssueFilter":
+        """Issues assigned to a user, or unassigned issues for None."""
+        if user_id is None:
+            return self._with("assignee", {"null": True})
+        return self._with("assignee", {"id": {"eq": user_id}})
+
+    def updated_after(self, value: DateLike) -> "IssueFilter":
+        """Issues updated after a date-time (or ISO 8601 duration such as "-P1D")."""
+        return self._with("updatedAt", {"gt": _date(value)})
+
+    def updated_before(self, value: DateLike) -> "IssueFilter":
+        """Issues last updated before a date-time (or ISO 8601 duration)."""
+        return self._with("updatedAt", {"lt": _date(value)})
+
+    def created_after(self, value: DateLike) -> "IssueFilter":
+        """Issues created after a date-time (or ISO 8601 duration)."""
+        return self._with("createdAt", {"gt": _date(value)})
+
+    def __and__(self, other: "IssueFilter") -> "IssueFilter":
+        if not self or not other:
+            return self if self else other
+        return IssueFilter({"and": [self.to_dict(), other.to_dict()]})
+
+    def __or__(self, other: "IssueFilter") -> "IssueFilter":
+        return IssueFilter({"or": [self.to_dict(), other.to_dict()]})
+
+    def __bool__(self) -> bool:
+        return bool(self._conditions)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IssueFilter) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"IssueFilter({self._conditions!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """The IssueFilter input object, ready to send as a variable."""
+        return dict(self._conditions)
+
+    @classmethod
+    def from_args(
+        cls,
+        team_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        label_ids: Optional[Iterable[str]] = None,
+        state_ids: Optional[Iterable[str]] = None,
+        state_types: Optional[Iterable[str]] = None,
+        updated_after: Optional[DateLike] = None,
+    ) -> "IssueFilter":
+        """Build a filter from search_issues-style keyword arguments."""
+        f = cls()
+        if team_id:
+            f = f.team(team_id)
+        if project_id:
+            f = f.project(project_id)
+        if label_ids:
+            f = f.labels(*label_ids)
+        if state_ids:
+            f = f.states(*state_ids)
+        if state_types:
+            f = f.state_types(*state_types)
+        if updated_after:
+            f = f.updated_after(updated_after)
+        return f
@@ -0,0 +1,259 @@
+# ABOUTME: Lease-based claims on issues to prevent duplicate concurrent work
+# Records owner and expiry in a structured comment and arbitrates with compare-and-set
+
+import json
+import os
+import re
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from .client import LinearClient, LinearClientError
+from .mutations import LinearMutations
+from .queries import LinearQueries
+from .types import Comment, IssueLease
+
+LEASE_MARKER = "speckit-lease"
+_LEASE_PATTERN = re.compile(r"`" + LEASE_MARKER + r" (\{.*?\})`")
+
+
+class LeaseHeldError(LinearClientError):
+    """Raised when another owner holds a live lease on the issue."""
+
+    def __init__(self, message: str, lease: Optional[IssueLease] = None):
+        super().__init__(message)
+        self.lease = lease
+
+
+def default_lease_owner() -> str:
+    """Describe the current process (CI pipeline if available, else host:pid)."""
+    pipeline = os.environ.get("CI_PIPELINE_NUMBER")
+    if pipeline:
+        return f"{os.environ.get('CI_REPO', 'ci')}#{pipeline}"
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class IssueLeaseManager:
+    """
+    Claim issues for exclusive work using lease comments.
+
+    Linear has no native compare-and-set, so a claim is arbitrated in two
+    round trips: one mutation that writes this owner's lease comment and adds
+    the in-progress label, and one verifying read in which the earliest live
+    lease (by server-assigned createdAt) wins. A lease that was already held
+    is earlier than any new one, so late contenders lose on the same read;
+    losers delete their comment and raise LeaseHeldError.
+
+    Remaining race: if a contender's verify read is served before another
+    contender's comment is visible, both can see themselves as the earliest.
+    Linear normally makes writes visible to the next read, so the window is
+    the replication lag, if any; settle_seconds trades latency for a
+    smaller window.
+    """
+
+    def __init__(
+        self,
+        client: LinearClient,
+        owner: Optional[str] = None,
+        ttl_seconds: float = 3600.0,
+        label_id: Optional[str] = None,
+        settle_seconds: float = 0.0,
+    ):
+        """
+        Initialize the lease manager.
+
+        Args:
+            client: LinearClient used for all reads and writes.
+            owner: Human-readable owner recorded in the lease. Defaults to the
+                CI pipeline or host:pid.
+            ttl_seconds: How long a lease stays live without renewal.
+            label_id: Label applied while the lease is held. Defaults to the
+                ai:in-progress label from the client's config.
+            settle_seconds: Optional pause between writing a lease and
+                verifying it, narrowing the visibility race (see above).
+        """
+        self.client = client
+        self.owner = owner or default_lease_owner()
+        self.ttl_seconds = ttl_seconds
+        self.settle_seconds = settle_seconds
+        self._queries = LinearQueries(client)
+        self._mutations = LinearMutations(client)
+        if label_id is None and client.config is not None:
+            label_id = client.config.labels.get("ai:in-progress") or None
+        self.label_id = label_id
+
+    def current(self, issue_id: str) -> Optional[IssueLease]:
+        """
+        Get the live lease on an issue, if any.
+
+        Args:
+            issue_id: Issue UUID or identifier.
+
+        Returns:
+            The winning live lease, or None if the issue is unclaimed.
+        """
+        leases = self._live_leases(issue_id)
+        return leases[0] if leases else None
+
+    def claim(self, issue_id: str) -> IssueLease:
+        """
+        Claim an issue with one write and one verifying read.
+
+        The lease comment and the in-progress label are written in a single
+        mutation. Adding the label is idempotent, so a losing contender does
+        not disturb the winner's label.
+
+        If the verifying read fails, the lease comment is deleted before the
+        error is raised, so a failed claim does not block the issue for a TTL.
+
+        Args:
+            issue_id: Issue UUID or identifier.
+
+        Returns:
+            The lease now held by this owner.
+
+        Raises:
+            LeaseHeldError: If another owner holds or wins the lease.
+        """
+        token = uuid.uuid4().hex
+        expires_at = (_utcnow() + timedelta(seconds=self.ttl_seconds)).isoformat()
+        comment_id = self._write_claim(issue_id, self._format_body(self.owner, token, expires_at))
+
+        try:
+            if self.settle_seconds:
+                time.sleep(self.settle_seconds)
+            leases = self._live_leases(issue_id)
+        except BaseException:
+            try:
+                self._mutations.delete_comment(comment_id)
+            except Exception:
+                pass  # the original error matters more; the lease expires with its TTL
+            raise
+        winner = leases[0] if leases else None
+        if winner is None or winner.token != token:
+            self._mutations.delete_comment(comment_id)
+            raise self._held(issue_id, winner)
+        return winner
+
+    def renew(self, lease: IssueLease) -> IssueLease:
+        """
+        Extend a held lease by another TTL.
+
+        Args:
+            lease: Lease returned by claim().
+
+        Returns:
+            The lease with its new expiry.
+
+        Raises:
+            LeaseHeldError: If the lease expired and another owner took over.
+        """
+        holder = self.current(lease.issue_id)
+        if holder is not None and holder.token != lease.token:
+            raise self._held(lease.issue_id, holder)
+
+        expires_at = (_utcnow() + timedelta(seconds=self.ttl_seconds)).isoformat()
+        self._mutations.update_comment(
+            lease.comment_id, self._format_body(lease.owner, lease.token, expires_at)
+        )
+        return IssueLease(
+            issue_id=lease.issue_id,
+            owner=lease.owner,
+            token=lease.token,
+            expires_at=expires_at,
+            comment_id=lease.comment_id,
+            created_at=lease.created_at,
+        )
+
+    def release(self, lease: IssueLease) -> None:
+        """
+        Release a held lease and remove the in-progress label.
+
+        The label is left alone if another owner holds the issue by then
+        (this lease expired and was taken over).
+
+        Args:
+            lease: Lease returned by claim().
+        """
+        if lease.comment_id:
+            self._mutations.delete_comment(lease.comment_id)
+        if self.label_id:
+            holder = self.current(lease.issue_id)
+            if holder is None or holder.token == lease.token:
+                self._mutations.remove_issue_label(lease.issue_id, self.label_id)
+
+    @contextmanager
+    def hold(self, issue_id: str) -> Iterator[IssueLease]:
+        """Claim an issue for the duration of a with-block."""
+        lease = self.claim(issue_id)
+        try:
+            yield lease
+        finally:
+            self.release(lease)
+
+    def _write_claim(self, issue_id: str, body: str) -> str:
+        """Create the lease comment (and add the label) in one request; returns the comment id."""
+        declarations = ["$comment: CommentCreateInput!"]
+        selections = ["commentCreate(input: $comment) { comment { id } success }"]
+        variables = {"comment": {"issueId": issue_id, "body": body}}
+        if self.label_id:
+            declarations.append("$issueId: String!, $labelInput: IssueUpdateInput!")
+            selections.append("issueUpdate(id: $issueId, input: $labelInput) { success }")
+            variables["issueId"] = issue_id
+            variables["labelInput"] = {"addedLabelIds": [self.label_id]}
+        mutation = (
+            f"mutation ClaimIssue({', '.join(declarations)}) {{\n    "
+            + "\n    ".join(selections)
+            + "\n}"
+        )
+        data = self.client.execute(mutation, variables)
+        return data["commentCreate"]["comment"]["id"]
+
+    def _live_leases(self, issue_id: str) -> list[IssueLease]:
+        """Return unexpired leases, winner first."""
+        now = _utcnow()
+        leases = []
+        for comment in self._queries.get_issue_comments(issue_id):
+            lease = self._parse_comment(issue_id, comment)
+            if lease is not None and _parse_time(lease.expires_at) > now:
+                leases.append(lease)
+        leases.sort(key=lambda l: (_parse_time(l.created_at), l.comment_id))
+        return leases
+
+    def _held(self, issue_id: str, holder: Optional[IssueLease]) -> LeaseHeldError:
+        owner = holder.owner if holder else "another owner"
+        return LeaseHeldError(f"Issue {issue_id} is already claimed by {owner}", lease=holder)
+
+    @staticmethod
+    def _format_body(owner: str, token: str, expires_at: str) -> str:
+        payload = json.dumps({"owner": owner, "token": token, "expiresAt": expires_at})
+        return f"`{LEASE_MARKER} {payload}`\n\nClaimed by **{owner}** until {expires_at}."
+
+    @staticmethod
+    def _parse_comment(issue_id: str, comment: Comment) -> Optional[IssueLease]:
+        match = _LEASE_PATTERN.search(comment.body or "")
+        if not match:
+            return None
+        try:
+            payload = json.loads(match.group(1))
+            return IssueLease(
+                issue_id=issue_id,
+                owner=payload["owner"],
+                token=payload["token"],
+                expires_at=payload["expiresAt"],
+                comment_id=comment.id,
+                created_at=comment.created_at,
+            )
+        except (ValueError, KeyError):
+            return None
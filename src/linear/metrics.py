@@ -0,0 +1,245 @@
+# ABOUTME: Per-operation instrumentation for LinearClient.execute
+# Collects latency histograms, payload sizes, complexity and rate-limit headroom for export
+
+import atexit
+import bisect
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Latency buckets in seconds (upper bounds, Prometheus "le" labels)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class OperationRecord:
+    """Measurements for one LinearClient.execute call."""
+    operation: str
+    kind: str  # "query" or "mutation"
+    started_at: float  # epoch seconds
+    latency: float  # seconds, including retries
+    wire_latency: Optional[float] = None  # seconds the final request spent on the wire
+    request_bytes: int = 0
+    response_bytes: int = 0
+    complexity: Optional[int] = None
+    retries: int = 0
+    requests_remaining: Optional[int] = None
+    complexity_remaining: Optional[int] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    hedged: bool = False  # a backup request was sent after the hedge delay
+    stale: bool = False  # served from the fallback cache while the circuit was open
+
+
+Instrumentation = Callable[[OperationRecord], None]
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value (backslash, double quote, newline)."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    """Cumulative-bucket histogram matching the Prometheus data model."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class LatencyWindow:
+    """
+    Time on the wire of the most recent requests of each operation.
+
+    Unlike the operation histograms, a sample is one HTTP request that the
+    API answered: rate-limit waits, retries and failed requests are not
+    included, and quantiles are exact rather than bucket bounds.
+    """
+
+    def __init__(self, size: int = 256):
+        self.size = size
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+
+    def observe(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(operation)
+            if samples is None:
+                samples = self._samples[operation] = deque(maxlen=self.size)
+            samples.append(seconds)
+
+    def quantile(self, operation: str, q: float, min_count: int = 1) -> Optional[float]:
+        """Latency quantile (seconds) of the recent samples, or None with fewer than min_count."""
+        with self._lock:
+            samples = sorted(self._samples.get(operation, ()))
+        if not samples or len(samples) < min_count:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class _OperationStats:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.complexity = 0
+        self.hedges = 0
+        self.stale = 0
+
+
+class MetricsRegistry:
+    """
+    In-process metrics for Linear operations.
+
+    A registry is an instrumentation hook: pass it to LinearClient (or call
+    add_instrumentation) and every execute() is recorded under its GraphQL
+    operation name. Export with to_prometheus() or write(); the latter picks
+    the format from the file extension (.prom for Prometheus text, otherwise JSON).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: dict[str, _OperationStats] = {}
+        self.requests_remaining: Optional[int] = None
+        self.complexity_remaining: Optional[int] = None
+
+    def __call__(self, record: OperationRecord) -> None:
+        with self._lock:
+            stats = self._operations.get(record.operation)
+            if stats is None:
+                stats = self._operations[record.operation] = _OperationStats(record.kind)
+            stats.latency.observe(record.latency)
+            stats.retries += record.retries
+            stats.request_bytes += record.request_bytes
+            stats.response_bytes += record.response_bytes
+            stats.complexity += record.complexity or 0
+            stats.hedges += record.hedged
+            stats.stale += record.stale
+            if record.error:
+                stats.errors += 1
+            if record.requests_remaining is not None:
+                self.requests_remaining = record.requests_remaining
+            if record.complexity_remaining is not None:
+                self.complexity_remaining = record.complexity_remaining
+
+    def to_dict(self) -> dict:
+        """Snapshot of all metrics as plain data."""
+        with self._lock:
+            return {
+                "operations": {
+                    name: {
+                        "kind": s.kind,
+                        "count": s.latency.count,
+                        "errors": s.errors,
+                        "retries": s.retries,
+                        "latencySeconds": {
+                            "sum": s.latency.sum,
+                            "buckets": dict(s.latency.cumulative()),
+                        },
+                        "requestBytes": s.request_bytes,
+                        "responseBytes": s.response_bytes,
+                        "complexity": s.complexity,
+                        "hedges": s.hedges,
+                        "staleResponses": s.stale,
+                    }
+                    for name, s in sorted(self._operations.items())
+                },
+                "rateLimit": {
+                    "requestsRemaining": self.requests_remaining,
+                    "complexityRemaining": self.complexity_remaining,
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            operations = sorted(self._operations.items())
+
+            lines.append("# HELP linear_operation_duration_seconds Linear GraphQL operation latency.")
+            lines.append("# TYPE linear_operation_duration_seconds histogram")
+            for name, s in operations:
+                labels = f'operation="{_label(name)}",kind="{_label(s.kind)}"'
+                for bound, count in s.latency.cumulative():
+                    lines.append(f'linear_operation_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"linear_operation_duration_seconds_sum{{{labels}}} {s.latency.sum}")
+                lines.append(f"linear_operation_duration_seconds_count{{{labels}}} {s.latency.count}")
+
+            counters = (
+                ("linear_operation_errors_total", "Failed operations.", "errors"),
+                ("linear_operation_retries_total", "Rate-limit retries.", "retries"),
+                ("linear_operation_request_bytes_total", "Request payload bytes.", "request_bytes"),
+                ("linear_operation_response_bytes_total", "Response payload bytes.", "response_bytes"),
+                ("linear_operation_complexity_total", "Complexity points charged.", "complexity"),
+                ("linear_operation_hedges_total", "Backup requests sent for slow reads.", "hedges"),
+                ("linear_operation_stale_total", "Responses served from the fallback cache.", "stale"),
+            )
+            for metric, help_text, attr in counters:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, s in operations:
+                    lines.append(f'{metric}{{operation="{_label(name)}",kind="{_label(s.kind)}"}} {getattr(s, attr)}')
+
+            for metric, value in (
+                ("linear_ratelimit_requests_remaining", self.requests_remaining),
+                ("linear_ratelimit_complexity_remaining", self.complexity_remaining),
+            ):
+                if value is not None:
+                    lines.append(f"# TYPE {metric} gauge")
+                    lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write metrics to a file (.prom: Prometheus text, otherwise JSON)."""
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), indent=2) + "\n"
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+_default_registry: Optional[MetricsRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> Optional[MetricsRegistry]:
+    """
+    Process-wide registry enabled by LINEAR_METRICS_FILE.
+
+    When the variable is set, every LinearClient records into one registry
+    that is written to that path at interpreter exit. Returns None otherwise.
+    """
+    global _default_registry
+    path = os.environ.get("LINEAR_METRICS_FILE")
+    if not path:
+        return None
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+            atexit.register(_default_registry.write, path)
+        return _default_registry
+
@@ -19,9 +19,16 @@ from .queries import LinearQueries
 class LinearMutations:
     """GraphQL mutation operations for Linear API."""
 
-    def __init__(self, client: LinearClient):
-        self.client = client
-        self._queries = LinearQueries(client)
+    def __init__(self, client: Optional[LinearClient] = None):
+        """
+        Initialize mutation operations.
+
+        Args:
+            client: Client to send requests through. Defaults to the
+                process-wide LinearClient.shared() instance.
+        """
+        self.client = client or LinearClient.shared()
+        self._queries = LinearQueries(self.client)
 
     # ============ Project Operations ============
 
@@ -328,6 +335,59 @@ class LinearMutations:
             created_at=comment["createdAt"],
         )
 
+    def update_comment(self, comment_id: str, body: str) -> Comment:
+        """
+        Replace the body of an existing comment.
+
+        Args:
+            comment_id: Comment UUID.
+            body: New comment body (markdown).
+
+        Returns:
+            Updated Comment object.
+        """
+        mutation = """
+        mutation UpdateComment($id: String!, $input: CommentUpdateInput!) {
+            commentUpdate(id: $id, input: $input) {
+                comment {
+                    id
+                    body
+                    createdAt
+                    updatedAt
+                }
+                success
+            }
+        }
+        """
+        data = self.client.execute(mutation, {"id": comment_id, "input": {"body": body}})
+        comment = data["commentUpdate"]["comment"]
+        return Comment(
+            id=comment["id"],
+            body=comment["body"],
+            created_at=comment["createdAt"],
+            updated_at=comment.get("updatedAt"),
+        )
+
+    def delete_comment(self, comment_id: str) -> bool:
+        """
+        Delete a comment.
+
+        Args:
+            comment_id: Comment UUID.
+
+        Returns:
+            True if the comment was deleted.
+        """
+        mutation = """
+        mutation DeleteComment($id: String!) {
+            commentDelete(id: $id) {
+                success
+            }
+        }
+        """
+        data = self.client.execute(mutation, {"id": comment_id})
+        return bool(data["commentDelete"]["success"])
+
     # ============ Milestone Operations ============
 
     def create_milestone(
@@ -0,0 +1,525 @@
+# ABOUTME: Write-behind outbox that coalesces Linear issue updates and comments
+# Journals queued writes to disk and flushes them as batched, aliased mutations
+
+import atexit
+import glob
+import hashlib
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+from .client import LinearClient, LinearClientError, _is_rate_limited
+from .ratelimit import _FileLock, default_state_dir, private_dir
+from .types import IssuePriority
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_MAX_BATCH = 20
+DEFAULT_MAX_ATTEMPTS = 10
+
+
+def _try_lock(fd: int) -> bool:
+    """Take an exclusive lock on fd without waiting; False if another process holds it."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+@dataclass
+class _IssueUpdate:
+    """All pending changes to one issue, merged so that the last write wins."""
+    issue_id: str
+    fields: dict[str, Any] = field(default_factory=dict)
+    label_ids: Optional[list[str]] = None  # full replacement set, if one was given
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    attempts: int = 0  # flushes that failed with a retryable error
+
+    @property
+    def key(self) -> str:
+        return f"issue:{self.issue_id}"
+
+    def merge(self, newer: "_IssueUpdate") -> None:
+        self.fields.update(newer.fields)
+        if newer.label_ids is not None:
+            self.label_ids = list(newer.label_ids)
+            self.added, self.removed = [], []
+        for label_id in newer.added:
+            self._add(label_id)
+        for label_id in newer.removed:
+            self._remove(label_id)
+
+    def _add(self, label_id: str) -> None:
+        if self.label_ids is not None:
+            if label_id not in self.label_ids:
+                self.label_ids.append(label_id)
+            return
+        if label_id in self.removed:
+            self.removed.remove(label_id)
+        if label_id not in self.added:
+            self.added.append(label_id)
+
+    def _remove(self, label_id: str) -> None:
+        if self.label_ids is not None:
+            if label_id in self.label_ids:
+                self.label_ids.remove(label_id)
+            return
+        if label_id in self.added:
+            self.added.remove(label_id)
+        if label_id not in self.removed:
+            self.removed.append(label_id)
+
+    def is_empty(self) -> bool:
+        return not (self.fields or self.label_ids is not None or self.added or self.removed)
+
+    def mutation(self, alias: str) -> tuple[str, str, dict[str, Any]]:
+        """Variable declarations, aliased field and variables for a batched document."""
+        data = dict(self.fields)
+        if self.label_ids is not None:
+            data["labelIds"] = self.label_ids
+        else:
+            if self.added:
+                data["addedLabelIds"] = self.added
+            if self.removed:
+                data["removedLabelIds"] = self.removed
+        declarations = f"${alias}Id: String!, ${alias}Input: IssueUpdateInput!"
+        selection = f"{alias}: issueUpdate(id: ${alias}Id, input: ${alias}Input) {{ success }}"
+        return declarations, selection, {f"{alias}Id": self.issue_id, f"{alias}Input": data}
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "op": "issueUpdate",
+            "issueId": self.issue_id,
+            "fields": self.fields,
+            "labelIds": self.label_ids,
+            "added": self.added,
+            "removed": self.removed,
+            "attempts": self.attempts,
+        }
+
+
+@dataclass
+class _CommentCreate:
+    """A queued comment. Its id is generated locally, so a replayed create cannot duplicate it."""
+    issue_id: str
+    body: str
+    comment_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    attempts: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"comment:{self.comment_id}"
+
+    def merge(self, newer: "_CommentCreate") -> None:
+        self.body = newer.body
+
+    def mutation(self, alias: str) -> tuple[str, str, dict[str, Any]]:
+        declarations = f"${alias}Input: CommentCreateInput!"
+        selection = f"{alias}: commentCreate(input: ${alias}Input) {{ success }}"
+        data = {"id": self.comment_id, "issueId": self.issue_id, "body": self.body}
+        return declarations, selection, {f"{alias}Input": data}
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "op": "commentCreate",
+            "issueId": self.issue_id,
+            "commentId": self.comment_id,
+            "body": self.body,
+            "attempts": self.attempts,
+        }
+
+
+def _from_json(data: dict[str, Any]):
+    if data["op"] == "commentCreate":
+        return _CommentCreate(data["issueId"], data["body"], data["commentId"], data.get("attempts", 0))
+    return _IssueUpdate(
+        data["issueId"],
+        dict(data.get("fields") or {}),
+        data.get("labelIds"),
+        list(data.get("added") or []),
+        list(data.get("removed") or []),
+        data.get("attempts", 0),
+    )
+
+
+def _retryable(error: Exception) -> bool:
+    """Whether a failed flush should keep its writes queued rather than reject them."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or _is_rate_limited(error.response)
+    if isinstance(error, LinearClientError):
+        # Circuit open, deadline: no API verdict on the writes
+        return not error.errors
+    return True  # transport errors and anything unexpected
+
+
+def _api_errors(error: Exception) -> list[dict[str, Any]]:
+    """GraphQL errors of a rejected request (from the exception or the 4xx body)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            return list(error.response.json().get("errors") or [])
+        except (ValueError, AttributeError):
+            return []
+    return list(getattr(error, "errors", None) or [])
+
+
+class MutationOutbox:
+    """
+    Queue issue writes locally and send them later as batched mutations.
+
+    Writes to the same issue are coalesced: field updates keep their last
+    value, label additions and removals collapse to the final delta (sent as
+    addedLabelIds/removedLabelIds, so no read is needed first), and an
+    explicit label set replaces both. Comments are queued in order with a
+    client-generated id. Pending writes are flushed every flush_interval
+    seconds, by flush(), and at interpreter exit, at most max_batch aliased
+    mutations per request.
+
+    Writes the API rejects (GraphQL errors, including 4xx validation errors)
+    are pinned to their alias and moved to failed; the rest of the batch is
+    still sent. Transport errors, 5xx responses, rate limits and an open
+    circuit keep the writes queued, up to max_attempts flushes each.
+
+    Every write is appended to a JSONL journal before it is acknowledged.
+    Journals live in a directory only the current user can access, are
+    created 0600 and locked for the outbox's lifetime, and are compacted
+    after each flush. A new outbox adopts the journals of outboxes whose
+    process died (their lock is free) and sends their writes too.
+    """
+
+    def __init__(
+        self,
+        client: Optional[LinearClient] = None,
+        journal_dir: Optional[str] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        """
+        Initialize the outbox and replay orphaned journals.
+
+        Args:
+            client: Client to flush through. Defaults to LinearClient.shared().
+            journal_dir: Directory for journals. Defaults to LINEAR_OUTBOX_DIR,
+                or an outbox directory next to the rate-limit state.
+            flush_interval: Seconds between background flushes; 0 disables
+                the background flush (flush() and exit still send).
+            max_batch: Maximum mutations per request.
+            max_attempts: Failed flushes after which a write is given up
+                and moved to failed.
+
+        Raises:
+            PermissionError: If the journal directory is not private to the
+                current user (see ratelimit.private_dir).
+        """
+        self.client = client or LinearClient.shared()
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        # (entry as JSON, error message) for writes the API rejected or that were given up
+        self.failed: list[tuple[dict[str, Any], str]] = []
+
+        self.journal_dir = private_dir(
+            journal_dir or os.environ.get("LINEAR_OUTBOX_DIR") or os.path.join(default_state_dir(), "outbox")
+        )
+        # Held while a journal is created and locked, and while journals are adopted,
+        # so replay() never sees a journal before its owner has locked it
+        self._dir_lock_path = os.path.join(self.journal_dir, ".lock")
+        self._prefix = hashlib.sha256(self.client.token.encode()).hexdigest()[:16]
+        self.journal_path = os.path.join(
+            self.journal_dir, f"{self._prefix}-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl"
+        )
+        with _FileLock(self._dir_lock_path):
+            fd = os.open(self.journal_path, os.O_RDWR | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o600)
+            if not _try_lock(fd):
+                os.close(fd)
+                os.remove(self.journal_path)
+                raise LinearClientError(f"Could not lock outbox journal {self.journal_path}")
+        self._journal = os.fdopen(fd, "a+")
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[str, Any] = {}
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.replay()
+        atexit.register(self.close)
+
+    # ============ Queued Writes ============
+
+    def update_issue(
+        self,
+        issue_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        state_id: Optional[str] = None,
+        priority: Optional[IssuePriority] = None,
+        label_ids: Optional[list[str]] = None,
+        milestone_id: Optional[str] = None,
+        assignee_id: Optional[str] = None,
+    ) -> None:
+        """Queue an issue update; arguments as in LinearMutations.update_issue."""
+        fields = {}
+        for name, value in (
+            ("title", title),
+            ("description", description),
+            ("stateId", state_id),
+            ("priority", priority.value if priority is not None else None),
+            ("projectMilestoneId", milestone_id),
+            ("assigneeId", assignee_id),
+        ):
+            if value is not None:
+                fields[name] = value
+        self._enqueue(_IssueUpdate(issue_id, fields, list(label_ids) if label_ids is not None else None))
+
+    def add_issue_label(self, issue_id: str, label_id: str) -> None:
+        """Queue adding a label to an issue."""
+        self._enqueue(_IssueUpdate(issue_id, added=[label_id]))
+
+    def remove_issue_label(self, issue_id: str, label_id: str) -> None:
+        """Queue removing a label from an issue."""
+        self._enqueue(_IssueUpdate(issue_id, removed=[label_id]))
+
+    def create_comment(self, issue_id: str, body: str) -> str:
+        """
+        Queue a comment on an issue.
+
+        Returns:
+            The id the comment will have once it is sent.
+        """
+        entry = _CommentCreate(issue_id, body)
+        self._enqueue(entry)
+        return entry.comment_id
+
+    # ============ Flushing ============
+
+    def pending(self) -> int:
+        """Number of queued (coalesced) writes."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Send every pending write now.
+
+        Writes the API rejects are dropped and recorded in failed. On a
+        transport error, 5xx response, open circuit or rate limit, the writes
+        stay queued (and journaled) for the next flush and the error is
+        raised; a write whose flush has failed max_attempts times is moved
+        to failed instead.
+
+        Returns:
+            The number of writes sent successfully.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending.values())
+                self._pending = {}
+            sent = 0
+            try:
+                while batch:
+                    chunk = batch[:self.max_batch]
+                    settled: list = []
+                    try:
+                        sent += self._send(chunk, settled)
+                    except Exception as e:
+                        # Writes already sent (or rejected) one by one must not be sent again
+                        settled_ids = {id(entry) for entry in settled}
+                        unsettled = [entry for entry in chunk if id(entry) not in settled_ids]
+                        batch[:len(chunk)] = unsettled
+                        for entry in unsettled:
+                            entry.attempts += 1
+                            if entry.attempts >= self.max_attempts:
+                                self.failed.append((entry.to_json(), f"Gave up after {entry.attempts} attempts: {e}"))
+                        raise
+                    del batch[:len(chunk)]
+            except Exception:
+                self._requeue([entry for entry in batch if entry.attempts < self.max_attempts])
+                raise
+            finally:
+                self._compact()
+            return sent
+
+    def close(self) -> None:
+        """Stop the background flush, send what is pending and release the journal."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.flush()
+        except Exception:
+            # The journal keeps the writes for the next outbox to replay
+            pass
+        with self._lock:
+            empty = not self._pending
+        self._journal.close()
+        if empty:
+            try:
+                os.remove(self.journal_path)
+            except OSError:
+                pass
+        atexit.unregister(self.close)
+
+    def replay(self) -> int:
+        """
+        Adopt the journals of dead outboxes for this token into this one.
+
+        Returns:
+            The number of writes adopted.
+        """
+        adopted = 0
+        with _FileLock(self._dir_lock_path):
+            for path in sorted(glob.glob(os.path.join(self.journal_dir, f"{self._prefix}-*.jsonl"))):
+                if path == self.journal_path:
+                    continue
+                try:
+                    fd = os.open(path, os.O_RDWR | getattr(os, "O_NOFOLLOW", 0))
+                except OSError:
+                    continue
+                try:
+                    if hasattr(os, "getuid") and os.fstat(fd).st_uid != os.getuid():
+                        continue  # planted by another user: never send it with our token
+                    if not _try_lock(fd):
+                        continue  # its owner is still running
+                    with os.fdopen(os.dup(fd), "r") as f:
+                        lines = f.read().splitlines()
+                    for line in lines:
+                        try:
+                            self._enqueue(_from_json(json.loads(line)), wake=False)
+                            adopted += 1
+                        except (ValueError, KeyError):
+                            continue  # torn final line from the crash
+                    os.remove(path)
+                finally:
+                    os.close(fd)
+        if adopted:
+            self._wakeup.set()
+        return adopted
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _enqueue(self, entry, wake: bool = True) -> None:
+        if self._closed:
+            raise LinearClientError("Outbox is closed")
+        with self._lock:
+            self._journal.write(json.dumps(entry.to_json()) + "\n")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            current = self._pending.get(entry.key)
+            if current is None:
+                self._pending[entry.key] = entry
+            else:
+                current.merge(entry)
+                if isinstance(current, _IssueUpdate) and current.is_empty():
+                    del self._pending[entry.key]
+            if self._thread is None and self.flush_interval > 0:
+                self._thread = threading.Thread(target=self._run, name="linear-outbox", daemon=True)
+                self._thread.start()
+        if wake and len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                return
+            if self.pending():
+                try:
+                    self.flush()
+                except Exception:
+                    pass  # still queued; retried on the next tick
+
+    def _send(self, entries: list, settled: list) -> int:
+        """
+        Send entries as one aliased mutation; returns how many succeeded.
+
+        Entries the API gave a verdict on (sent or rejected) are appended to
+        settled, so a retryable error partway through a one-by-one resend
+        only requeues the rest.
+        """
+        declarations, selections, variables = [], [], {}
+        aliases = {}
+        for index, entry in enumerate(entries):
+            alias = f"m{index}"
+            declaration, selection, entry_variables = entry.mutation(alias)
+            declarations.append(declaration)
+            selections.append(selection)
+            variables.update(entry_variables)
+            aliases[alias] = entry
+        document = (
+            f"mutation OutboxFlush({', '.join(declarations)}) {{\n    "
+            + "\n    ".join(selections)
+            + "\n}"
+        )
+        try:
+            self.client.execute(document, variables)
+            settled.extend(entries)
+            return len(entries)
+        except (LinearClientError, httpx.HTTPError) as e:
+            if _retryable(e):
+                raise  # no verdict on the writes: keep everything queued
+            errors = _api_errors(e)
+            failed_aliases = {
+                error["path"][0]: error.get("message", "")
+                for error in errors
+                if error.get("path") and error["path"][0] in aliases
+            }
+            if not failed_aliases:
+                if len(entries) == 1:
+                    messages = "; ".join(error.get("message", "") for error in errors)
+                    self.failed.append((entries[0].to_json(), messages or str(e)))
+                    settled.extend(entries)
+                    return 0
+                # A document-level error cannot be pinned on one write: send them singly
+                return sum(self._send([entry], settled) for entry in entries)
+            for alias, message in failed_aliases.items():
+                self.failed.append((aliases[alias].to_json(), message))
+            settled.extend(entries)
+            return len(entries) - len(failed_aliases)
+
+    def _requeue(self, entries: list) -> None:
+        """Put unsent entries back in front of writes queued since the flush began."""
+        with self._lock:
+            newer = self._pending
+            self._pending = {}
+            for entry in entries:
+                self._pending[entry.key] = entry
+            for key, entry in newer.items():
+                if key in self._pending:
+                    self._pending[key].merge(entry)
+                else:
+                    self._pending[key] = entry
+
+    def _compact(self) -> None:
+        """Rewrite the journal to hold exactly the pending writes."""
+        with self._lock:
+            self._journal.seek(0)
+            self._journal.truncate()
+            for entry in self._pending.values():
+                self._journal.write(json.dumps(entry.to_json()) + "\n")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
@@ -0,0 +1,197 @@
+# ABOUTME: Pool of Linear clients sharding load across several API tokens
+# Routes requests by team or workspace and spreads bulk reads over eligible tokens
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from .bulk import BulkResult, run_bulk
+from .client import LinearClient, LinearClientError, is_mutation
+
+
+@dataclass
+class PoolMember:
+    """One API token in a client pool and the scope it serves."""
+    token: str = field(repr=False)
+    workspace: Optional[str] = None
+    team_ids: list[str] = field(default_factory=list)
+    shared_reads: bool = False  # may serve reads for any team in its workspace
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PoolMember":
+        """Create a member from a dictionary ("tokenEnv" names an env var holding the token)."""
+        token = data.get("token") or os.environ.get(data.get("tokenEnv", ""), "")
+        if not token:
+            raise LinearClientError(
+                f"No token for pool member {data.get('workspace') or data.get('tokenEnv') or '?'}"
+            )
+        return cls(
+            token=token,
+            workspace=data.get("workspace"),
+            team_ids=data.get("teamIds", []),
+            shared_reads=data.get("sharedReads", False),
+        )
+
+
+class LinearClientPool:
+    """
+    Several LinearClients, one per API token.
+
+    Each member has its own rate budget and HTTP connection pool. Single
+    requests are routed to the member that owns the team (or workspace);
+    bulk reads are spread across every member allowed to read for that scope,
+    so throughput grows with the number of tokens. Mutations are never
+    spread: they always go through the owning member.
+    """
+
+    def __init__(self, members: list[PoolMember], **client_kwargs):
+        """
+        Initialize the pool.
+
+        Args:
+            members: Tokens and the teams/workspaces they serve. The first
+                member is the default route.
+            **client_kwargs: Passed to every LinearClient (config, config_path, ...).
+        """
+        if not members:
+            raise LinearClientError("LinearClientPool needs at least one token")
+        self.members = members
+        self.clients = [LinearClient(token=m.token, **client_kwargs) for m in members]
+        self._in_flight = [0] * len(members)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **client_kwargs) -> "LinearClientPool":
+        """
+        Build a pool from LINEAR_TOKENS (a JSON list of members) or LINEAR_TOKEN.
+
+        Example LINEAR_TOKENS:
+            [{"tokenEnv": "LINEAR_TOKEN_A", "workspace": "acme", "teamIds": ["..."]},
+             {"tokenEnv": "LINEAR_TOKEN_B", "workspace": "acme", "sharedReads": true}]
+        """
+        raw = os.environ.get("LINEAR_TOKENS")
+        if raw:
+            members = [PoolMember.from_dict(m) for m in json.loads(raw)]
+        elif os.environ.get("LINEAR_TOKEN"):
+            members = [PoolMember(token=os.environ["LINEAR_TOKEN"])]
+        else:
+            raise LinearClientError("Neither LINEAR_TOKENS nor LINEAR_TOKEN is set.")
+        return cls(members, **client_kwargs)
+
+    def client_for(
+        self, team_id: Optional[str] = None, workspace: Optional[str] = None
+    ) -> LinearClient:
+        """
+        Get the client that owns a team or workspace.
+
+        Args:
+            team_id: Team UUID.
+            workspace: Workspace name.
+
+        Returns:
+            The owning client, or the default client if nothing matches.
+        """
+        return self.clients[self._owner_index(team_id, workspace)]
+
+    def execute(
+        self,
+        query: str,
+        variables: Optional[dict[str, Any]] = None,
+        team_id: Optional[str] = None,
+        workspace: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Execute a query or mutation through the owning client."""
+        index = self._owner_index(team_id, workspace)
+        with self._lock:
+            self._in_flight[index] += 1
+        return self._run(index, query, variables)
+
+    def map_reads(
+        self,
+        requests: Iterable[tuple[str, Optional[dict[str, Any]]]],
+        team_id: Optional[str] = None,
+        workspace: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> list[BulkResult]:
+        """
+        Execute many read-only queries spread across eligible tokens.
+
+        Args:
+            requests: (query, variables) pairs. Must not contain mutations.
+            team_id: Team the reads belong to.
+            workspace: Workspace the reads belong to.
+            max_workers: Concurrent requests (default: 4 per eligible token).
+
+        Returns:
+            One BulkResult per request, in request order; a failed read is
+            recorded in its result and does not abort the others.
+
+        Raises:
+            ValueError: If a request is a mutation (mutations must go through
+                the owning token, see execute()).
+        """
+        requests = list(requests)
+        mutations = [i for i, (query, _) in enumerate(requests) if is_mutation(query)]
+        if mutations:
+            raise ValueError(f"map_reads() got mutations at index {mutations}; use execute()")
+        eligible = self._read_indexes(team_id, workspace)
+        workers = max_workers or 4 * len(eligible)
+
+        def run(item: tuple[str, Optional[dict[str, Any]]]) -> dict[str, Any]:
+            return self._run(self._least_loaded(eligible), *item)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(run_bulk(pool, run, requests, ordered=True, max_pending=workers))
+
+    def close(self):
+        """Close every client in the pool."""
+        for client in self.clients:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _run(self, index: int, query: str, variables: Optional[dict[str, Any]]) -> dict[str, Any]:
+        """Execute on a member whose in-flight count the caller has already raised."""
+        try:
+            return self.clients[index].execute(query, variables)
+        finally:
+            with self._lock:
+                self._in_flight[index] -= 1
+
+    def _owner_index(self, team_id: Optional[str], workspace: Optional[str]) -> int:
+        if team_id:
+            for i, member in enumerate(self.members):
+                if team_id in member.team_ids:
+                    return i
+        if workspace:
+            for i, member in enumerate(self.members):
+                if member.workspace == workspace:
+                    return i
+        return 0
+
+    def _read_indexes(self, team_id: Optional[str], workspace: Optional[str]) -> list[int]:
+        owner = self._owner_index(team_id, workspace)
+        scope = workspace or self.members[owner].workspace
+        indexes = [owner]
+        for i, member in enumerate(self.members):
+            if i != owner and member.shared_reads and member.workspace == scope:
+                indexes.append(i)
+        return indexes
+
+    def _least_loaded(self, indexes: list[int]) -> int:
+        """Pick the member with the fewest requests in flight and count one more on it."""
+        with self._lock:
+            start = self._next
+            self._next += 1
+            rotated = [indexes[(start + k) % len(indexes)] for k in range(len(indexes))]
+            index = min(rotated, key=lambda i: self._in_flight[i])
+            self._in_flight[index] += 1
+            return index
@@ -1,9 +1,11 @@
 # ABOUTME: GraphQL query operations for reading Linear data
 # Provides methods to fetch issues, projects, comments, and team config
 
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 from .client import LinearClient
+from .complexity import DEFAULT_PAGE_SIZE, page_sizer
+from .filters import DateLike, IssueFilter
 from .types import (
     Issue,
     Project,
@@ -21,8 +23,15 @@ from .types import (
 class LinearQueries:
     """GraphQL query operations for Linear API."""
 
-    def __init__(self, client: LinearClient):
-        self.client = client
+    def __init__(self, client: Optional[LinearClient] = None):
+        """
+        Initialize query operations.
+
+        Args:
+            client: Client to send requests through. Defaults to the
+                process-wide LinearClient.shared() instance.
+        """
+        self.client = client or LinearClient.shared()
 
     def get_issue(self, issue_id: str) -> Issue:
         """
@@ -107,10 +116,22 @@ class LinearQueries:
         Returns:
             List of Comment objects.
         """
+        return list(self.iter_issue_comments(issue_id))
+
+    def iter_issue_comments(self, issue_id: str) -> Iterator[Comment]:
+        """
+        Iterate over every comment on an issue, fetching pages as needed.
+
+        Args:
+            issue_id: Issue UUID or identifier.
+
+        Yields:
+            Comment objects, oldest first.
+        """
         query = """
-        query GetIssueComments($issueId: String!) {
+        query GetIssueComments($issueId: String!, $first: Int!, $after: String) {
             issue(id: $issueId) {
-                comments {
+                comments(first: $first, after: $after) {
                     nodes {
                         id
                         body
@@ -118,22 +139,19 @@ class LinearQueries:
                         updatedAt
                         user { id }
                     }
+                    pageInfo { hasNextPage endCursor }
                 }
             }
         }
         """
-        data = self.client.execute(query, {"issueId": issue_id})
-        comments_data = data["issue"]["comments"]["nodes"]
-        return [
-            Comment(
+        for c in self._paginate(query, {"issueId": issue_id}, ("issue", "comments")):
+            yield Comment(
                 id=c["id"],
                 body=c["body"],
                 created_at=c["createdAt"],
                 updated_at=c.get("updatedAt"),
                 user_id=c.get("user", {}).get("id") if c.get("user") else None,
             )
-            for c in comments_data
-        ]
 
     def get_team(self, team_id: str) -> Team:
         """
@@ -193,10 +211,22 @@ class LinearQueries:
         Returns:
             List of Issue objects.
         """
+        return list(self.iter_project_issues(project_id))
+
+    def iter_project_issues(self, project_id: str) -> Iterator[Issue]:
+        """
+        Iterate over every issue in a project, fetching pages as needed.
+
+        Args:
+            project_id: Project UUID.
+
+        Yields:
+            Issue objects.
+        """
         query = """
-        query GetProjectIssues($projectId: String!) {
+        query GetProjectIssues($projectId: String!, $first: Int!, $after: String) {
             project(id: $projectId) {
-                issues {
+                issues(first: $first, after: $after) {
                     nodes {
                         id
                         identifier
@@ -208,13 +238,13 @@ class LinearQueries:
                         milestone { id name }
                         labels { nodes { id name } }
                     }
+                    pageInfo { hasNextPage endCursor }
                 }
             }
         }
         """
-        data = self.client.execute(query, {"projectId": project_id})
-        issues_data = data["project"]["issues"]["nodes"]
-        return [self._parse_issue(i) for i in issues_data]
+        for i in self._paginate(query, {"projectId": project_id}, ("project", "issues")):
+            yield self._parse_issue(i)
 
     def find_plan_issue(self, project_id: str) -> Optional[Issue]:
         """
@@ -240,6 +270,11 @@ class LinearQueries:
         project_id: Optional[str] = None,
         label_ids: Optional[list[str]] = None,
         state_ids: Optional[list[str]] = None,
+        state_types: Optional[list[str]] = None,
+        updated_after: Optional[DateLike] = None,
+        issue_filter: Optional[IssueFilter] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
     ) -> list[Issue]:
         """
         Search for issues with filters.
@@ -248,48 +283,124 @@ class LinearQueries:
             query_text: Text search query.
             team_id: Filter by team.
             project_id: Filter by project.
-            label_ids: Filter by labels.
+            label_ids: Filter by labels (any of them).
             state_ids: Filter by states.
+            state_types: Filter by state category ("started", "completed", ...).
+            updated_after: Only issues updated after this date-time (or an
+                ISO 8601 duration such as "-P1D").
+            issue_filter: Further conditions, ANDed with the arguments above.
+            order_by: Server-side sort, "updatedAt" or "createdAt" (newest
+                first). Defaults to the API's own ordering.
+            limit: Maximum number of issues. Defaults to one page of 50,
+                normally a single request; None returns every match.
 
         Returns:
             List of matching Issue objects.
         """
-        # Build filter object
-        filter_parts = []
-        if team_id:
-            filter_parts.append(f'team: {{ id: {{ eq: "{team_id}" }} }}')
-        if project_id:
-            filter_parts.append(f'project: {{ id: {{ eq: "{project_id}" }} }}')
-        if label_ids:
-            label_filter = ", ".join([f'"{lid}"' for lid in label_ids])
-            filter_parts.append(f"labels: {{ id: {{ in: [{label_filter}] }} }}")
-        if state_ids:
-            state_filter = ", ".join([f'"{sid}"' for sid in state_ids])
-            filter_parts.append(f"state: {{ id: {{ in: [{state_filter}] }} }}")
-
-        filter_str = ", ".join(filter_parts) if filter_parts else ""
-        filter_arg = f", filter: {{ {filter_str} }}" if filter_str else ""
-
-        query = f"""
-        query SearchIssues($query: String) {{
-            issueSearch(query: $query{filter_arg}) {{
-                nodes {{
+        return list(self.iter_search_issues(
+            query_text,
+            IssueFilter.from_args(team_id, project_id, label_ids, state_ids, state_types, updated_after)
+            & (issue_filter or IssueFilter()),
+            order_by,
+            limit,
+        ))
+
+    def iter_search_issues(
+        self,
+        query_text: Optional[str] = None,
+        issue_filter: Optional[IssueFilter] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Issue]:
+        """
+        Iterate over issues matching a search, fetching pages as needed.
+
+        The document is the same for every search: the text, filter, sort and
+        cursor are all variables, so identical searches share in-flight
+        requests and cached responses.
+
+        Args:
+            query_text: Text search query.
+            issue_filter: Conditions the issues must match.
+            order_by: Server-side sort, "updatedAt" or "createdAt". Defaults
+                to the API's own ordering.
+            limit: Stop after this many issues. Defaults to every match.
+
+        Yields:
+            Matching Issue objects.
+        """
+        query = """
+        query SearchIssues($query: String, $filter: IssueFilter, $orderBy: PaginationOrderBy, $first: Int!, $after: String) {
+            issueSearch(query: $query, filter: $filter, orderBy: $orderBy, first: $first, after: $after) {
+                nodes {
                     id
                     identifier
                     title
                     description
                     priority
                     url
-                    state {{ id name type }}
-                    project {{ id name }}
-                    labels {{ nodes {{ id name }} }}
-                }}
-            }}
-        }}
+                    state { id name type }
+                    project { id name }
+                    labels { nodes { id name } }
+                }
+                pageInfo { hasNextPage endCursor }
+            }
+        }
+        """
+        variables = {
+            "query": query_text,
+            "filter": issue_filter.to_dict() if issue_filter else None,
+            "orderBy": order_by,
+        }
+        for i in self._paginate(query, variables, ("issueSearch",), limit):
+            yield self._parse_issue(i)
+
+    def _paginate(
+        self, query: str, variables: dict[str, Any], path: tuple[str, ...], limit: Optional[int] = None
+    ) -> Iterator[dict]:
+        """
+        Yield the nodes of a cursor-paginated connection, page by page.
+
+        The query takes $first and $after; path leads from the response data
+        to the connection. Each page's first: is chosen by the document's
+        shared AdaptivePageSize from its estimated complexity, the budget
+        left (from the rate limiter for the first page, then from the
+        complexity headroom the previous response reported) and the time
+        earlier pages spent on the wire. With a limit, no page asks for more
+        nodes than are still wanted and no page is fetched after the last.
         """
-        variables = {"query": query_text} if query_text else {}
-        data = self.client.execute(query, variables)
-        return [self._parse_issue(i) for i in data["issueSearch"]["nodes"]]
+        sizer = page_sizer(query, variables)
+        after = None
+        remaining = None
+        if self.client.rate_limiter is not None:
+            remaining = self.client.rate_limiter.remaining()["complexity"]
+        while True:
+            first = sizer.next(remaining)
+            if limit is not None:
+                if limit <= 0:
+                    return
+                first = min(first, limit)
+            data = self.client.execute(query, {**variables, "first": first, "after": after})
+            record = self.client.last_record()
+            if record is not None:
+                # Time on the wire, not rate-limit queueing, reflects the page size
+                if record.wire_latency is not None:
+                    sizer.observe(first, record.wire_latency)
+                if record.complexity_remaining is not None:
+                    remaining = record.complexity_remaining
+            connection = data
+            for key in path:
+                connection = connection.get(key) if connection else None
+            if not connection:
+                return
+            nodes = connection["nodes"]
+            yield from nodes
+            if limit is not None:
+                limit -= len(nodes)
+            page_info = connection["pageInfo"]
+            if not page_info["hasNextPage"]:
+                return
+            after = page_info["endCursor"]
 
     def _parse_issue(self, data: dict) -> Issue:
         """Parse issue data from API response."""
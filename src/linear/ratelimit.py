@@ -0,0 +1,328 @@
+# ABOUTME: Cross-process rate-limit coordination for Linear API clients
+# Shares request and complexity token buckets between all jobs on a host via a locked state file
+
+import getpass
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import time
+import uuid
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Linear API key limits: https://developers.linear.app/docs/graphql/working-with-the-graphql-api/rate-limiting
+DEFAULT_REQUESTS_PER_HOUR = 5000
+DEFAULT_COMPLEXITY_PER_HOUR = 3_000_000
+
+# Waiters that stop refreshing their heartbeat are assumed dead and dropped
+_WAITER_STALE_SECONDS = 30.0
+_POLL_SECONDS = 0.05
+
+
+def private_dir(path: str) -> str:
+    """
+    Create path as a directory only the current user can access (0700).
+
+    Raises:
+        PermissionError: If the directory already exists but belongs to
+            another user or is accessible to others (it could have been
+            planted to read or tamper with the state kept in it).
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise PermissionError(
+                f"{path} must be a directory owned by the current user with mode 0700"
+            )
+    return path
+
+
+def default_state_dir() -> str:
+    """
+    Directory holding shared limiter state, created private to the current user.
+
+    LINEAR_RATE_LIMIT_DIR, or a per-user directory in the system temp dir.
+    """
+    path = os.environ.get("LINEAR_RATE_LIMIT_DIR")
+    if not path:
+        user = str(os.getuid()) if hasattr(os, "getuid") else getpass.getuser()
+        path = os.path.join(tempfile.gettempdir(), f"linear-ratelimit-{user}")
+    return private_dir(path)
+
+
+def write_private_json(path: str, data: Any) -> None:
+    """Atomically replace path with JSON data, readable by the current user only."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def default_priority() -> int:
+    """Job priority from LINEAR_JOB_PRIORITY (higher is served first)."""
+    try:
+        return int(os.environ.get("LINEAR_JOB_PRIORITY", "0"))
+    except ValueError:
+        return 0
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file, held for the duration of a with-block."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(_POLL_SECONDS)
+        return self
+
+    def __exit__(self, *args):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class RateLimitCoordinator:
+    """
+    Host-wide token buckets for one Linear API token.
+
+    Every LinearClient using the same token on the same host reads and writes
+    the same state file under an exclusive lock, so the hourly request and
+    complexity budgets are shared instead of each process assuming it owns
+    them. Contended acquisitions queue as waiters and are served in order of
+    (priority desc, arrival), which keeps low-priority jobs from starving the
+    budget of high-priority ones while staying FIFO within a priority.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        state_dir: Optional[str] = None,
+        requests_per_hour: int = DEFAULT_REQUESTS_PER_HOUR,
+        complexity_per_hour: int = DEFAULT_COMPLEXITY_PER_HOUR,
+    ):
+        """
+        Initialize the coordinator.
+
+        Args:
+            token: Linear API token. Only a hash of it is written to disk.
+            state_dir: Directory for the shared state file.
+            requests_per_hour: Request budget for the token.
+            complexity_per_hour: Complexity budget for the token.
+        """
+        state_dir = private_dir(state_dir) if state_dir else default_state_dir()
+        key = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self.state_path = os.path.join(state_dir, f"{key}.json")
+        self._lock_path = self.state_path + ".lock"
+        self.capacity = {
+            "requests": float(requests_per_hour),
+            "complexity": float(complexity_per_hour),
+        }
+
+    def acquire(
+        self,
+        complexity: int = 0,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Block until one request and the given complexity can be spent.
+
+        Args:
+            complexity: Estimated complexity of the request.
+            priority: Job priority; defaults to LINEAR_JOB_PRIORITY.
+            timeout: Maximum seconds to wait.
+
+        Raises:
+            TimeoutError: If the budget did not free up within timeout.
+        """
+        priority = default_priority() if priority is None else priority
+        waiter_id = uuid.uuid4().hex
+        deadline = None if timeout is None else time.monotonic() + timeout
+        registered = False
+
+        while True:
+            # Checked after each sleep, before budget is spent: never return past the deadline
+            if registered and deadline is not None and time.monotonic() >= deadline:
+                self._withdraw(waiter_id)
+                raise TimeoutError("Timed out waiting for Linear rate-limit budget")
+            with _FileLock(self._lock_path):
+                state = self._load()
+                now = time.time()
+                self._refill(state, now)
+                waiters = state["waiters"]
+                for wid in [w for w, v in waiters.items() if now - v[2] > _WAITER_STALE_SECONDS]:
+                    del waiters[wid]
+
+                queued = waiters or registered
+                head = min(waiters.items(), key=lambda kv: (-kv[1][0], kv[1][1]))[0] if waiters else None
+                wait = self._wait_seconds(state, complexity, now)
+
+                if wait <= 0 and (not queued or head == waiter_id):
+                    state["buckets"]["requests"] -= 1
+                    state["buckets"]["complexity"] -= complexity
+                    waiters.pop(waiter_id, None)
+                    self._save(state)
+                    return
+
+                if waiter_id in waiters:
+                    waiters[waiter_id][2] = now
+                else:
+                    waiters[waiter_id] = [priority, state["next_ticket"], now]
+                    state["next_ticket"] += 1
+                    registered = True
+                self._save(state)
+
+            pause = min(max(wait, _POLL_SECONDS), 1.0)
+            if deadline is not None:
+                pause = max(0.0, min(pause, deadline - time.monotonic()))
+            time.sleep(pause)
+
+    def try_acquire(self, complexity: int = 0) -> bool:
+        """Spend budget only if it is available now and nobody is queued."""
+        with _FileLock(self._lock_path):
+            state = self._load()
+            now = time.time()
+            self._refill(state, now)
+            if state["waiters"] or self._wait_seconds(state, complexity, now) > 0:
+                return False
+            state["buckets"]["requests"] -= 1
+            state["buckets"]["complexity"] -= complexity
+            self._save(state)
+            return True
+
+    def remaining(self) -> dict[str, float]:
+        """Budget left on this host right now, per bucket ("requests", "complexity")."""
+        with _FileLock(self._lock_path):
+            state = self._load()
+            self._refill(state, time.time())
+            return dict(state["buckets"])
+
+    def record_cost(self, estimated: int, actual: int) -> None:
+        """Charge the difference between the estimated and actual complexity."""
+        if actual != estimated:
+            self._reconcile({}, actual - estimated)
+
+    def update_from_headers(self, headers) -> None:
+        """
+        Reconcile local buckets with Linear's rate-limit response headers.
+
+        The server is authoritative (other hosts may share the token), so the
+        local budget is only ever lowered to what the server reports.
+        """
+        observed = self._observed(headers)
+        if observed:
+            self._reconcile(observed, 0)
+
+    def settle(self, headers, estimated: int) -> None:
+        """
+        Apply a response in one locked update: charge the difference between
+        the estimated and the reported (X-Complexity) cost, then reconcile
+        with the rate-limit headers as update_from_headers() does.
+        """
+        charged = headers.get("X-Complexity")
+        correction = int(charged) - estimated if charged and charged.isdigit() else 0
+        observed = self._observed(headers)
+        if observed or correction:
+            self._reconcile(observed, correction)
+
+    @staticmethod
+    def _observed(headers) -> dict[str, tuple[float, float]]:
+        """Remaining budget and reset time (epoch seconds) per bucket from response headers."""
+        observed = {}
+        for bucket, prefix in (("requests", "Requests"), ("complexity", "Complexity")):
+            remaining = headers.get(f"X-RateLimit-{prefix}-Remaining")
+            if remaining is None:
+                continue
+            try:
+                observed[bucket] = (
+                    float(remaining),
+                    float(headers.get(f"X-RateLimit-{prefix}-Reset", 0)) / 1000.0,
+                )
+            except ValueError:
+                continue
+        return observed
+
+    def _reconcile(self, observed: dict[str, tuple[float, float]], correction: int) -> None:
+        with _FileLock(self._lock_path):
+            state = self._load()
+            self._refill(state, time.time())
+            state["buckets"]["complexity"] -= correction
+            for bucket, (remaining, reset_at) in observed.items():
+                if remaining < state["buckets"][bucket]:
+                    state["buckets"][bucket] = remaining
+                if remaining <= 0 and reset_at:
+                    state["blocked_until"] = max(state["blocked_until"], reset_at)
+            self._save(state)
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Stop all clients on the host after the server rejected a request."""
+        with _FileLock(self._lock_path):
+            state = self._load()
+            state["blocked_until"] = max(
+                state["blocked_until"], time.time() + (retry_after or 60.0)
+            )
+            self._save(state)
+
+    def _wait_seconds(self, state: dict, complexity: int, now: float) -> float:
+        wait = state["blocked_until"] - now
+        for bucket, needed in (("requests", 1), ("complexity", complexity)):
+            deficit = needed - state["buckets"][bucket]
+            if deficit > 0:
+                wait = max(wait, deficit / (self.capacity[bucket] / 3600.0))
+        return wait
+
+    def _refill(self, state: dict, now: float) -> None:
+        elapsed = max(0.0, now - state["updated"])
+        for bucket, capacity in self.capacity.items():
+            state["buckets"][bucket] = min(
+                capacity, state["buckets"][bucket] + elapsed * capacity / 3600.0
+            )
+        state["updated"] = now
+
+    def _withdraw(self, waiter_id: str) -> None:
+        with _FileLock(self._lock_path):
+            state = self._load()
+            if state["waiters"].pop(waiter_id, None) is not None:
+                self._save(state)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {
+                "buckets": dict(self.capacity),
+                "updated": time.time(),
+                "blocked_until": 0.0,
+                "waiters": {},
+                "next_ticket": 0,
+            }
+
+    def _save(self, state: dict) -> None:
+        write_private_json(self.state_path, state)
@@ -0,0 +1,109 @@
+# ABOUTME: In-flight deduplication of identical read operations (singleflight)
+# Concurrent callers with the same key share one execution and its result
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+R = TypeVar("R")
+
+
+def operation_key(query: str, variables: Optional[dict[str, Any]] = None) -> str:
+    """Stable key for a GraphQL document and its variables."""
+    canonical = json.dumps(variables or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{query}\0{canonical}".encode()).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block until it finishes and receive its result (a deep copy,
+    so one caller mutating the response cannot affect another) or its
+    exception. Nothing is cached: once the call completes the next caller
+    starts a new one.
+
+    Errors that depend on the leader's own limits (such as its deadline)
+    can be marked private: waiters then run the call again under their own
+    limits instead of receiving them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.shared = 0  # calls answered by another caller's request
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], R],
+        timeout: Optional[float] = None,
+        private_errors: tuple[type[BaseException], ...] = (),
+    ) -> R:
+        """
+        Run fn, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identity of the call.
+            fn: The call; every caller passes its own, only the leader's runs.
+            timeout: Seconds this caller waits for another caller's call.
+            private_errors: Exception types that are not shared: when the
+                leader fails with one, waiters retry (one becomes the leader).
+
+        Raises:
+            TimeoutError: If this caller waited on another's call for longer
+                than timeout seconds (the shared call keeps running).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.waiters += 1
+                    self.shared += 1
+            if leader:
+                break
+
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not call.done.wait(remaining):
+                raise TimeoutError("Timed out waiting for an identical in-flight request")
+            if isinstance(call.error, private_errors):
+                continue
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.value)
+
+        try:
+            value = fn()
+            return value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            if waiters and call.error is None:
+                # Snapshot before the leader's caller can touch the response
+                call.value = copy.deepcopy(value)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        with self._lock:
+            return len(self._calls)
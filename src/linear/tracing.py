@@ -0,0 +1,129 @@
+# ABOUTME: Chrome trace / Perfetto timeline export for Linear API activity
+# Records every LinearClient.execute plus caller-defined spans as trace events
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from .metrics import OperationRecord
+from .ratelimit import _FileLock
+
+
+class TraceRecorder:
+    """
+    Instrumentation hook that turns Linear operations into a timeline.
+
+    Attach it to a LinearClient like any other instrumentation hook; each
+    execute() becomes a complete ("X") event on the calling thread's track.
+    span() adds the caller's own phases (parsing, bulk creation, ...) to the
+    same timeline. write() produces JSON that chrome://tracing and
+    ui.perfetto.dev open directly, merging into an existing trace file so
+    several processes (and ``specify --trace``) share one timeline.
+    """
+
+    def __init__(self, process_name: str = "linear"):
+        self._lock = threading.Lock()
+        self._events: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "args": {"name": process_name},
+            }
+        ]
+
+    def __call__(self, record: OperationRecord) -> None:
+        args = {
+            "requestBytes": record.request_bytes,
+            "responseBytes": record.response_bytes,
+            "retries": record.retries,
+        }
+        if record.hedged:
+            args["hedged"] = True
+        if record.stale:
+            args["stale"] = True
+        for key, value in (
+            ("complexity", record.complexity),
+            ("status", record.status_code),
+            ("error", record.error),
+        ):
+            if value is not None:
+                args[key] = value
+        self._add(record.operation, f"linear.{record.kind}", record.started_at, record.latency, args)
+
+    @contextmanager
+    def span(self, name: str, category: str = "app", **args: Any) -> Iterator[None]:
+        """Record the duration of a with-block as a trace event."""
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, category, started_at, time.perf_counter() - started, args)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Trace in the Chrome trace event format."""
+        with self._lock:
+            return {"traceEvents": list(self._events), "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        """
+        Add the trace to the timeline in path (created if missing).
+
+        The file is read and replaced under a lock, so processes writing to
+        the same path each keep their events, on their own process track.
+        """
+        trace = self.to_dict()
+        with _FileLock(path + ".lock"):
+            try:
+                with open(path, "r") as f:
+                    trace["traceEvents"] = json.load(f)["traceEvents"] + trace["traceEvents"]
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # no timeline yet (or an unreadable one): start a new one
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(trace, f)
+            os.replace(tmp_path, path)
+
+    def _add(
+        self, name: str, category: str, started_at: float, duration: float, args: dict[str, Any]
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": int(started_at * 1_000_000),
+            "dur": int(duration * 1_000_000),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+
+
+_default_recorder: Optional[TraceRecorder] = None
+_default_lock = threading.Lock()
+
+
+def default_recorder() -> Optional[TraceRecorder]:
+    """
+    Process-wide recorder enabled by LINEAR_TRACE_FILE (or SPECIFY_TRACE).
+
+    When either variable is set, every LinearClient records into one trace
+    that is merged into that file at interpreter exit; with SPECIFY_TRACE the
+    Linear activity joins the specify CLI's timeline. Returns None otherwise.
+    """
+    global _default_recorder
+    path = os.environ.get("LINEAR_TRACE_FILE") or os.environ.get("SPECIFY_TRACE")
+    if not path:
+        return None
+    with _default_lock:
+        if _default_recorder is None:
+            _default_recorder = TraceRecorder()
+            atexit.register(_default_recorder.write, path)
+        return _default_recorder
@@ -0,0 +1,102 @@
+# ABOUTME: HTTP transport configuration for the Linear GraphQL client
+# Builds a pooled httpx client with optional HTTP/2, compression and per-operation timeouts
+
+import importlib.util
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+@dataclass
+class TransportConfig:
+    """Connection pooling, protocol and timeout settings for LinearClient."""
+    http2: bool = True  # used only when the h2 package is installed
+    compression: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    operation_timeouts: dict[str, float] = field(default_factory=dict)  # operation name -> read timeout
+
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        """
+        Create config from LINEAR_HTTP2, LINEAR_MAX_CONNECTIONS and LINEAR_TIMEOUT.
+
+        Invalid or non-positive values fall back to the defaults.
+        """
+        config = cls()
+        if "LINEAR_HTTP2" in os.environ:
+            config.http2 = os.environ["LINEAR_HTTP2"].lower() not in ("0", "false", "no")
+        try:
+            max_connections = int(os.environ.get("LINEAR_MAX_CONNECTIONS") or config.max_connections)
+        except ValueError:
+            max_connections = config.max_connections
+        if max_connections > 0:
+            config.max_connections = max_connections
+            config.max_keepalive_connections = min(
+                config.max_keepalive_connections, config.max_connections
+            )
+        try:
+            read_timeout = float(os.environ.get("LINEAR_TIMEOUT") or config.read_timeout)
+        except ValueError:
+            read_timeout = config.read_timeout
+        if read_timeout > 0:
+            config.read_timeout = read_timeout
+        return config
+
+    @property
+    def http2_enabled(self) -> bool:
+        """Whether HTTP/2 is requested and available."""
+        return self.http2 and _has_module("h2")
+
+    def accept_encoding(self) -> str:
+        """Content codings httpx can decode in this environment, best first."""
+        encodings = []
+        if _has_module("zstandard"):
+            encodings.append("zstd")
+        if _has_module("brotli") or _has_module("brotlicffi"):
+            encodings.append("br")
+        encodings.extend(["gzip", "deflate"])
+        return ", ".join(encodings)
+
+    def timeout(self, operation: Optional[str] = None, read: Optional[float] = None) -> httpx.Timeout:
+        """
+        Build the timeout for one request.
+
+        Args:
+            operation: GraphQL operation name, looked up in operation_timeouts.
+            read: Explicit read timeout, overriding everything else.
+        """
+        if read is None:
+            read = self.operation_timeouts.get(operation or "", self.read_timeout)
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=read,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def build_client(self, headers: dict[str, str]) -> httpx.Client:
+        """Create a pooled httpx client with these settings."""
+        headers = dict(headers)
+        headers["Accept-Encoding"] = self.accept_encoding() if self.compression else "identity"
+        return httpx.Client(
+            headers=headers,
+            http2=self.http2_enabled,
+            timeout=self.timeout(),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
@@ -146,3 +146,14 @@ class LinearConfig:
             states=data.get("states", {}),
             project_statuses=data.get("projectStatuses", {}),
         )
+
+
+@dataclass
+class IssueLease:
+    """Represents a claim on an issue recorded in a structured comment."""
+    issue_id: str
+    owner: str
+    token: str
+    expires_at: str  # ISO 8601 UTC
+    comment_id: Optional[str] = None
+    created_at: Optional[str] = None
@@ -27,34 +27,63 @@ Or install globally:
 import os
 import subprocess
 import sys
-import zipfile
-import tempfile
 import shutil
 import shlex
 import json
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, Tuple
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import typer
-import httpx
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.text import Text
-from rich.live import Live
 from rich.align import Align
 from rich.table import Table
-from rich.tree import Tree
 from typer.core import TyperGroup
-
-# For cross-platform keyboard input
-import readchar
-import ssl
-import truststore
 from datetime import datetime, timezone
 
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-client = httpx.Client(verify=ssl_context)
+from .tracing import tracer, span, traced
+
+# Heavy or network-related modules (httpx, truststore, readchar, zipfile, rich.live,
+# rich.progress, rich.tree) are imported where they are used so that commands
+# like `specify --help` and `specify check` start without paying for them.
+if TYPE_CHECKING:
+    import httpx
+
+    from .manifest import ProjectManifest
+    from .release_cache import ReleaseCache
+
+_ssl_context = None
+_http_client = None
+
+def get_ssl_context():
+    """Return the shared truststore SSL context, creating it on first use."""
+    global _ssl_context
+    if _ssl_context is None:
+        import ssl
+        import truststore
+        _ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    return _ssl_context
+
+def get_http_client() -> "httpx.Client":
+    """Return the shared HTTP client, creating it (and its TLS context) on first use."""
+    global _http_client
+    if _http_client is None:
+        import httpx
+        _http_client = httpx.Client(verify=get_ssl_context())
+    return _http_client
+
+def __getattr__(name: str):
+    # `ssl_context` and `client` used to be eager module globals; keep them importable.
+    if name == "ssl_context":
+        return get_ssl_context()
+    if name == "client":
+        return get_http_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def _github_token(cli_token: str | None = None) -> str | None:
     """Return sanitized GitHub token (cli arg takes precedence) or None."""
@@ -65,7 +94,7 @@ def _github_auth_headers(cli_token: str | None = None) -> dict:
     token = _github_token(cli_token)
     return {"Authorization": f"Bearer {token}"} if token else {}
 
-def _parse_rate_limit_headers(headers: httpx.Headers) -> dict:
+def _parse_rate_limit_headers(headers: "httpx.Headers") -> dict:
     """Extract and parse GitHub rate-limit headers."""
     info = {}
     
@@ -93,7 +122,7 @@ def _parse_rate_limit_headers(headers: httpx.Headers) -> dict:
     
     return info
 
-def _format_rate_limit_error(status_code: int, headers: httpx.Headers, url: str) -> str:
+def _format_rate_limit_error(status_code: int, headers: "httpx.Headers", url: str) -> str:
     """Format a user-friendly error message with rate-limit information."""
     rate_info = _parse_rate_limit_headers(headers)
     
@@ -122,109 +151,144 @@ def _format_rate_limit_error(status_code: int, headers: httpx.Headers, url: str)
     
     return "\n".join(lines)
 
-# Agent configuration with name, folder, install URL, and CLI tool requirement
+# Agent configuration with name, folder, install URL, CLI tool requirement and the
+# command file layout used when rendering templates locally (see render.py)
 AGENT_CONFIG = {
     "copilot": {
         "name": "GitHub Copilot",
         "folder": ".github/",
         "install_url": None,  # IDE-based, no CLI check needed
         "requires_cli": False,
+        "commands_dir": ".github/agents",
+        "command_format": "agent.md",
     },
     "claude": {
         "name": "Claude Code",
         "folder": ".claude/",
         "install_url": "https://docs.anthropic.com/en/docs/claude-code/setup",
         "requires_cli": True,
+        "commands_dir": ".claude/commands",
+        "command_format": "md",
     },
     "gemini": {
         "name": "Gemini CLI",
         "folder": ".gemini/",
         "install_url": "https://github.com/google-gemini/gemini-cli",
         "requires_cli": True,
+        "commands_dir": ".gemini/commands",
+        "command_format": "toml",
     },
     "cursor-agent": {
         "name": "Cursor",
         "folder": ".cursor/",
         "install_url": None,  # IDE-based
         "requires_cli": False,
+        "commands_dir": ".cursor/commands",
+        "command_format": "md",
     },
     "qwen": {
         "name": "Qwen Code",
         "folder": ".qwen/",
         "install_url": "https://github.com/QwenLM/qwen-code",
         "requires_cli": True,
+        "commands_dir": ".qwen/commands",
+        "command_format": "toml",
     },
     "opencode": {
         "name": "opencode",
         "folder": ".opencode/",
         "install_url": "https://opencode.ai",
         "requires_cli": True,
+        "commands_dir": ".opencode/command",
+        "command_format": "md",
     },
     "codex": {
         "name": "Codex CLI",
         "folder": ".codex/",
         "install_url": "https://github.com/openai/codex",
         "requires_cli": True,
+        "commands_dir": ".codex/prompts",
+        "command_format": "md",
     },
     "windsurf": {
         "name": "Windsurf",
         "folder": ".windsurf/",
         "install_url": None,  # IDE-based
         "requires_cli": False,
+        "commands_dir": ".windsurf/workflows",
+        "command_format": "md",
     },
     "kilocode": {
         "name": "Kilo Code",
         "folder": ".kilocode/",
         "install_url": None,  # IDE-based
         "requires_cli": False,
+        "commands_dir": ".kilocode/workflows",
+        "command_format": "md",
     },
     "auggie": {
         "name": "Auggie CLI",
         "folder": ".augment/",
         "install_url": "https://docs.augmentcode.com/cli/setup-auggie/install-auggie-cli",
         "requires_cli": True,
+        "commands_dir": ".augment/commands",
+        "command_format": "md",
     },
     "codebuddy": {
         "name": "CodeBuddy",
         "folder": ".codebuddy/",
         "install_url": "https://www.codebuddy.ai/cli",
         "requires_cli": True,
+        "commands_dir": ".codebuddy/commands",
+        "command_format": "md",
     },
     "qoder": {
         "name": "Qoder CLI",
         "folder": ".qoder/",
         "install_url": "https://qoder.com/cli",
         "requires_cli": True,
+        "commands_dir": ".qoder/commands",
+        "command_format": "md",
     },
     "roo": {
         "name": "Roo Code",
         "folder": ".roo/",
         "install_url": None,  # IDE-based
         "requires_cli": False,
+        "commands_dir": ".roo/commands",
+        "command_format": "md",
     },
     "q": {
         "name": "Amazon Q Developer CLI",
         "folder": ".amazonq/",
         "install_url": "https://aws.amazon.com/developer/learning/q-developer-cli/",
         "requires_cli": True,
+        "commands_dir": ".amazonq/prompts",
+        "command_format": "md",
     },
     "amp": {
         "name": "Amp",
         "folder": ".agents/",
         "install_url": "https://ampcode.com/manual#install",
         "requires_cli": True,
+        "commands_dir": ".agents/commands",
+        "command_format": "md",
     },
     "shai": {
         "name": "SHAI",
         "folder": ".shai/",
         "install_url": "https://github.com/ovh/shai",
         "requires_cli": True,
+        "commands_dir": ".shai/commands",
+        "command_format": "md",
     },
     "bob": {
         "name": "IBM Bob",
         "folder": ".bob/",
         "install_url": None,  # IDE-based
         "requires_cli": False,
+        "commands_dir": ".bob/commands",
+        "command_format": "md",
     },
 }
 
@@ -244,91 +308,171 @@ BANNER = """
 TAGLINE = "GitHub Spec Kit - Spec-Driven Development Toolkit"
 class StepTracker:
     """Track and render hierarchical steps without emojis, similar to Claude Code tree output.
-    Supports live auto-refresh via an attached refresh callback.
+
+    Steps are keyed (O(1) updates) and may have child steps. Updates from any
+    thread or asyncio task are appended to a queue without taking a lock; the
+    render side drains the queue, applies the changes and rebuilds the tree
+    only when something changed. Pass render as rich Live's get_renderable to
+    draw at Live's frame rate, or attach a refresh callback, which one
+    background thread calls at most max_fps times per second while updates
+    keep arriving, until close().
     """
     def __init__(self, title: str):
         self.title = title
-        self.steps = []  # list of dicts: {key, label, status, detail}
+        self._steps = {}  # key -> {key, label, status, detail, parent, children}
         self.status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
+        self._roots = []
+        self._events = deque()  # (key, label, status, detail, parent); label None for updates
+        self._lock = threading.Lock()  # held by the render side only
+        self._dirty = True
+        self._rendered = None
+        self._unlabeled = set()  # keys created by an update or a child before their add()
         self._refresh_cb = None  # callable to trigger UI refresh
-
-    def attach_refresh(self, cb):
+        self._refresh_thread = None
+
+    @property
+    def steps(self) -> list[dict]:
+        """Steps in the order they were added: dicts with key, label, status, detail, parent, children."""
+        with self._lock:
+            self._drain()
+            return list(self._steps.values())
+
+    def attach_refresh(self, cb, max_fps: float = 10):
+        """Call cb from a background thread after updates (None stops it, like close())."""
+        self.close()
         self._refresh_cb = cb
+        if cb is not None:
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, args=(cb, 1.0 / max_fps if max_fps else 0.01), daemon=True)
+            self._refresh_thread.start()
+
+    def close(self):
+        """Stop the refresh thread, after it has drawn the last update."""
+        thread, self._refresh_cb, self._refresh_thread = self._refresh_thread, None, None
+        if thread is not None:
+            thread.join()
 
-    def add(self, key: str, label: str):
-        if key not in [s["key"] for s in self.steps]:
-            self.steps.append({"key": key, "label": label, "status": "pending", "detail": ""})
-            self._maybe_refresh()
+    def add(self, key: str, label: str, parent: str | None = None):
+        self._events.append((key, label, "pending", "", parent))
 
     def start(self, key: str, detail: str = ""):
-        self._update(key, status="running", detail=detail)
+        self._events.append((key, None, "running", detail, None))
 
     def complete(self, key: str, detail: str = ""):
-        self._update(key, status="done", detail=detail)
+        self._events.append((key, None, "done", detail, None))
 
     def error(self, key: str, detail: str = ""):
-        self._update(key, status="error", detail=detail)
+        self._events.append((key, None, "error", detail, None))
 
     def skip(self, key: str, detail: str = ""):
-        self._update(key, status="skipped", detail=detail)
-
-    def _update(self, key: str, status: str, detail: str):
-        for s in self.steps:
-            if s["key"] == key:
-                s["status"] = status
+        self._events.append((key, None, "skipped", detail, None))
+
+    def _insert(self, key: str, label: str | None, status: str, detail: str, parent: str | None):
+        if parent is not None and parent not in self._steps:
+            self._insert(parent, None, "pending", "", None)
+        if label is None:
+            self._unlabeled.add(key)
+        self._steps[key] = {"key": key, "label": key if label is None else label, "status": status, "detail": detail, "parent": parent, "children": []}
+        (self._steps[parent]["children"] if parent is not None else self._roots).append(key)
+
+    def _label(self, step: dict, label: str, parent: str | None):
+        """Apply the add() of a step that an earlier update or child created."""
+        self._unlabeled.discard(step["key"])
+        step["label"] = label
+        if parent is not None and step["parent"] is None:
+            if parent not in self._steps:
+                self._insert(parent, None, "pending", "", None)
+            self._roots.remove(step["key"])
+            self._steps[parent]["children"].append(step["key"])
+            step["parent"] = parent
+
+    def _drain(self) -> bool:
+        """Apply queued updates (caller holds the lock); returns whether anything changed."""
+        changed = False
+        while self._events:
+            key, label, status, detail, parent = self._events.popleft()
+            step = self._steps.get(key)
+            if step is None:
+                self._insert(key, label, status, detail, parent)
+            elif label is not None:
+                if key not in self._unlabeled:
+                    continue  # repeated add() of a step
+                self._label(step, label, parent)
+            else:
+                step["status"] = status
                 if detail:
-                    s["detail"] = detail
-                self._maybe_refresh()
-                return
-
-        self.steps.append({"key": key, "label": key, "status": status, "detail": detail})
-        self._maybe_refresh()
-
-    def _maybe_refresh(self):
-        if self._refresh_cb:
+                    step["detail"] = detail
+            changed = True
+        self._dirty = self._dirty or changed
+        return changed
+
+    def _refresh_loop(self, cb, interval: float):
+        # Runs until close() or another callback is attached; the last change is always drawn
+        while True:
+            time.sleep(interval)
+            stopping = self._refresh_cb is not cb
+            if not self._events:
+                if stopping:
+                    return
+                continue
+            with self._lock:
+                self._drain()
             try:
-                self._refresh_cb()
+                cb()
             except Exception:
                 pass
+            if stopping:
+                return
 
-    def render(self):
-        tree = Tree(f"[cyan]{self.title}[/cyan]", guide_style="grey50")
-        for step in self.steps:
-            label = step["label"]
-            detail_text = step["detail"].strip() if step["detail"] else ""
-
-            status = step["status"]
-            if status == "done":
-                symbol = "[green]●[/green]"
-            elif status == "pending":
-                symbol = "[green dim]○[/green dim]"
-            elif status == "running":
-                symbol = "[cyan]○[/cyan]"
-            elif status == "error":
-                symbol = "[red]●[/red]"
-            elif status == "skipped":
-                symbol = "[yellow]○[/yellow]"
-            else:
-                symbol = " "
-
-            if status == "pending":
-                # Entire line light gray (pending)
-                if detail_text:
-                    line = f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [bright_black]{label}[/bright_black]"
-            else:
-                # Label white, detail (if any) light gray in parentheses
-                if detail_text:
-                    line = f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [white]{label}[/white]"
+    def _line(self, step: dict) -> str:
+        label = step["label"]
+        detail_text = step["detail"].strip() if step["detail"] else ""
+
+        status = step["status"]
+        if status == "done":
+            symbol = "[green]●[/green]"
+        elif status == "pending":
+            symbol = "[green dim]○[/green dim]"
+        elif status == "running":
+            symbol = "[cyan]○[/cyan]"
+        elif status == "error":
+            symbol = "[red]●[/red]"
+        elif status == "skipped":
+            symbol = "[yellow]○[/yellow]"
+        else:
+            symbol = " "
+
+        if status == "pending":
+            # Entire line light gray (pending)
+            if detail_text:
+                return f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
+            return f"{symbol} [bright_black]{label}[/bright_black]"
+        # Label white, detail (if any) light gray in parentheses
+        if detail_text:
+            return f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
+        return f"{symbol} [white]{label}[/white]"
 
-            tree.add(line)
-        return tree
+    def render(self):
+        with self._lock:
+            self._drain()
+            if not self._dirty and self._rendered is not None:
+                return self._rendered
+            from rich.tree import Tree
+
+            tree = Tree(f"[cyan]{self.title}[/cyan]", guide_style="grey50")
+            pending = deque((tree, key) for key in self._roots)
+            while pending:
+                node, key = pending.popleft()
+                step = self._steps[key]
+                child = node.add(self._line(step))
+                pending.extend((child, k) for k in step["children"])
+            self._rendered = tree
+            self._dirty = False
+            return tree
 
 def get_key():
     """Get a single keypress in a cross-platform way using readchar."""
+    import readchar
+
     key = readchar.readkey()
 
     if key == readchar.key.UP or key == readchar.key.CTRL_P:
@@ -392,6 +536,8 @@ def select_with_arrows(options: dict, prompt_text: str = "Select an option", def
     console.print()
 
     def run_selection_loop():
+        from rich.live import Live
+
         nonlocal selected_key, selected_index
         with Live(create_selection_panel(), console=console, transient=True, auto_refresh=False) as live:
             while True:
@@ -456,8 +602,30 @@ def show_banner():
     console.print()
 
 @app.callback()
-def callback(ctx: typer.Context):
+def callback(
+    ctx: typer.Context,
+    trace: str = typer.Option(None, "--trace", envvar="SPECIFY_TRACE", help="Write a Chrome trace/Perfetto JSON timeline of this run to the given file"),
+    profile: str = typer.Option(None, "--profile", envvar="SPECIFY_PROFILE", help="Profile the command (cProfile, tracemalloc, import times) and write a report to the given directory"),
+):
     """Show banner when no subcommand is provided."""
+    command_name = f"specify {ctx.invoked_subcommand or ''}".strip()
+    if trace:
+        tracer.enable(trace, process_name=command_name)
+        ctx.call_on_close(tracer.write)
+        ctx.with_resource(span(command_name, "command"))
+
+    if profile:
+        from .profiling import ProfileSession
+
+        session = ProfileSession(Path(profile), command_name)
+
+        def write_profile():
+            report_dir = session.stop()
+            console.print(f"[dim]Profile report written to {report_dir}[/dim]")
+
+        ctx.call_on_close(write_profile)
+        session.start()
+
     if ctx.invoked_subcommand is None and "--help" not in sys.argv and "-h" not in sys.argv:
         show_banner()
         console.print(Align.center("[dim]Run 'specify --help' for usage information[/dim]"))
@@ -481,6 +649,21 @@ def run_command(cmd: list[str], check_return: bool = True, capture: bool = False
             raise
         return None
 
+def discover(tools: list[str], *, versions: bool = False, timeout: float = 3.0, refresh: bool = False) -> dict:
+    """Locate tools concurrently through the cached discovery engine (see discovery.py)."""
+    from .discovery import discover_tools
+    from .release_cache import default_cache_dir
+
+    # claude is looked up at CLAUDE_LOCAL_PATH first (see check_tool)
+    return discover_tools(
+        tools,
+        versions=versions,
+        timeout=timeout,
+        overrides={"claude": CLAUDE_LOCAL_PATH},
+        cache_dir=default_cache_dir(),
+        refresh=refresh,
+    )
+
 def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     """Check if a tool is installed. Optionally update tracker.
     
@@ -496,13 +679,8 @@ def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     # The migrate-installer command REMOVES the original executable from PATH
     # and creates an alias at ~/.claude/local/claude instead
     # This path should be prioritized over other claude executables in PATH
-    if tool == "claude":
-        if CLAUDE_LOCAL_PATH.exists() and CLAUDE_LOCAL_PATH.is_file():
-            if tracker:
-                tracker.complete(tool, "available")
-            return True
-    
-    found = shutil.which(tool) is not None
+    # (discover() passes it as the override for "claude")
+    found = discover([tool])[tool].found
     
     if tracker:
         if found:
@@ -532,6 +710,7 @@ def is_git_repo(path: Path = None) -> bool:
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
+@traced()
 def init_git_repo(project_path: Path, quiet: bool = False) -> Tuple[bool, Optional[str]]:
     """Initialize a git repository in the specified path.
     
@@ -547,9 +726,12 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> Tuple[bool, Option
         os.chdir(project_path)
         if not quiet:
             console.print("[cyan]Initializing git repository...[/cyan]")
-        subprocess.run(["git", "init"], check=True, capture_output=True, text=True)
-        subprocess.run(["git", "add", "."], check=True, capture_output=True, text=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True, text=True)
+        with span("git init", "git"):
+            subprocess.run(["git", "init"], check=True, capture_output=True, text=True)
+        with span("git add", "git"):
+            subprocess.run(["git", "add", "."], check=True, capture_output=True, text=True)
+        with span("git commit", "git"):
+            subprocess.run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True, text=True)
         if not quiet:
             console.print("[green]✓[/green] Git repository initialized")
         return True, None
@@ -567,29 +749,32 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> Tuple[bool, Option
     finally:
         os.chdir(original_cwd)
 
-def handle_vscode_settings(sub_item, dest_file, rel_path, verbose=False, tracker=None) -> None:
-    """Handle merging or copying of .vscode/settings.json files."""
+def handle_vscode_settings(new_data: bytes, dest_file: Path, rel_path: str, verbose=False, tracker=None) -> None:
+    """Merge template .vscode/settings.json content into an existing settings file."""
     def log(message, color="green"):
         if verbose and not tracker:
             console.print(f"[{color}]{message}[/] {rel_path}")
 
     try:
-        with open(sub_item, 'r', encoding='utf-8') as f:
-            new_settings = json.load(f)
-
-        if dest_file.exists():
-            merged = merge_json_files(dest_file, new_settings, verbose=verbose and not tracker)
-            with open(dest_file, 'w', encoding='utf-8') as f:
-                json.dump(merged, f, indent=4)
-                f.write('\n')
-            log("Merged:", "green")
-        else:
-            shutil.copy2(sub_item, dest_file)
-            log("Copied (no existing settings.json):", "blue")
-
+        new_settings = json.loads(new_data.decode('utf-8'))
+        merged = merge_json_files(dest_file, new_settings, verbose=verbose and not tracker)
+        with open(dest_file, 'r', encoding='utf-8') as f:
+            if json.load(f) == merged:
+                log("Unchanged:", "cyan")
+                return
+        with open(dest_file, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=4)
+            f.write('\n')
+        log("Merged:", "green")
     except Exception as e:
         log(f"Warning: Could not merge, copying instead: {e}", "yellow")
-        shutil.copy2(sub_item, dest_file)
+        dest_file.write_bytes(new_data)
+
+def template_merge_rules(verbose: bool = False, tracker: StepTracker | None = None) -> dict:
+    """Merge rules for template files that must not simply overwrite the user's copy."""
+    return {
+        ".vscode/settings.json": lambda data, dest_file, rel_path: handle_vscode_settings(data, dest_file, rel_path, verbose, tracker),
+    }
 
 def merge_json_files(existing_path: Path, new_content: dict, verbose: bool = False) -> dict:
     """Merge new JSON content into existing JSON file.
@@ -634,39 +819,158 @@ def merge_json_files(existing_path: Path, new_content: dict, verbose: bool = Fal
 
     return merged
 
-def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None) -> Tuple[Path, dict]:
+@contextmanager
+def _download_progress(show: bool):
+    """Yield an on_progress(done, total) callback rendering a rich progress bar, or None."""
+    if not show:
+        yield None
+        return
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    # Updates are already throttled by the downloader; rich only redraws on its own timer
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        console=console,
+        refresh_per_second=10,
+    ) as progress:
+        task = progress.add_task("Downloading...", total=None)
+        yield lambda done, total: progress.update(task, completed=done, total=total or None)
+
+def fetch_latest_release(client: "httpx.Client", *, github_token: str = None, debug: bool = False, offline: bool = False, cache: "ReleaseCache | None" = None, timeout: float = 30) -> Tuple[dict, str]:
+    """Return the latest template release JSON and where it came from.
+
+    With a cache, metadata younger than the release TTL is returned without a
+    request, older metadata is revalidated with If-None-Match (a 304 does not
+    count against GitHub's rate limit), and a network failure or any error
+    response (rate limit, 5xx) falls back to the cached copy. Source is one of "cache", "revalidated", "network" or "stale".
+
+    Raises:
+        RuntimeError: if no release information can be obtained.
+    """
+    import httpx
+    from .release_cache import release_ttl
+
     repo_owner = "github"
     repo_name = "spec-kit"
-    if client is None:
-        client = httpx.Client(verify=ssl_context)
+    repo = f"{repo_owner}/{repo_name}"
+    api_url = f"https://api.github.com/repos/{repo}/releases/latest"
+
+    cached = cache.load_release(repo) if cache else None
+    if cached and (offline or cached.is_fresh(release_ttl())):
+        return cached.data, "cache"
+    if offline:
+        raise RuntimeError("No cached release information is available for --offline. Run once with network access first.")
+
+    headers = _github_auth_headers(github_token)
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+
+    try:
+        with span("GET releases/latest", "network"):
+            response = client.get(
+                api_url,
+                timeout=timeout,
+                follow_redirects=True,
+                headers=headers,
+            )
+    except httpx.HTTPError:
+        if cached:
+            return cached.data, "stale"
+        raise
+
+    status = response.status_code
+    if status == 304 and cached:
+        cache.touch_release(repo, cached)
+        return cached.data, "revalidated"
+    if status != 200:
+        if cached:
+            # Rate limited or GitHub is failing: the last known release beats no release
+            return cached.data, "stale"
+        # Format detailed error message with rate-limit info
+        error_msg = _format_rate_limit_error(status, response.headers, api_url)
+        if debug:
+            error_msg += f"\n\n[dim]Response body (truncated 500):[/dim]\n{response.text[:500]}"
+        raise RuntimeError(error_msg)
+    try:
+        with span("parse release JSON", "parse"):
+            release_data = response.json()
+    except ValueError as je:
+        raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+
+    if cache:
+        cache.store_release(repo, release_data, response.headers.get("ETag"))
+    return release_data, "network"
+
+@traced()
+def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: "httpx.Client" = None, debug: bool = False, github_token: str = None, offline: bool = False, cache: "ReleaseCache | None" = None) -> Tuple[Path, dict]:
+    """Locate the template asset in the latest release and download it.
+
+    When a cache is given, release metadata and the archive are served from it
+    when possible and new archives are stored in it (metadata["cached"] is then
+    True and the returned path belongs to the cache, not download_dir).
+    """
+    return download_templates_from_github(
+        [ai_assistant],
+        download_dir,
+        script_type=script_type,
+        verbose=verbose,
+        show_progress=show_progress,
+        client=client,
+        debug=debug,
+        github_token=github_token,
+        offline=offline,
+        cache=cache,
+    )[0]
+
+@traced()
+def download_templates_from_github(ai_assistants: list[str], download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: "httpx.Client" = None, debug: bool = False, github_token: str = None, offline: bool = False, cache: "ReleaseCache | None" = None) -> list[Tuple[Path, dict]]:
+    """Download the template assets of several agents from one release.
+
+    Release metadata is fetched once; archives that are not cached are
+    downloaded concurrently over the same client. Returns (path, metadata)
+    per agent, in the order given.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if client is None and not offline:
+        client = get_http_client()
 
     if verbose:
         console.print("[cyan]Fetching latest release information...[/cyan]")
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
 
     try:
-        response = client.get(
-            api_url,
-            timeout=30,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        )
-        status = response.status_code
-        if status != 200:
-            # Format detailed error message with rate-limit info
-            error_msg = _format_rate_limit_error(status, response.headers, api_url)
-            if debug:
-                error_msg += f"\n\n[dim]Response body (truncated 500):[/dim]\n{response.text[:500]}"
-            raise RuntimeError(error_msg)
-        try:
-            release_data = response.json()
-        except ValueError as je:
-            raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+        release_data, release_source = fetch_latest_release(client, github_token=github_token, debug=debug, offline=offline, cache=cache)
     except Exception as e:
         console.print(f"[red]Error fetching release information[/red]")
         console.print(Panel(str(e), title="Fetch Error", border_style="red"))
         raise typer.Exit(1)
 
+    assets = [_release_asset(release_data, ai_assistant, script_type) for ai_assistant in ai_assistants]
+
+    def fetch(asset: dict) -> Tuple[Path, dict]:
+        return _fetch_release_asset(
+            asset,
+            release_data["tag_name"],
+            release_source,
+            download_dir,
+            verbose=verbose,
+            show_progress=show_progress and len(assets) == 1,
+            client=client,
+            debug=debug,
+            github_token=github_token,
+            offline=offline,
+            cache=cache,
+        )
+
+    if len(assets) == 1:
+        return [fetch(assets[0])]
+    with ThreadPoolExecutor(max_workers=min(4, len(assets))) as pool:
+        return list(pool.map(fetch, assets))
+
+def _release_asset(release_data: dict, ai_assistant: str, script_type: str) -> dict:
+    """The template asset for an agent and script type; exits with the asset list if missing."""
     assets = release_data.get("assets", [])
     pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
     matching_assets = [
@@ -681,6 +985,11 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
         asset_names = [a.get('name', '?') for a in assets]
         console.print(Panel("\n".join(asset_names) or "(no assets)", title="Available Assets", border_style="yellow"))
         raise typer.Exit(1)
+    return asset
+
+def _fetch_release_asset(asset: dict, tag: str, release_source: str, download_dir: Path, *, verbose: bool, show_progress: bool, client: "httpx.Client", debug: bool, github_token: str | None, offline: bool, cache: "ReleaseCache | None") -> Tuple[Path, dict]:
+    """Return a release asset from the cache or download it (resumable, digest-verified)."""
+    from .download import DownloadError, download_file, parse_digest, partial_path
 
     download_url = asset["browser_download_url"]
     filename = asset["name"]
@@ -689,88 +998,138 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
     if verbose:
         console.print(f"[cyan]Found template:[/cyan] {filename}")
         console.print(f"[cyan]Size:[/cyan] {file_size:,} bytes")
-        console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
+        console.print(f"[cyan]Release:[/cyan] {tag}")
 
-    zip_path = download_dir / filename
-    if verbose:
-        console.print(f"[cyan]Downloading template...[/cyan]")
-
-    try:
-        with client.stream(
-            "GET",
-            download_url,
-            timeout=60,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        ) as response:
-            if response.status_code != 200:
-                # Handle rate-limiting on download as well
-                error_msg = _format_rate_limit_error(response.status_code, response.headers, download_url)
-                if debug:
-                    error_msg += f"\n\n[dim]Response body (truncated 400):[/dim]\n{response.text[:400]}"
-                raise RuntimeError(error_msg)
-            total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
-                if total_size == 0:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                else:
-                    if show_progress:
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                            console=console,
-                        ) as progress:
-                            task = progress.add_task("Downloading...", total=total_size)
-                            downloaded = 0
-                            for chunk in response.iter_bytes(chunk_size=8192):
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                progress.update(task, completed=downloaded)
-                    else:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
-    except Exception as e:
-        console.print(f"[red]Error downloading template[/red]")
-        detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
-        console.print(Panel(detail, title="Download Error", border_style="red"))
-        raise typer.Exit(1)
-    if verbose:
-        console.print(f"Downloaded: {filename}")
     metadata = {
         "filename": filename,
         "size": file_size,
-        "release": release_data["tag_name"],
-        "asset_url": download_url
+        "release": tag,
+        "asset_url": download_url,
+        "release_source": release_source,
+        "cached": cache is not None,
+        "from_cache": False,
     }
-    return zip_path, metadata
 
-def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None) -> Path:
+    # Concurrent runs wait for one download of an asset instead of writing the same partial file
+    with cache.download_lock(filename) if cache else nullcontext():
+        cached_zip = cache.asset_path(tag, filename) if cache else None
+        if cached_zip:
+            if verbose:
+                console.print(f"[cyan]Using cached template:[/cyan] {cached_zip}")
+            metadata["from_cache"] = True
+            return cached_zip, metadata
+        if offline:
+            console.print(f"[red]Template {filename} is not cached[/red] - run once without --offline to populate the cache")
+            raise typer.Exit(1)
+
+        zip_path = cache.new_download_path(filename) if cache else download_dir / filename
+        if verbose:
+            console.print(f"[cyan]Downloading template...[/cyan]")
+
+        try:
+            with span("download asset", "network", asset=filename, size=file_size), _download_progress(show_progress) as on_progress:
+                sha256 = download_file(
+                    client,
+                    download_url,
+                    zip_path,
+                    expected_size=file_size,
+                    expected_sha256=parse_digest(asset.get("digest")),
+                    headers=_github_auth_headers(github_token),
+                    on_progress=on_progress,
+                )
+        except DownloadError as e:
+            if not cache:
+                # Without a cache nothing would resume the partial file: don't leave it behind
+                partial_path(zip_path).unlink(missing_ok=True)
+            console.print(f"[red]Error downloading template[/red]")
+            if e.status_code is not None:
+                # Handle rate-limiting on download as well
+                detail = _format_rate_limit_error(e.status_code, e.headers, download_url)
+                if debug:
+                    detail += f"\n\n[dim]Response body (truncated 400):[/dim]\n{e.body}"
+            else:
+                detail = str(e)
+            console.print(Panel(detail, title="Download Error", border_style="red"))
+            raise typer.Exit(1)
+        metadata["sha256"] = sha256
+        if cache:
+            zip_path = cache.store_asset(tag, filename, zip_path, sha256)
+        if verbose:
+            console.print(f"Downloaded: {filename}")
+        return zip_path, metadata
+
+@traced()
+def render_template_locally(ai_assistants: list[str], script_type: str, template_dir: Path, download_dir: Path, *, cache: "ReleaseCache | None") -> list[Tuple[Path, dict]]:
+    """Build template packages from a local Spec Kit checkout instead of a release.
+
+    Packages are rendered into the cache (and reused while the checkout is
+    unchanged), or into download_dir when cache is None.
+    Returns (archive path, metadata) per agent, shaped like download_template_from_github's.
+    """
+    from .render import render_packages
+
+    out_dir = cache.rendered_dir if cache else download_dir
+    existed = {p.name for p in out_dir.glob("*.zip")} if cache and out_dir.is_dir() else set()
+    key, paths = render_packages(template_dir, {ai: AGENT_CONFIG[ai] for ai in ai_assistants}, script_type, out_dir)
+    return [
+        (paths[ai], {
+            "filename": paths[ai].name,
+            "size": paths[ai].stat().st_size,
+            "release": f"local-{key[:12]}",
+            "asset_url": str(template_dir),
+            "release_source": "local",
+            "cached": cache is not None,
+            "from_cache": paths[ai].name in existed,
+        })
+        for ai in ai_assistants
+    ]
+
+@traced()
+def download_and_extract_template(project_path: Path, ai_assistant: str | list[str], script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: "httpx.Client" = None, debug: bool = False, github_token: str = None, offline: bool = False, use_cache: bool = True, template_dir: Path | None = None) -> Path:
     """Download the latest release and extract it to create a new project.
     Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+    Release metadata and archives go through the local ReleaseCache unless use_cache is False.
+    With template_dir, the package is rendered from that Spec Kit checkout instead (no network).
+    ai_assistant may list several agents: their packages come from one release
+    and are merged into the project in a single extraction pass.
     """
+    from .extract import extract_template
+    from .manifest import ProjectManifest
+    from .release_cache import ReleaseCache
+
     current_dir = Path.cwd()
 
+    agents = [ai_assistant] if isinstance(ai_assistant, str) else list(ai_assistant)
+
+    cache = ReleaseCache() if (use_cache or offline) else None
     if tracker:
-        tracker.start("fetch", "contacting GitHub API")
+        tracker.start("fetch", "rendering local templates" if template_dir else "contacting GitHub API")
     try:
-        zip_path, meta = download_template_from_github(
-            ai_assistant,
-            current_dir,
-            script_type=script_type,
-            verbose=verbose and tracker is None,
-            show_progress=(tracker is None),
-            client=client,
-            debug=debug,
-            github_token=github_token
-        )
+        if template_dir:
+            packages = render_template_locally(agents, script_type, template_dir, current_dir, cache=cache)
+        else:
+            packages = download_templates_from_github(
+                agents,
+                current_dir,
+                script_type=script_type,
+                verbose=verbose and tracker is None,
+                show_progress=(tracker is None),
+                client=client,
+                debug=debug,
+                github_token=github_token,
+                offline=offline,
+                cache=cache,
+            )
+        zip_paths = [zip_path for zip_path, _ in packages]
+        meta = packages[0][1]
         if tracker:
-            tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes)")
+            total_size = sum(m["size"] for _, m in packages)
+            source = "" if meta["release_source"] == "network" else f", {meta['release_source']}"
+            tracker.complete("fetch", f"release {meta['release']} ({total_size:,} bytes{source})")
             tracker.add("download", "Download template")
-            tracker.complete("download", meta['filename'])
+            tracker.complete("download", ", ".join(
+                f"{m['filename']} (cached)" if m["from_cache"] else m["filename"] for _, m in packages
+            ))
     except Exception as e:
         if tracker:
             tracker.error("fetch", str(e))
@@ -789,85 +1148,40 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
         if not is_current_dir:
             project_path.mkdir(parents=True)
 
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_contents = zip_ref.namelist()
-            if tracker:
-                tracker.start("zip-list")
-                tracker.complete("zip-list", f"{len(zip_contents)} entries")
-            elif verbose:
-                console.print(f"[cyan]ZIP contains {len(zip_contents)} items[/cyan]")
+        merge_rules = template_merge_rules(verbose, tracker) if is_current_dir else {}
+        with span("extract zip", "extract", archives=len(zip_paths)):
+            result = extract_template(zip_paths, project_path, merge_rules=merge_rules)
+        ProjectManifest(meta["release"], ",".join(agents), script_type, result.hashes).save(project_path)
 
+        if tracker:
+            tracker.start("zip-list")
+            tracker.complete("zip-list", f"{result.entries} entries")
+            tracker.start("extracted-summary")
             if is_current_dir:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    temp_path = Path(temp_dir)
-                    zip_ref.extractall(temp_path)
-
-                    extracted_items = list(temp_path.iterdir())
-                    if tracker:
-                        tracker.start("extracted-summary")
-                        tracker.complete("extracted-summary", f"temp {len(extracted_items)} items")
-                    elif verbose:
-                        console.print(f"[cyan]Extracted {len(extracted_items)} items to temp location[/cyan]")
-
-                    source_dir = temp_path
-                    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                        source_dir = extracted_items[0]
-                        if tracker:
-                            tracker.add("flatten", "Flatten nested directory")
-                            tracker.complete("flatten")
-                        elif verbose:
-                            console.print(f"[cyan]Found nested directory structure[/cyan]")
-
-                    for item in source_dir.iterdir():
-                        dest_path = project_path / item.name
-                        if item.is_dir():
-                            if dest_path.exists():
-                                if verbose and not tracker:
-                                    console.print(f"[yellow]Merging directory:[/yellow] {item.name}")
-                                for sub_item in item.rglob('*'):
-                                    if sub_item.is_file():
-                                        rel_path = sub_item.relative_to(item)
-                                        dest_file = dest_path / rel_path
-                                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                                        # Special handling for .vscode/settings.json - merge instead of overwrite
-                                        if dest_file.name == "settings.json" and dest_file.parent.name == ".vscode":
-                                            handle_vscode_settings(sub_item, dest_file, rel_path, verbose, tracker)
-                                        else:
-                                            shutil.copy2(sub_item, dest_file)
-                            else:
-                                shutil.copytree(item, dest_path)
-                        else:
-                            if dest_path.exists() and verbose and not tracker:
-                                console.print(f"[yellow]Overwriting file:[/yellow] {item.name}")
-                            shutil.copy2(item, dest_path)
-                    if verbose and not tracker:
-                        console.print(f"[cyan]Template files merged into current directory[/cyan]")
+                summary = f"{len(result.changed)} changed, {len(result.added)} added, {result.unchanged} unchanged"
+                if result.merged:
+                    summary += f", {len(result.merged)} merged"
             else:
-                zip_ref.extractall(project_path)
-
-                extracted_items = list(project_path.iterdir())
-                if tracker:
-                    tracker.start("extracted-summary")
-                    tracker.complete("extracted-summary", f"{len(extracted_items)} top-level items")
-                elif verbose:
-                    console.print(f"[cyan]Extracted {len(extracted_items)} items to {project_path}:[/cyan]")
-                    for item in extracted_items:
-                        console.print(f"  - {item.name} ({'dir' if item.is_dir() else 'file'})")
-
-                if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                    nested_dir = extracted_items[0]
-                    temp_move_dir = project_path.parent / f"{project_path.name}_temp"
-
-                    shutil.move(str(nested_dir), str(temp_move_dir))
-
-                    project_path.rmdir()
-
-                    shutil.move(str(temp_move_dir), str(project_path))
-                    if tracker:
-                        tracker.add("flatten", "Flatten nested directory")
-                        tracker.complete("flatten")
-                    elif verbose:
-                        console.print(f"[cyan]Flattened nested directory structure[/cyan]")
+                summary = f"{result.files} files, {len(result.top_level)} top-level items"
+            tracker.complete("extracted-summary", summary)
+            if result.stripped_prefix:
+                tracker.add("flatten", "Flatten nested directory")
+                tracker.complete("flatten", result.stripped_prefix)
+            tracker.start("chmod")
+            tracker.complete("chmod", f"{result.executables} executable")
+        elif verbose:
+            console.print(f"[cyan]ZIP contains {result.entries} items[/cyan]")
+            if result.stripped_prefix:
+                console.print(f"[cyan]Flattened nested directory structure[/cyan]")
+            for rel_path in result.changed:
+                console.print(f"[yellow]Updated file:[/yellow] {rel_path}")
+            if is_current_dir:
+                console.print(f"[cyan]{len(result.changed)} changed, {len(result.added)} added, {result.unchanged} unchanged[/cyan]")
+            console.print(f"[cyan]Extracted {result.files} files to {project_path}:[/cyan]")
+            for name in result.top_level:
+                console.print(f"  - {name} ({'dir' if (project_path / name).is_dir() else 'file'})")
+            if result.executables:
+                console.print(f"[cyan]Set execute permissions on {result.executables} file(s)[/cyan]")
 
     except Exception as e:
         if tracker:
@@ -888,70 +1202,35 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
         if tracker:
             tracker.add("cleanup", "Remove temporary archive")
 
-        if zip_path.exists():
-            zip_path.unlink()
+        if meta["cached"]:
+            # The archives belong to the release cache and are reused by later runs
+            if tracker:
+                tracker.skip("cleanup", "archive kept in cache")
+        else:
+            for zip_path in zip_paths:
+                if zip_path.exists():
+                    zip_path.unlink()
+                    if verbose and not tracker:
+                        console.print(f"Cleaned up: {zip_path.name}")
             if tracker:
                 tracker.complete("cleanup")
-            elif verbose:
-                console.print(f"Cleaned up: {zip_path.name}")
 
     return project_path
 
 
-def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None = None) -> None:
-    """Ensure POSIX .sh scripts under .specify/scripts (recursively) have execute bits (no-op on Windows)."""
-    if os.name == "nt":
-        return  # Windows: skip silently
-    scripts_root = project_path / ".specify" / "scripts"
-    if not scripts_root.is_dir():
-        return
-    failures: list[str] = []
-    updated = 0
-    for script in scripts_root.rglob("*.sh"):
-        try:
-            if script.is_symlink() or not script.is_file():
-                continue
-            try:
-                with script.open("rb") as f:
-                    if f.read(2) != b"#!":
-                        continue
-            except Exception:
-                continue
-            st = script.stat(); mode = st.st_mode
-            if mode & 0o111:
-                continue
-            new_mode = mode
-            if mode & 0o400: new_mode |= 0o100
-            if mode & 0o040: new_mode |= 0o010
-            if mode & 0o004: new_mode |= 0o001
-            if not (new_mode & 0o100):
-                new_mode |= 0o100
-            os.chmod(script, new_mode)
-            updated += 1
-        except Exception as e:
-            failures.append(f"{script.relative_to(scripts_root)}: {e}")
-    if tracker:
-        detail = f"{updated} updated" + (f", {len(failures)} failed" if failures else "")
-        tracker.add("chmod", "Set script permissions recursively")
-        (tracker.error if failures else tracker.complete)("chmod", detail)
-    else:
-        if updated:
-            console.print(f"[cyan]Updated execute permissions on {updated} script(s) recursively[/cyan]")
-        if failures:
-            console.print("[yellow]Some scripts could not be updated:[/yellow]")
-            for f in failures:
-                console.print(f"  - {f}")
-
 @app.command()
 def init(
     project_name: str = typer.Argument(None, help="Name for your new project directory (optional if using --here, or use '.' for current directory)"),
-    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, cursor-agent, qwen, opencode, codex, windsurf, kilocode, auggie, codebuddy, amp, shai, q, bob, or qoder "),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant(s) to use, comma-separated for several: claude, gemini, copilot, cursor-agent, qwen, opencode, codex, windsurf, kilocode, auggie, codebuddy, amp, shai, q, bob, or qoder "),
     script_type: str = typer.Option(None, "--script", help="Script type to use: sh or ps"),
     ignore_agent_tools: bool = typer.Option(False, "--ignore-agent-tools", help="Skip checks for AI agent tools like Claude Code"),
     no_git: bool = typer.Option(False, "--no-git", help="Skip git repository initialization"),
     here: bool = typer.Option(False, "--here", help="Initialize project in the current directory instead of creating a new one"),
     force: bool = typer.Option(False, "--force", help="Force merge/overwrite when using --here (skip confirmation)"),
     skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    template_dir: Path = typer.Option(None, "--template-dir", envvar="SPECIFY_TEMPLATE_DIR", file_okay=False, exists=True, help="Render templates from this Spec Kit checkout instead of downloading a release (no network)"),
+    offline: bool = typer.Option(False, "--offline", help="Use only the local template cache; never contact GitHub"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the local template cache (SPECIFY_CACHE_DIR)"),
     debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
     github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
 ):
@@ -970,6 +1249,7 @@ def init(
         specify init my-project
         specify init my-project --ai claude
         specify init my-project --ai copilot --no-git
+        specify init my-project --ai claude,copilot  # Several agents in one project
         specify init --ignore-agent-tools my-project
         specify init . --ai claude         # Initialize in current directory
         specify init .                     # Initialize in current directory (interactive AI selection)
@@ -978,6 +1258,8 @@ def init(
         specify init --here --ai codebuddy
         specify init --here
         specify init --here --force  # Skip confirmation when current directory not empty
+        specify init my-project --ai claude --offline  # Reuse the cached template, no network
+        specify init my-project --ai claude --template-dir ../spec-kit-linear  # Render from a checkout
     """
 
     show_banner()
@@ -994,6 +1276,10 @@ def init(
         console.print("[red]Error:[/red] Must specify either a project name, use '.' for current directory, or use --here flag")
         raise typer.Exit(1)
 
+    if offline and no_cache:
+        console.print("[red]Error:[/red] --offline needs the template cache and cannot be combined with --no-cache")
+        raise typer.Exit(1)
+
     if here:
         project_name = Path.cwd().name
         project_path = Path.cwd()
@@ -1037,43 +1323,48 @@ def init(
 
     console.print(Panel("\n".join(setup_lines), border_style="cyan", padding=(1, 2)))
 
-    should_init_git = False
-    if not no_git:
-        should_init_git = check_tool("git")
-        if not should_init_git:
-            console.print("[yellow]Git not found - will skip repository initialization[/yellow]")
-
     if ai_assistant:
-        if ai_assistant not in AGENT_CONFIG:
-            console.print(f"[red]Error:[/red] Invalid AI assistant '{ai_assistant}'. Choose from: {', '.join(AGENT_CONFIG.keys())}")
+        selected_ais = list(dict.fromkeys(a.strip() for a in ai_assistant.split(",") if a.strip()))
+        invalid = [a for a in selected_ais if a not in AGENT_CONFIG]
+        if invalid or not selected_ais:
+            console.print(f"[red]Error:[/red] Invalid AI assistant '{', '.join(invalid) or ai_assistant}'. Choose from: {', '.join(AGENT_CONFIG.keys())}")
             raise typer.Exit(1)
-        selected_ai = ai_assistant
     else:
         # Create options dict for selection (agent_key: display_name)
         ai_choices = {key: config["name"] for key, config in AGENT_CONFIG.items()}
-        selected_ai = select_with_arrows(
+        selected_ais = [select_with_arrows(
             ai_choices, 
             "Choose your AI assistant:", 
             "copilot"
-        )
+        )]
+    selected_ai = ",".join(selected_ais)
 
-    if not ignore_agent_tools:
-        agent_config = AGENT_CONFIG.get(selected_ai)
-        if agent_config and agent_config["requires_cli"]:
-            install_url = agent_config["install_url"]
-            if not check_tool(selected_ai):
-                error_panel = Panel(
-                    f"[cyan]{selected_ai}[/cyan] not found\n"
-                    f"Install from: [cyan]{install_url}[/cyan]\n"
-                    f"{agent_config['name']} is required to continue with this project type.\n\n"
-                    "Tip: Use [cyan]--ignore-agent-tools[/cyan] to skip this check",
-                    title="[red]Agent Detection Error[/red]",
-                    border_style="red",
-                    padding=(1, 2)
-                )
-                console.print()
-                console.print(error_panel)
-                raise typer.Exit(1)
+    # One concurrent (and cached) probe for git and the selected CLI-based agents
+    agent_tools = [] if ignore_agent_tools else [a for a in selected_ais if AGENT_CONFIG[a]["requires_cli"]]
+    preflight = discover(([] if no_git else ["git"]) + agent_tools)
+
+    should_init_git = False
+    if not no_git:
+        should_init_git = preflight["git"].found
+        if not should_init_git:
+            console.print("[yellow]Git not found - will skip repository initialization[/yellow]")
+
+    for agent_key in agent_tools:
+        agent_config = AGENT_CONFIG[agent_key]
+        install_url = agent_config["install_url"]
+        if not preflight[agent_key].found:
+            error_panel = Panel(
+                f"[cyan]{agent_key}[/cyan] not found\n"
+                f"Install from: [cyan]{install_url}[/cyan]\n"
+                f"{agent_config['name']} is required to continue with this project type.\n\n"
+                "Tip: Use [cyan]--ignore-agent-tools[/cyan] to skip this check",
+                title="[red]Agent Detection Error[/red]",
+                border_style="red",
+                padding=(1, 2)
+            )
+            console.print()
+            console.print(error_panel)
+            raise typer.Exit(1)
 
     if script_type:
         if script_type not in SCRIPT_TYPE_CHOICES:
@@ -1117,16 +1408,17 @@ def init(
     # Track git error message outside Live context so it persists
     git_error_message = None
 
-    with Live(tracker.render(), console=console, refresh_per_second=8, transient=True) as live:
-        tracker.attach_refresh(lambda: live.update(tracker.render()))
+    import httpx
+    from rich.live import Live
+
+    # Live redraws at a fixed frame rate; render() only rebuilds the tree when a step changed
+    with Live(console=console, refresh_per_second=8, transient=True, get_renderable=tracker.render):
         try:
             verify = not skip_tls
-            local_ssl_context = ssl_context if verify else False
+            local_ssl_context = get_ssl_context() if verify else False
             local_client = httpx.Client(verify=local_ssl_context)
 
-            download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token)
-
-            ensure_executable_scripts(project_path, tracker=tracker)
+            download_and_extract_template(project_path, selected_ais, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, offline=offline, use_cache=not no_cache, template_dir=template_dir)
 
             if not no_git:
                 tracker.start("git")
@@ -1184,9 +1476,9 @@ def init(
         console.print(git_error_panel)
 
     # Agent folder security notice
-    agent_config = AGENT_CONFIG.get(selected_ai)
-    if agent_config:
-        agent_folder = agent_config["folder"]
+    agent_folders = [AGENT_CONFIG[a]["folder"] for a in selected_ais]
+    if agent_folders:
+        agent_folder = ", ".join(agent_folders)
         security_notice = Panel(
             f"Some agents may store credentials, auth tokens, or other identifying and private artifacts in the agent folder within your project.\n"
             f"Consider adding [cyan]{agent_folder}[/cyan] (or parts of it) to [cyan].gitignore[/cyan] to prevent accidental credential leakage.",
@@ -1206,7 +1498,7 @@ def init(
         step_num = 2
 
     # Add Codex-specific setup step if needed
-    if selected_ai == "codex":
+    if "codex" in selected_ais:
         codex_path = project_path / ".codex"
         quoted_path = shlex.quote(str(codex_path))
         if os.name == "nt":  # Windows
@@ -1240,37 +1532,175 @@ def init(
     console.print()
     console.print(enhancements_panel)
 
+def _fetch_upgrade_templates(installed: "ProjectManifest", cache: "ReleaseCache", *, force: bool, offline: bool, skip_tls: bool, debug: bool, github_token: str | None) -> list[Tuple[Path, dict]]:
+    """Download the latest release archives for an upgrade; empty when already on it."""
+    import httpx
+
+    client = httpx.Client(verify=get_ssl_context() if not skip_tls else False)
+    try:
+        try:
+            release_data, _ = fetch_latest_release(client, github_token=github_token, debug=debug, offline=offline, cache=cache)
+        except Exception as e:
+            console.print(Panel(str(e), title="Fetch Error", border_style="red"))
+            raise typer.Exit(1)
+        if release_data.get("tag_name") == installed.release and not force:
+            return []
+        return download_templates_from_github(
+            installed.agents,
+            Path.cwd(),
+            script_type=installed.script,
+            verbose=debug,
+            client=client,
+            debug=debug,
+            github_token=github_token,
+            offline=offline,
+            cache=cache,
+        )
+    finally:
+        client.close()
+
 @app.command()
-def check():
+def upgrade(
+    force: bool = typer.Option(False, "--force", help="Overwrite (or remove) template files even if you modified them locally"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would change without writing anything"),
+    template_dir: Path = typer.Option(None, "--template-dir", envvar="SPECIFY_TEMPLATE_DIR", file_okay=False, exists=True, help="Render templates from this Spec Kit checkout instead of downloading a release (no network)"),
+    offline: bool = typer.Option(False, "--offline", help="Use only the local template cache; never contact GitHub"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
+    github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
+):
+    """
+    Update the template files in the current project to the latest release.
+
+    Compares the manifest recorded by `specify init` (.specify/manifest.json)
+    with the latest release and writes only files that were added or changed
+    upstream. Files you edited locally are reported and left alone unless
+    --force is given.
+
+    Examples:
+        specify upgrade --dry-run
+        specify upgrade
+        specify upgrade --force
+    """
+    from .extract import archive_manifest, extract_template
+    from .manifest import ProjectManifest, plan_upgrade
+    from .release_cache import ReleaseCache
+
+    project_path = Path.cwd()
+    installed = ProjectManifest.load(project_path)
+    if installed is None:
+        console.print("[red]Error:[/red] No template manifest found (.specify/manifest.json)")
+        console.print("Run [cyan]specify init --here --ai <agent>[/cyan] once to record one; later upgrades are incremental.")
+        raise typer.Exit(1)
+
+    cache = ReleaseCache()
+    if template_dir:
+        packages = render_template_locally(installed.agents, installed.script, template_dir, project_path, cache=cache)
+        if packages[0][1]["release"] == installed.release and not force:
+            packages = []
+    else:
+        packages = _fetch_upgrade_templates(installed, cache, force=force, offline=offline, skip_tls=skip_tls, debug=debug, github_token=github_token)
+    if not packages:
+        console.print(f"[green]Already up to date[/green] ({installed.release}, {installed.ai}/{installed.script})")
+        return
+    zip_paths = [zip_path for zip_path, _ in packages]
+    meta = packages[0][1]
+
+    merge_rules = template_merge_rules(verbose=True)
+    with span("plan upgrade", "extract"):
+        release_files = archive_manifest(zip_paths)
+        plan = plan_upgrade(project_path, installed, release_files, force=force, merged_paths=set(merge_rules))
+
+    table = Table(show_header=False, box=None, padding=(0, 2))
+    table.add_column("Key", style="cyan", justify="right")
+    table.add_column("Value", style="white")
+    table.add_row("Release", f"{installed.release} -> {meta['release']}")
+    table.add_row("Added", str(len(plan.added)))
+    table.add_row("Changed", str(len(plan.changed)))
+    table.add_row("Removed", str(len(plan.removed)))
+    table.add_row("Unchanged", str(plan.unchanged))
+    table.add_row("Locally modified", str(len(plan.conflicts)))
+    console.print(Panel(table, title="[bold cyan]Template Upgrade[/bold cyan]", border_style="cyan", padding=(1, 2)))
+    for label, paths, color in (("Add", plan.added, "green"), ("Update", plan.changed, "cyan"), ("Remove", plan.removed, "yellow")):
+        for rel_path in paths:
+            console.print(f"  [{color}]{label}[/] {rel_path}")
+    if plan.conflicts:
+        console.print("[yellow]Kept your local changes (use --force to replace them):[/yellow]")
+        for rel_path in plan.conflicts:
+            console.print(f"  - {rel_path}")
+
+    if dry_run:
+        console.print("[dim]Dry run: no files were changed[/dim]")
+        return
+
+    writes = plan.writes
+    if writes:
+        with span("apply upgrade", "extract"):
+            extract_template(zip_paths, project_path, merge_rules=merge_rules, include=writes.__contains__)
+    for rel_path in plan.removed:
+        target = project_path / rel_path
+        target.unlink(missing_ok=True)
+        # Drop the directories the removal left empty, up to the project root
+        for parent in target.parents:
+            if parent == project_path:
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+
+    # Locally modified files keep their old hash so they are still detected next time
+    files = dict(release_files)
+    for rel_path in plan.conflicts:
+        if rel_path in installed.files:
+            files[rel_path] = installed.files[rel_path]
+        else:
+            files.pop(rel_path, None)
+    ProjectManifest(meta["release"], installed.ai, installed.script, files).save(project_path)
+    if not meta["cached"]:
+        for zip_path in zip_paths:
+            zip_path.unlink(missing_ok=True)
+    console.print(f"[green]Upgraded to {meta['release']}[/green]: {len(writes)} written, {len(plan.removed)} removed")
+
+@app.command()
+def check(
+    versions: bool = typer.Option(False, "--versions", help="Also report each tool's --version output"),
+    timeout: float = typer.Option(3.0, "--timeout", help="Seconds to wait for each version probe"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached results and probe every tool again"),
+):
     """Check that all required tools are installed."""
     show_banner()
     console.print("[bold]Checking for installed tools...[/bold]\n")
 
     tracker = StepTracker("Check Available Tools")
 
-    tracker.add("git", "Git version control")
-    git_ok = check_tool("git", tracker=tracker)
+    cli_agents = [key for key, config in AGENT_CONFIG.items() if config["requires_cli"]]
+    # VS Code variants are not in the agent config
+    tools = discover(["git", *cli_agents, "code", "code-insiders"], versions=versions, timeout=timeout, refresh=refresh)
 
-    agent_results = {}
-    for agent_key, agent_config in AGENT_CONFIG.items():
-        agent_name = agent_config["name"]
-        requires_cli = agent_config["requires_cli"]
+    def report(key: str, label: str) -> bool:
+        tracker.add(key, label)
+        info = tools[key]
+        if info.found:
+            tracker.complete(key, info.version or "available")
+        else:
+            tracker.error(key, "not found")
+        return info.found
 
-        tracker.add(agent_key, agent_name)
+    git_ok = report("git", "Git version control")
 
-        if requires_cli:
-            agent_results[agent_key] = check_tool(agent_key, tracker=tracker)
+    agent_results = {}
+    for agent_key, agent_config in AGENT_CONFIG.items():
+        if agent_config["requires_cli"]:
+            agent_results[agent_key] = report(agent_key, agent_config["name"])
         else:
             # IDE-based agent - skip CLI check and mark as optional
+            tracker.add(agent_key, agent_config["name"])
             tracker.skip(agent_key, "IDE-based, no CLI check")
             agent_results[agent_key] = False  # Don't count IDE agents as "found"
 
-    # Check VS Code variants (not in agent config)
-    tracker.add("code", "Visual Studio Code")
-    code_ok = check_tool("code", tracker=tracker)
-
-    tracker.add("code-insiders", "Visual Studio Code Insiders")
-    code_insiders_ok = check_tool("code-insiders", tracker=tracker)
+    report("code", "Visual Studio Code")
+    report("code-insiders", "Visual Studio Code Insiders")
 
     console.print(tracker.render())
 
@@ -1306,61 +1736,107 @@ def version():
         except Exception:
             pass
     
-    # Fetch latest template release version
-    repo_owner = "github"
-    repo_name = "spec-kit"
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
-    
-    template_version = "unknown"
-    release_date = "unknown"
-    
-    try:
-        response = client.get(
-            api_url,
-            timeout=10,
-            follow_redirects=True,
-            headers=_github_auth_headers(),
+    def render(template_version: str, release_date: str) -> Panel:
+        table = Table(show_header=False, box=None, padding=(0, 2))
+        table.add_column("Key", style="cyan", justify="right")
+        table.add_column("Value", style="white")
+        table.add_row("CLI Version", cli_version)
+        table.add_row("Template Version", template_version)
+        table.add_row("Released", release_date)
+        table.add_row("", "")
+        table.add_row("Python", platform.python_version())
+        table.add_row("Platform", platform.system())
+        table.add_row("Architecture", platform.machine())
+        table.add_row("OS Version", platform.version())
+        return Panel(
+            table,
+            title="[bold cyan]Specify CLI Information[/bold cyan]",
+            border_style="cyan",
+            padding=(1, 2)
         )
-        if response.status_code == 200:
-            release_data = response.json()
-            template_version = release_data.get("tag_name", "unknown")
-            # Remove 'v' prefix if present
-            if template_version.startswith("v"):
-                template_version = template_version[1:]
-            release_date = release_data.get("published_at", "unknown")
-            if release_date != "unknown":
-                # Format the date nicely
-                try:
-                    dt = datetime.fromisoformat(release_date.replace('Z', '+00:00'))
-                    release_date = dt.strftime("%Y-%m-%d")
-                except Exception:
-                    pass
-    except Exception:
-        pass
-
-    info_table = Table(show_header=False, box=None, padding=(0, 2))
-    info_table.add_column("Key", style="cyan", justify="right")
-    info_table.add_column("Value", style="white")
-
-    info_table.add_row("CLI Version", cli_version)
-    info_table.add_row("Template Version", template_version)
-    info_table.add_row("Released", release_date)
-    info_table.add_row("", "")
-    info_table.add_row("Python", platform.python_version())
-    info_table.add_row("Platform", platform.system())
-    info_table.add_row("Architecture", platform.machine())
-    info_table.add_row("OS Version", platform.version())
-
-    panel = Panel(
-        info_table,
-        title="[bold cyan]Specify CLI Information[/bold cyan]",
-        border_style="cyan",
-        padding=(1, 2)
-    )
 
-    console.print(panel)
+    # Template version: cached release metadata (shared with `specify init`) when
+    # fresh, otherwise a background check that may take at most VERSION_CHECK_DEADLINE
+    release_data = _latest_release_in_background()
+
+    if release_data.ready():
+        console.print(render(*_release_version_fields(release_data.result())))
+    else:
+        from rich.live import Live
+
+        with Live(render("[dim]checking...[/dim]", "[dim]checking...[/dim]"), console=console, auto_refresh=False) as live:
+            data = release_data.result(timeout=VERSION_CHECK_DEADLINE)
+            live.update(render(*_release_version_fields(data)), refresh=True)
     console.print()
 
+VERSION_CHECK_DEADLINE = 2.0
+
+class _BackgroundResult:
+    """Value produced by a daemon thread; result() waits up to a timeout.
+
+    fallback is returned when the thread fails or has not finished in time.
+    """
+
+    def __init__(self, func=None, value=None, fallback=None):
+        self._event = threading.Event()
+        self._value = value
+        self._fallback = fallback
+        if func is None:
+            self._event.set()
+        else:
+            threading.Thread(target=self._run, args=(func,), daemon=True).start()
+
+    def _run(self, func):
+        try:
+            self._value = func()
+        except Exception:
+            self._value = None
+        finally:
+            self._event.set()
+
+    def ready(self) -> bool:
+        return self._event.is_set()
+
+    def result(self, timeout: float | None = None):
+        self._event.wait(timeout)
+        return self._value if self._value is not None else self._fallback
+
+def _latest_release_in_background() -> _BackgroundResult:
+    """Latest release metadata, from the fresh cache or a background GitHub request.
+
+    A stale cached copy is used if the request fails or misses the deadline.
+    """
+    from .release_cache import ReleaseCache, release_ttl
+
+    cache = ReleaseCache()
+    cached = cache.load_release("github/spec-kit")
+    if cached and cached.is_fresh(release_ttl()):
+        return _BackgroundResult(value=cached.data)
+
+    def check():
+        data, _ = fetch_latest_release(get_http_client(), cache=cache, timeout=VERSION_CHECK_DEADLINE * 5)
+        return data
+
+    return _BackgroundResult(check, fallback=cached.data if cached else None)
+
+def _release_version_fields(release_data: dict | None) -> Tuple[str, str]:
+    """(template version, release date) for display; "unknown" when unavailable."""
+    if not release_data:
+        return "unknown", "unknown"
+    template_version = release_data.get("tag_name", "unknown")
+    # Remove 'v' prefix if present
+    if template_version.startswith("v"):
+        template_version = template_version[1:]
+    release_date = release_data.get("published_at", "unknown")
+    if release_date != "unknown":
+        # Format the date nicely
+        try:
+            dt = datetime.fromisoformat(release_date.replace('Z', '+00:00'))
+            release_date = dt.strftime("%Y-%m-%d")
+        except Exception:
+            pass
+    return template_version, release_date
+
 def main():
     app()
 
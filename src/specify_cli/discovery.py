@@ -0,0 +1,145 @@
+"""Concurrent, cached discovery of the command-line tools Specify works with.
+
+``discover_tools`` resolves every tool at once on a thread pool and can also
+capture each tool's ``--version`` line under a per-probe timeout. Results are
+cached in ``tools.json`` in the Specify cache directory. Each cache entry is
+keyed on the PATH value and is valid while the mtimes of the PATH
+directories and the found binaries are unchanged: installing, upgrading or
+removing a tool touches one of them and forces a fresh probe.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+DEFAULT_VERSION_TIMEOUT = 3.0
+CACHE_FILE = "tools.json"
+
+
+@dataclass
+class ToolInfo:
+    name: str
+    path: str | None = None
+    version: str | None = None
+    mtime: float | None = None
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+
+def _mtime(path: str | os.PathLike) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _path_state(search_path: str) -> dict[str, float | None]:
+    return {d: _mtime(d) for d in search_path.split(os.pathsep) if d}
+
+
+def probe_version(path: str, timeout: float = DEFAULT_VERSION_TIMEOUT) -> str | None:
+    """First non-empty line of `<tool> --version`, or None if it fails or times out."""
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=timeout, stdin=subprocess.DEVNULL)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    for line in (result.stdout or result.stderr).splitlines():
+        if line.strip():
+            return line.strip()
+    return None
+
+
+def _probe(name: str, override: Path | None, search_path: str, versions: bool, timeout: float) -> ToolInfo:
+    if override is not None and override.is_file():
+        path = str(override)
+    else:
+        path = shutil.which(name, path=search_path)
+    info = ToolInfo(name, path, mtime=_mtime(path) if path else None)
+    if path and versions:
+        info.version = probe_version(path, timeout)
+    return info
+
+
+class ToolCache:
+    """tools.json: probe results per PATH, validated by directory and binary mtimes."""
+
+    def __init__(self, cache_dir: Path):
+        self.path = Path(cache_dir) / CACHE_FILE
+
+    def load(self, key: str, path_state: dict) -> dict[str, ToolInfo]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f).get(key)
+        except (OSError, ValueError):
+            return {}
+        if not entry or entry.get("pathState") != path_state:
+            return {}
+        tools = {}
+        for name, data in entry.get("tools", {}).items():
+            info = ToolInfo(**data)
+            if info.found and _mtime(info.path) != info.mtime:
+                continue
+            tools[name] = info
+        return tools
+
+    def save(self, key: str, path_state: dict, tools: dict[str, ToolInfo]) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        entry = data.get(key) if isinstance(data.get(key), dict) else {}
+        known = entry.get("tools", {}) if entry.get("pathState") == path_state else {}
+        known.update({name: asdict(info) for name, info in tools.items()})
+        data[key] = {"pathState": path_state, "tools": known}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def discover_tools(
+    names: list[str],
+    *,
+    versions: bool = False,
+    timeout: float = DEFAULT_VERSION_TIMEOUT,
+    overrides: dict[str, Path] | None = None,
+    cache_dir: Path | None = None,
+    refresh: bool = False,
+) -> dict[str, ToolInfo]:
+    """Locate tools (and optionally their versions) concurrently; returns ToolInfo per name.
+
+    overrides maps a tool name to a preferred location checked before PATH
+    (used for Claude's ~/.claude/local/claude). Pass cache_dir=None to skip
+    the cache; refresh=True ignores cached results but stores new ones.
+    """
+    overrides = overrides or {}
+    search_path = os.environ.get("PATH", os.defpath)
+    path_state = _path_state(search_path)
+    for override in overrides.values():
+        path_state[str(override)] = _mtime(override)
+    key = hashlib.sha256(f"{search_path}\0{int(versions)}".encode()).hexdigest()[:16]
+
+    cache = ToolCache(cache_dir) if cache_dir else None
+    results = {} if (cache is None or refresh) else cache.load(key, path_state)
+    missing = [name for name in dict.fromkeys(names) if name not in results]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(16, len(missing))) as pool:
+            probed = pool.map(lambda name: _probe(name, overrides.get(name), search_path, versions, timeout), missing)
+            fresh = {info.name: info for info in probed}
+        results.update(fresh)
+        if cache:
+            cache.save(key, path_state, fresh)
+    return {name: results[name] for name in names}
@@ -0,0 +1,182 @@
+"""Resumable, checksum-verified downloads of release assets.
+
+Data is streamed into ``<dest>.part``. The partial file is kept when a transfer
+fails, and the next attempt (in this run or a later one) resumes it with an
+HTTP ``Range`` request. Bytes are hashed as they are written. When the release
+metadata carries a ``digest`` ("sha256:<hex>"), the result is verified before
+the partial file is renamed to ``dest``.
+"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import httpx
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL = 0.1
+DEFAULT_ATTEMPTS = 4
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class DownloadError(RuntimeError):
+    """A download failed. HTTP failures carry the status, headers and a body excerpt."""
+
+    def __init__(self, message: str, *, status_code: int | None = None, headers: "httpx.Headers | None" = None, body: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+
+def parse_digest(digest: str | None) -> str | None:
+    """Hex SHA-256 from a GitHub asset digest ("sha256:<hex>"), or None."""
+    if not digest or not digest.startswith("sha256:"):
+        return None
+    return digest.split(":", 1)[1].lower()
+
+
+def chunk_size_for(total: int) -> int:
+    """Read size for a transfer of total bytes (~1% per chunk, 64 KiB..1 MiB)."""
+    if total <= 0:
+        return MIN_CHUNK_SIZE
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, total // 100))
+
+
+def partial_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + ".part")
+
+
+def download_file(
+    client: "httpx.Client",
+    url: str,
+    dest: Path,
+    *,
+    expected_size: int = 0,
+    expected_sha256: str | None = None,
+    headers: dict | None = None,
+    on_progress: ProgressCallback | None = None,
+    attempts: int = DEFAULT_ATTEMPTS,
+    timeout: float = 60,
+) -> str:
+    """Download url to dest, resuming any partial file. Returns the hex SHA-256.
+
+    Transport errors and 5xx responses are retried up to attempts times, each
+    retry continuing from the bytes already on disk. A partial file the server
+    resumes from the wrong offset is discarded and fetched again in full. on_progress(done, total) is called at most
+    every PROGRESS_INTERVAL seconds, plus once at completion.
+
+    Raises:
+        DownloadError: on HTTP errors, exhausted retries, redirect loops, undecodable
+            responses, local I/O errors or a checksum mismatch
+    """
+    import httpx
+
+    part = partial_path(dest)
+    part.parent.mkdir(parents=True, exist_ok=True)
+    last_error: Exception | None = None
+
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(min(2 ** (attempt - 1), 8))
+        try:
+            digest, total = _transfer(client, url, part, expected_size, headers or {}, on_progress, timeout)
+            break
+        except httpx.TransportError as e:
+            last_error = e
+        except DownloadError as e:
+            if e.status_code is None or e.status_code < 500:
+                raise
+            last_error = e
+        except (httpx.HTTPError, OSError) as e:
+            raise DownloadError(f"Download of {dest.name} failed: {e}") from e
+    else:
+        message = f"Download failed after {attempts} attempts: {last_error} (partial data kept for resume)"
+        if isinstance(last_error, DownloadError):
+            raise DownloadError(
+                message, status_code=last_error.status_code, headers=last_error.headers, body=last_error.body
+            ) from last_error
+        raise DownloadError(message) from last_error
+
+    sha256 = digest.hexdigest()
+    if expected_sha256 and sha256 != expected_sha256.lower():
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"Checksum mismatch for {dest.name}: expected {expected_sha256}, got {sha256}")
+    if expected_size and total != expected_size:
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"Size mismatch for {dest.name}: expected {expected_size:,} bytes, got {total:,}")
+    part.replace(dest)
+    return sha256
+
+
+def _transfer(client, url, part: Path, expected_size: int, headers: dict, on_progress, timeout):
+    """One request: resume or restart part, returning (sha256 object, bytes on disk)."""
+    digest = hashlib.sha256()
+    offset = part.stat().st_size if part.exists() else 0
+    if offset and expected_size and offset > expected_size:
+        part.unlink()
+        offset = 0
+
+    request_headers = dict(headers)
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+
+    with client.stream("GET", url, timeout=timeout, follow_redirects=True, headers=request_headers) as response:
+        if response.status_code == 416 and offset:
+            # Nothing left to fetch: the partial file is already complete
+            _hash_file(part, digest)
+            return digest, offset
+        if response.status_code == 206 and offset and _range_start(response) != offset:
+            # Resumed from the wrong byte: the partial file is unusable, fetch the whole asset
+            response.close()
+            part.unlink()
+            return _transfer(client, url, part, expected_size, headers, on_progress, timeout)
+        if response.status_code == 206 and offset:
+            _hash_file(part, digest)
+            mode = "ab"
+        elif response.status_code == 200:
+            offset = 0
+            mode = "wb"
+        else:
+            response.read()
+            raise DownloadError(
+                f"HTTP {response.status_code} downloading {url}",
+                status_code=response.status_code,
+                headers=response.headers,
+                body=response.text[:400],
+            )
+
+        total = expected_size or offset + int(response.headers.get("content-length", 0))
+        done = offset
+        last_report = 0.0
+        with open(part, mode) as f:
+            for chunk in response.iter_bytes(chunk_size=chunk_size_for(total)):
+                f.write(chunk)
+                digest.update(chunk)
+                done += len(chunk)
+                now = time.monotonic()
+                if on_progress and now - last_report >= PROGRESS_INTERVAL:
+                    on_progress(done, total)
+                    last_report = now
+        if on_progress:
+            on_progress(done, total or done)
+        return digest, done
+
+
+def _range_start(response: "httpx.Response") -> int | None:
+    """First byte offset from a Content-Range header ("bytes 100-199/200")."""
+    value = response.headers.get("content-range", "")
+    try:
+        return int(value.split(" ", 1)[1].split("-", 1)[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def _hash_file(path: Path, digest) -> None:
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(MAX_CHUNK_SIZE), b""):
+            digest.update(block)
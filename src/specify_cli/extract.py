@@ -0,0 +1,243 @@
+"""Single-pass extraction of template archives.
+
+Each archive member is written straight to its final location, at most once:
+- a single top-level directory shared by all members is stripped while writing
+  (release zips may or may not wrap their contents in one);
+- files that need special merge handling (such as ``.vscode/settings.json``)
+  are passed to a merge rule and not written;
+- files whose content already matches the archive are left untouched;
+- POSIX permission bits are applied from ``external_attr`` (masked by the
+  umask, as for any newly created file), and shell scripts
+  with a shebang under ``.specify/scripts`` are made executable even when the
+  archive carries no mode bits.
+"""
+
+import hashlib
+import os
+import stat
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterable
+
+COPY_BUFFER = 256 * 1024
+PARALLEL_THRESHOLD = 64
+SCRIPTS_PREFIX = ".specify/scripts/"
+
+# (new content, destination path, relative path) -> None
+MergeRule = Callable[[bytes, Path, str], None]
+
+
+@dataclass
+class ExtractResult:
+    entries: int = 0
+    files: int = 0
+    stripped_prefix: str | None = None
+    top_level: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    merged: list[str] = field(default_factory=list)
+    executables: int = 0
+    # relative path -> SHA-256 of the template content (the project manifest)
+    hashes: dict[str, str] = field(default_factory=dict)
+
+
+def common_prefix(names: list[str]) -> str | None:
+    """Return the single top-level directory that contains every member, if any."""
+    roots = {name.split("/", 1)[0] for name in names if name}
+    if len(roots) != 1:
+        return None
+    root = roots.pop()
+    if all(name == f"{root}/" or name.startswith(f"{root}/") for name in names if name):
+        return root
+    return None
+
+
+def _relative_name(name: str, prefix: str | None) -> str:
+    if prefix:
+        name = name[len(prefix) + 1:]
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts:
+        raise ValueError(f"Unsafe path in archive: {name}")
+    return path.as_posix() if name else ""
+
+
+def _umask() -> int:
+    """The process umask (reading it means setting it, so it is restored at once)."""
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def _mode_for(info: zipfile.ZipInfo, rel: str, head: bytes, umask: int = 0) -> int | None:
+    """Permission bits to apply to an extracted file, or None to keep the default."""
+    mode = (info.external_attr >> 16) & 0o777
+    if rel.startswith(SCRIPTS_PREFIX) and rel.endswith(".sh") and head.startswith(b"#!") and not mode & 0o111:
+        base = mode or 0o644
+        mode = base | 0o100 | ((base & 0o044) >> 2)
+    # An archive must not make files group- or world-writable behind the user's umask
+    return (mode & ~umask) or None
+
+
+def _matches(target: Path, info: zipfile.ZipInfo) -> tuple[bool, bytes, str]:
+    """Whether target already holds info's content (size, then CRC-32), its first bytes and SHA-256."""
+    try:
+        if target.stat().st_size != info.file_size:
+            return False, b"", ""
+        crc = 0
+        head = b""
+        digest = hashlib.sha256()
+        with open(target, "rb") as f:
+            for block in iter(lambda: f.read(COPY_BUFFER), b""):
+                if not head:
+                    head = block
+                crc = zlib.crc32(block, crc)
+                digest.update(block)
+        return crc == info.CRC, head, digest.hexdigest()
+    except OSError:
+        return False, b"", ""
+
+
+def _copy_member(src, out) -> tuple[bytes, str]:
+    """Copy an open archive member to out; returns its first bytes and SHA-256."""
+    digest = hashlib.sha256()
+    head = b""
+    for block in iter(lambda: src.read(COPY_BUFFER), b""):
+        if not head:
+            head = block
+        out.write(block)
+        digest.update(block)
+    return head, digest.hexdigest()
+
+
+def _as_list(zip_paths: Path | Iterable[Path]) -> list[Path]:
+    return [zip_paths] if isinstance(zip_paths, (str, os.PathLike)) else list(zip_paths)
+
+
+def archive_manifest(zip_paths: Path | Iterable[Path]) -> dict[str, str]:
+    """SHA-256 of every file in one or more template archives, keyed by extracted relative path.
+
+    When archives share a path, the last one wins (as in extract_template).
+    """
+    manifest = {}
+    for zip_path in _as_list(zip_paths):
+        with zipfile.ZipFile(zip_path, "r") as archive:
+            infos = archive.infolist()
+            prefix = common_prefix([info.filename for info in infos])
+            for info in infos:
+                rel = _relative_name(info.filename, prefix)
+                if not rel or info.is_dir():
+                    continue
+                digest = hashlib.sha256()
+                with archive.open(info) as src:
+                    for block in iter(lambda: src.read(COPY_BUFFER), b""):
+                        digest.update(block)
+                manifest[rel] = digest.hexdigest()
+    return manifest
+
+
+def extract_template(
+    zip_paths: Path | Iterable[Path],
+    dest: Path,
+    *,
+    merge_rules: dict[str, MergeRule] | None = None,
+    include: Callable[[str], bool] | None = None,
+    max_workers: int | None = None,
+) -> ExtractResult:
+    """Extract one or more archives into dest in one pass and return what was written.
+
+    Several archives (one per agent) are merged before anything is written:
+    each relative path is written once, taken from the last archive that
+    contains it. Files already present in dest are compared against the
+    archive's central directory (size and CRC-32) and only rewritten when they
+    differ, so re-extracting over an up-to-date tree reads but does not write.
+    merge_rules maps a relative path to a callable that is used instead of a
+    plain write when that file already exists in dest. Trees with more than
+    PARALLEL_THRESHOLD files are processed on a thread pool. include, when
+    given, limits extraction to the relative file paths it accepts; only the
+    directories holding those files are created.
+    """
+    zip_paths = _as_list(zip_paths)
+    merge_rules = merge_rules or {}
+    result = ExtractResult()
+    posix = os.name != "nt"
+    umask = _umask() if posix else 0
+    local = threading.local()
+    opened: list[zipfile.ZipFile] = []
+    opened_lock = threading.Lock()
+
+    def archive_for_thread(index: int) -> zipfile.ZipFile:
+        # ZipFile objects share one file position, so every worker opens its own
+        archives = local.__dict__.setdefault("archives", {})
+        if index not in archives:
+            archives[index] = zipfile.ZipFile(zip_paths[index], "r")
+            with opened_lock:
+                opened.append(archives[index])
+        return archives[index]
+
+    def apply(index: int, info: zipfile.ZipInfo, rel: str) -> tuple[str, bool, str]:
+        """Bring one file up to date; returns (status, is executable, content SHA-256)."""
+        target = dest / rel
+        exists = target.exists()
+        if exists and rel in merge_rules:
+            data = archive_for_thread(index).read(info)
+            merge_rules[rel](data, target, rel)
+            return "merged", False, hashlib.sha256(data).hexdigest()
+
+        same, head, sha256 = _matches(target, info) if exists else (False, b"", "")
+        if not same:
+            with archive_for_thread(index).open(info) as src, open(target, "wb") as out:
+                head, sha256 = _copy_member(src, out)
+
+        mode = _mode_for(info, rel, head, umask) if posix else None
+        if mode is not None and (not same or stat.S_IMODE(target.stat().st_mode) != mode):
+            os.chmod(target, mode)
+        status = "unchanged" if same else ("changed" if exists else "added")
+        return status, bool(mode and mode & 0o111), sha256
+
+    try:
+        top_level: set[str] = set()
+        planned: dict[str, tuple[int, zipfile.ZipInfo]] = {}
+        for index in range(len(zip_paths)):
+            infos = archive_for_thread(index).infolist()
+            prefix = common_prefix([info.filename for info in infos])
+            result.entries += len(infos)
+            result.stripped_prefix = result.stripped_prefix or prefix
+            for info in infos:
+                rel = _relative_name(info.filename, prefix)
+                # With include, only the parents of accepted files are created
+                if not rel or (include and (info.is_dir() or not include(rel))):
+                    continue
+                top_level.add(rel.split("/", 1)[0])
+                if info.is_dir():
+                    (dest / rel).mkdir(parents=True, exist_ok=True)
+                else:
+                    (dest / rel).parent.mkdir(parents=True, exist_ok=True)
+                    planned[rel] = (index, info)
+        result.top_level = sorted(top_level)
+
+        files = [(index, info, rel) for rel, (index, info) in planned.items()]
+        if len(files) > PARALLEL_THRESHOLD and max_workers != 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                outcomes = list(pool.map(lambda item: apply(*item), files))
+        else:
+            outcomes = [apply(*item) for item in files]
+    finally:
+        for archive in opened:
+            archive.close()
+
+    for (_, _, rel), (status, executable, sha256) in zip(files, outcomes):
+        result.hashes[rel] = sha256
+        if status == "unchanged":
+            result.unchanged += 1
+        elif status == "merged":
+            result.merged.append(rel)
+        else:
+            result.files += 1
+            (result.added if status == "added" else result.changed).append(rel)
+        result.executables += executable
+    return result
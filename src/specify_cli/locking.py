@@ -0,0 +1,44 @@
+"""Cross-process advisory file locks.
+
+Used where several ``specify`` processes (parallel CI jobs, concurrent
+``init`` runs) share a file: the release cache and trace timelines.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_POLL_SECONDS = 0.05
+
+
+@contextmanager
+def file_lock(path: str | Path):
+    """Hold an exclusive lock on path (created if missing) for a with-block."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
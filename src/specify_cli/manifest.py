@@ -0,0 +1,117 @@
+"""Per-project record of the template files installed by ``specify init``.
+
+``.specify/manifest.json`` stores the release tag, agent, script type and the
+SHA-256 of every template file as it was written. ``specify upgrade`` compares
+it with the new release to decide what to write, and compares it with the
+files on disk to find local modifications that must not be overwritten.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+MANIFEST_PATH = Path(".specify") / "manifest.json"
+
+
+def file_sha256(path: Path) -> str | None:
+    """SHA-256 of a file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(256 * 1024), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+@dataclass
+class ProjectManifest:
+    release: str
+    ai: str
+    script: str
+    files: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def agents(self) -> list[str]:
+        """Agent keys; ai holds several comma-separated keys for multi-agent projects."""
+        return self.ai.split(",")
+
+    @classmethod
+    def load(cls, project_path: Path) -> "ProjectManifest | None":
+        try:
+            with open(project_path / MANIFEST_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data["release"], data["ai"], data["script"], dict(data.get("files", {})))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, project_path: Path) -> Path:
+        path = project_path / MANIFEST_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"release": self.release, "ai": self.ai, "script": self.script, "files": dict(sorted(self.files.items()))}
+        # Created 0666 less the umask like any file: the manifest is committed with the project
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+        return path
+
+
+@dataclass
+class UpgradePlan:
+    """What an upgrade from one manifest to a new release's files will do."""
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    # Changed or removed upstream, but edited locally: left alone unless forced
+    conflicts: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def writes(self) -> set[str]:
+        return set(self.added) | set(self.changed)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed or self.conflicts)
+
+
+def plan_upgrade(project_path: Path, installed: ProjectManifest, release_files: dict[str, str], *, force: bool = False, merged_paths: set[str] = frozenset()) -> UpgradePlan:
+    """Compare the installed manifest, the files on disk and the new release.
+
+    Only files that differ between the two releases (or are missing on disk)
+    are hashed locally, so planning an upgrade with few template changes is
+    cheap even in large projects. Files in merged_paths are merged rather than
+    replaced, so local edits to them never count as conflicts.
+    """
+    plan = UpgradePlan()
+    for rel, new_hash in sorted(release_files.items()):
+        old_hash = installed.files.get(rel)
+        if old_hash == new_hash and (project_path / rel).exists():
+            plan.unchanged += 1
+            continue
+        local_hash = file_sha256(project_path / rel)
+        if local_hash == new_hash:
+            plan.unchanged += 1
+        elif local_hash is None:
+            plan.added.append(rel)
+        elif local_hash == old_hash or force or rel in merged_paths:
+            plan.changed.append(rel)
+        else:
+            plan.conflicts.append(rel)
+
+    for rel, old_hash in sorted(installed.files.items()):
+        if rel in release_files:
+            continue
+        local_hash = file_sha256(project_path / rel)
+        if local_hash is None:
+            continue
+        if local_hash == old_hash or force:
+            plan.removed.append(rel)
+        else:
+            plan.conflicts.append(rel)
+    return plan
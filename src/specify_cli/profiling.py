@@ -0,0 +1,109 @@
+"""Built-in profiling for Specify CLI commands.
+
+``specify --profile DIR <command>`` runs the command under cProfile and
+tracemalloc and writes a report directory:
+
+    profile.pstats   raw cProfile data (load with ``python -m pstats``)
+    profile.txt      top functions by cumulative time
+    allocations.txt  top allocation sites and peak traced memory
+    imports.txt      import-time breakdown of the specify_cli package
+    summary.json     command, wall time and peak memory
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+TOP_FUNCTIONS = 60
+TOP_ALLOCATIONS = 30
+TOP_IMPORTS = 40
+
+
+class ProfileSession:
+    """Profile the current process from start() until stop()."""
+
+    def __init__(self, report_dir: Path, command: str):
+        self.report_dir = Path(report_dir)
+        self.command = command
+        self._profiler = cProfile.Profile()
+        self._started = 0.0
+
+    def start(self) -> None:
+        tracemalloc.start(10)
+        self._started = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self) -> Path:
+        """Stop profiling and write the report. Returns the report directory."""
+        self._profiler.disable()
+        wall = time.perf_counter() - self._started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        self._profiler.dump_stats(self.report_dir / "profile.pstats")
+
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        (self.report_dir / "profile.txt").write_text(out.getvalue(), encoding="utf-8")
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        lines = [f"Peak traced memory: {peak / 1024:.1f} KiB (current {current / 1024:.1f} KiB)", ""]
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+        (self.report_dir / "allocations.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        imports = import_time_breakdown()
+        (self.report_dir / "imports.txt").write_text(imports, encoding="utf-8")
+
+        summary = {
+            "command": self.command,
+            "wallSeconds": round(wall, 4),
+            "peakMemoryBytes": peak,
+            "python": sys.version.split()[0],
+        }
+        (self.report_dir / "summary.json").write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+        return self.report_dir
+
+
+def import_time_breakdown(module: str = "specify_cli") -> str:
+    """Import a module in a fresh interpreter with -X importtime; list the slowest imports.
+
+    Returns a table of (self us, cumulative us, module), sorted by cumulative time.
+    """
+    env = dict(os.environ)
+    package_parent = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_parent, env.get("PYTHONPATH")]))
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, env=env, timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return f"Import-time measurement failed: {e}\n"
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+            rows.append((int(self_us), int(cumulative_us), name))
+        except ValueError:
+            continue
+    rows.sort(key=lambda r: r[1], reverse=True)
+
+    lines = [f"{'self [us]':>10}  {'cumulative [us]':>15}  module"]
+    lines += [f"{s:>10}  {c:>15}  {n}" for s, c, n in rows[:TOP_IMPORTS]]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,137 @@
+"""Local cache of GitHub release metadata and template assets.
+
+Layout under the cache root (``SPECIFY_CACHE_DIR`` or the platform user cache dir):
+
+    releases/<owner>__<repo>.json   latest-release JSON, its ETag and fetch time
+    assets/<sha256>.zip             template archives, stored by content hash
+    index.json                      "<tag>/<asset name>" -> sha256
+    rendered/<agent>-<script>-<hash>.zip  packages rendered from a local checkout
+
+Release metadata younger than the TTL (``SPECIFY_RELEASE_TTL`` seconds) is used
+without touching the network; older metadata is revalidated with
+``If-None-Match`` so an unchanged release costs a 304, which GitHub does not
+count against the rate limit. Assets are immutable per tag, so a cached
+archive is reused until the release changes.
+"""
+
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .locking import file_lock
+
+DEFAULT_RELEASE_TTL = 600
+
+
+def default_cache_dir() -> Path:
+    """Cache root from SPECIFY_CACHE_DIR or the platform user cache directory."""
+    override = os.getenv("SPECIFY_CACHE_DIR")
+    if override:
+        return Path(override)
+    from platformdirs import user_cache_dir
+    return Path(user_cache_dir("specify-cli"))
+
+
+def release_ttl() -> float:
+    """Seconds cached release metadata is trusted without revalidation."""
+    try:
+        return float(os.getenv("SPECIFY_RELEASE_TTL", DEFAULT_RELEASE_TTL))
+    except ValueError:
+        return DEFAULT_RELEASE_TTL
+
+
+@dataclass
+class CachedRelease:
+    data: dict
+    etag: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+
+class ReleaseCache:
+    """Read and write cached releases and content-addressed assets."""
+
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root else default_cache_dir()
+        self.assets_dir = self.root / "assets"
+        self.rendered_dir = self.root / "rendered"
+        self._releases_dir = self.root / "releases"
+        self._index_path = self.root / "index.json"
+
+    def load_release(self, repo: str) -> CachedRelease | None:
+        """Return cached latest-release metadata for "owner/repo", if any."""
+        try:
+            with open(self._release_path(repo), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return CachedRelease(entry["data"], entry.get("etag"), entry["fetchedAt"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store_release(self, repo: str, data: dict, etag: str | None) -> CachedRelease:
+        """Save freshly fetched release metadata."""
+        entry = CachedRelease(data, etag, time.time())
+        self._write_json(self._release_path(repo), {"data": data, "etag": etag, "fetchedAt": entry.fetched_at})
+        return entry
+
+    def touch_release(self, repo: str, cached: CachedRelease) -> CachedRelease:
+        """Mark cached metadata as revalidated (after a 304)."""
+        return self.store_release(repo, cached.data, cached.etag)
+
+    def asset_path(self, tag: str, asset_name: str) -> Path | None:
+        """Path of a cached asset archive, or None if it is not cached."""
+        sha256 = self._load_index().get(f"{tag}/{asset_name}")
+        if not sha256:
+            return None
+        path = self.assets_dir / f"{sha256}.zip"
+        return path if path.is_file() else None
+
+    def new_download_path(self, asset_name: str) -> Path:
+        """Staging path inside the cache to download an asset into.
+
+        The path is stable per asset name, so an interrupted download can be
+        resumed by a later run. Hold download_lock(asset_name) while using it.
+        """
+        incoming = self.assets_dir / "incoming"
+        incoming.mkdir(parents=True, exist_ok=True)
+        return incoming / asset_name
+
+    def download_lock(self, asset_name: str):
+        """Cross-process lock serializing downloads (and storing) of one asset."""
+        incoming = self.assets_dir / "incoming"
+        incoming.mkdir(parents=True, exist_ok=True)
+        return file_lock(incoming / f"{asset_name}.lock")
+
+    def store_asset(self, tag: str, asset_name: str, downloaded: Path, sha256: str) -> Path:
+        """Move a downloaded archive into the content store and index it."""
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        path = self.assets_dir / f"{sha256}.zip"
+        os.replace(downloaded, path)
+        # A file lock, not a thread lock: concurrent specify processes share the index
+        with file_lock(self.root / "index.json.lock"):
+            index = self._load_index()
+            index[f"{tag}/{asset_name}"] = sha256
+            self._write_json(self._index_path, index)
+        return path
+
+    def _release_path(self, repo: str) -> Path:
+        return self._releases_dir / f"{repo.replace('/', '__')}.json"
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: Path, data: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
@@ -0,0 +1,202 @@
+"""Render agent template packages from a local Spec Kit checkout.
+
+This is a Python port of ``.github/workflows/scripts/create-release-packages.sh``.
+``specify init --template-dir DIR`` uses it to build the same archive a
+release would contain, straight from ``DIR/templates/commands/*.md``,
+``memory/``, ``scripts/`` and ``templates/``, so init needs no network.
+Packages are cached by a hash of every source file plus the agent and script
+type, and several agents are rendered in parallel.
+"""
+
+import hashlib
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Bump when the rendering rules change so cached packages are rebuilt
+RENDER_VERSION = "1"
+
+SOURCE_DIRS = ("templates", "memory", "scripts", "agent_templates")
+SCRIPT_DIRS = {"sh": "bash", "ps": "powershell"}
+ARG_FORMATS = {"toml": "{{args}}", "md": "$ARGUMENTS", "agent.md": "$ARGUMENTS"}
+# Context files some agents ship next to their commands
+AGENT_EXTRA_FILES = {
+    "gemini": ("agent_templates/gemini/GEMINI.md", "GEMINI.md"),
+    "qwen": ("agent_templates/qwen/QWEN.md", "QWEN.md"),
+}
+
+
+def _source_files(source_root: Path) -> list[Path]:
+    files = []
+    for name in SOURCE_DIRS:
+        base = source_root / name
+        if base.is_dir():
+            files.extend(p for p in base.rglob("*") if p.is_file())
+    return sorted(files)
+
+
+def source_hash(source_root: Path) -> str:
+    """SHA-256 over the relative path and content of every template source file."""
+    digest = hashlib.sha256(RENDER_VERSION.encode())
+    for path in _source_files(source_root):
+        digest.update(path.relative_to(source_root).as_posix().encode() + b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def rewrite_paths(text: str) -> str:
+    text = re.sub(r"(/?)memory/", ".specify/memory/", text)
+    text = re.sub(r"(/?)scripts/", ".specify/scripts/", text)
+    return re.sub(r"(/?)templates/", ".specify/templates/", text)
+
+
+def _frontmatter_value(lines: list[str], key: str) -> str | None:
+    pattern = re.compile(rf"^\s*{re.escape(key)}:\s*")
+    for line in lines:
+        if pattern.match(line):
+            return pattern.sub("", line, count=1)
+    return None
+
+
+def _agent_script(lines: list[str], script_type: str) -> str | None:
+    in_agent_scripts = False
+    pattern = re.compile(rf"^\s*{re.escape(script_type)}:\s*")
+    for line in lines:
+        if line == "agent_scripts:":
+            in_agent_scripts = True
+            continue
+        if in_agent_scripts and pattern.match(line):
+            return pattern.sub("", line, count=1)
+        if in_agent_scripts and re.match(r"^[a-zA-Z]", line):
+            in_agent_scripts = False
+    return None
+
+
+def _strip_script_sections(lines: list[str]) -> list[str]:
+    """Drop the scripts: and agent_scripts: blocks from the YAML frontmatter."""
+    out = []
+    dashes = 0
+    in_frontmatter = skipping = False
+    for line in lines:
+        if line == "---":
+            dashes += 1
+            in_frontmatter = dashes == 1
+            out.append(line)
+            continue
+        if in_frontmatter and line in ("scripts:", "agent_scripts:"):
+            skipping = True
+            continue
+        if in_frontmatter and skipping and re.match(r"^[a-zA-Z].*:", line):
+            skipping = False
+        if in_frontmatter and skipping and re.match(r"^\s", line):
+            continue
+        out.append(line)
+    return out
+
+
+def render_command(template: str, agent: str, command_format: str, script_type: str) -> str:
+    """Render one templates/commands/*.md file for an agent; returns the file content."""
+    text = template.replace("\r", "").rstrip("\n")
+    lines = text.split("\n")
+    description = _frontmatter_value(lines, "description") or ""
+    script_command = _frontmatter_value(lines, script_type)
+    if script_command is None:
+        script_command = f"(Missing script command for {script_type})"
+    agent_script = _agent_script(lines, script_type)
+
+    body = text.replace("{SCRIPT}", script_command)
+    if agent_script:
+        body = body.replace("{AGENT_SCRIPT}", agent_script)
+    body = "\n".join(_strip_script_sections(body.split("\n")))
+    body = body.replace("{ARGS}", ARG_FORMATS[command_format]).replace("__AGENT__", agent)
+    body = rewrite_paths(body)
+
+    if command_format == "toml":
+        body = body.replace("\\", "\\\\")
+        return f'description = "{description}"\n\nprompt = """\n{body}\n"""\n'
+    return body + "\n"
+
+
+def package_files(source_root: Path, agent: str, agent_config: dict, script_type: str) -> dict[str, bytes]:
+    """All files of one agent/script package, keyed by path inside the archive."""
+    files: dict[str, bytes] = {}
+
+    memory = source_root / "memory"
+    if memory.is_dir():
+        for path in memory.rglob("*"):
+            if path.is_file():
+                files[f".specify/memory/{path.relative_to(memory).as_posix()}"] = path.read_bytes()
+
+    scripts = source_root / "scripts"
+    if scripts.is_dir():
+        variant = scripts / SCRIPT_DIRS[script_type]
+        if variant.is_dir():
+            for path in variant.rglob("*"):
+                if path.is_file():
+                    files[f".specify/scripts/{SCRIPT_DIRS[script_type]}/{path.relative_to(variant).as_posix()}"] = path.read_bytes()
+        for path in scripts.iterdir():
+            if path.is_file():
+                files[f".specify/scripts/{path.name}"] = path.read_bytes()
+
+    templates = source_root / "templates"
+    if templates.is_dir():
+        for path in templates.rglob("*"):
+            rel = path.relative_to(templates).as_posix()
+            if path.is_file() and not rel.startswith("commands/") and path.name != "vscode-settings.json":
+                files[f".specify/templates/{rel}"] = path.read_bytes()
+
+    commands_dir = agent_config["commands_dir"]
+    command_format = agent_config["command_format"]
+    for template in sorted((templates / "commands").glob("*.md")):
+        content = render_command(template.read_text(encoding="utf-8"), agent, command_format, script_type)
+        files[f"{commands_dir}/speckit.{template.stem}.{command_format}"] = content.encode("utf-8")
+
+    if agent == "copilot":
+        for template in sorted((templates / "commands").glob("*.md")):
+            files[f".github/prompts/speckit.{template.stem}.prompt.md"] = f"---\nagent: speckit.{template.stem}\n---\n".encode("utf-8")
+        settings = templates / "vscode-settings.json"
+        if settings.is_file():
+            files[".vscode/settings.json"] = settings.read_bytes()
+
+    extra = AGENT_EXTRA_FILES.get(agent)
+    if extra and (source_root / extra[0]).is_file():
+        files[extra[1]] = (source_root / extra[0]).read_bytes()
+    return files
+
+
+def render_package(source_root: Path, agent: str, agent_config: dict, script_type: str, dest: Path) -> Path:
+    """Write the agent/script package to dest as a zip archive (like a release asset)."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in sorted(package_files(source_root, agent, agent_config, script_type).items()):
+            info = zipfile.ZipInfo(name)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            executable = name.startswith(".specify/scripts/") and data.startswith(b"#!")
+            info.external_attr = (0o100755 if executable else 0o100644) << 16
+            archive.writestr(info, data)
+    tmp.replace(dest)
+    return dest
+
+
+def render_packages(source_root: Path, agents: dict[str, dict], script_type: str, cache_dir: Path) -> tuple[str, dict[str, Path]]:
+    """Render (or reuse cached) packages for several agents in parallel.
+
+    agents maps agent keys to their AGENT_CONFIG entries. Returns the source
+    hash and the archive path per agent.
+    """
+    source_root = Path(source_root)
+    if not (source_root / "templates" / "commands").is_dir():
+        raise FileNotFoundError(f"{source_root} has no templates/commands directory")
+    key = source_hash(source_root)
+
+    def build(agent: str) -> tuple[str, Path]:
+        dest = cache_dir / f"{agent}-{script_type}-{key[:16]}.zip"
+        if not dest.is_file():
+            render_package(source_root, agent, agents[agent], script_type, dest)
+        return agent, dest
+
+    with ThreadPoolExecutor(max_workers=min(8, len(agents) or 1)) as pool:
+        return key, dict(pool.map(build, agents))
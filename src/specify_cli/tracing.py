@@ -0,0 +1,103 @@
+"""Span-based tracing for Specify CLI runs.
+
+Spans are recorded only while tracing is enabled (``specify --trace FILE`` or
+``SPECIFY_TRACE=FILE``) and are written as Chrome trace / Perfetto JSON, so a
+slow ``specify init`` can be inspected as a timeline of network, parsing,
+extraction and git phases. When tracing is off, ``span`` costs one attribute
+check.
+
+The file is one timeline shared with the Linear client: ``linear`` jobs
+record into ``SPECIFY_TRACE`` too (unless ``LINEAR_TRACE_FILE`` is set), and
+every process merges its events into the file under a lock, each on its own
+process track. Delete the file to start a new timeline.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from .locking import file_lock
+
+
+class Tracer:
+    """Collect complete ("X") trace events and write them as Chrome trace JSON."""
+
+    def __init__(self):
+        self.enabled = False
+        self.path: str | None = None
+        self._events: list[dict] = []
+        self._lock = threading.Lock()
+
+    def enable(self, path: str, process_name: str = "specify") -> None:
+        """Start recording spans; write() will save them to path."""
+        self.enabled = True
+        self.path = path
+        self._events.append({
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "args": {"name": process_name},
+        })
+
+    @contextmanager
+    def span(self, name: str, category: str = "specify", **args):
+        """Record the duration of a with-block."""
+        if not self.enabled:
+            yield
+            return
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": int(started_at * 1_000_000),
+                "dur": int((time.perf_counter() - started) * 1_000_000),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self._events.append(event)
+
+    def traced(self, name: str | None = None, category: str = "specify"):
+        """Decorator recording every call of a function as a span."""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def write(self) -> None:
+        """Merge recorded events into the configured file (no-op when disabled)."""
+        if not self.enabled or not self.path:
+            return
+        with self._lock:
+            events = list(self._events)
+        with file_lock(self.path + ".lock"):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    events = json.load(f)["traceEvents"] + events
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # no timeline yet (or an unreadable one): start a new one
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            os.replace(tmp_path, self.path)
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced